@@ -0,0 +1,71 @@
+import logging
+import math
+import time
+import numpy as np
+
+TRACE_DTYPE = np.dtype([('iteration', np.int32), ('max_delta', np.float64),
+                        ('changed_actions', np.int32), ('elapsed', np.float64)])
+
+class ConvergenceTrace:
+    """Ring buffer of per-iteration solver records: max value change, changed greedy actions and elapsed time.
+
+    Only the last capacity records are kept, so tracing a long run costs constant memory. Given
+    expected_iterations, the trace extrapolates the geometric decay of max_delta and logs a warning
+    once a run looks set to take more than slow_factor times longer than expected.
+    """
+
+    def __init__(self, capacity=1024, expected_iterations=None, slow_factor=10, theta=1e-6, name='solver'):
+        self.buffer = np.zeros(capacity, dtype=TRACE_DTYPE)
+        self.count = 0
+        self.expected_iterations = expected_iterations
+        self.slow_factor = slow_factor
+        self.theta = theta
+        self.name = name
+        self.slow = False
+        self.started = time.perf_counter()
+
+    def start(self):
+        self.started = time.perf_counter()
+
+    def record(self, max_delta, changed_actions=-1):
+        self.buffer[self.count % len(self.buffer)] = (self.count + 1, max_delta, changed_actions,
+                                                      time.perf_counter() - self.started)
+        self.count += 1
+        if self.expected_iterations and not self.slow and self.count >= 10:
+            predicted = self.predicted_iterations(self.theta)
+            if predicted is not None and predicted > self.slow_factor * self.expected_iterations:
+                self.slow = True
+                logging.warning(f"{self.name} is converging slowly: {predicted} iterations predicted, "
+                                f"{self.expected_iterations} expected (decay rate {self.rate():.4f})")
+
+    def records(self):
+        """The kept records, oldest first."""
+        if self.count <= len(self.buffer):
+            return self.buffer[:self.count].copy()
+        split = self.count % len(self.buffer)
+        return np.concatenate((self.buffer[split:], self.buffer[:split]))
+
+    def rate(self, window=10):
+        """Geometric mean of the per-iteration ratio of max_delta over the last window records."""
+        deltas = self.records()['max_delta'][-window:]
+        if len(deltas) < 2 or deltas[0] <= 0 or deltas[-1] <= 0:
+            return None
+        return float((deltas[-1] / deltas[0]) ** (1 / (len(deltas) - 1)))
+
+    def predicted_iterations(self, theta):
+        """Total iterations to reach max_delta < theta if the current decay rate holds; None if unknown."""
+        if self.count == 0:
+            return None
+        delta = float(self.records()['max_delta'][-1])
+        if delta < theta:
+            return self.count
+        rate = self.rate()
+        if rate is None or rate >= 1:
+            return None
+        return self.count + math.ceil(math.log(theta / delta) / math.log(rate))
+
+    def save(self, filename):
+        np.save(filename, self.records())
+
+def load_trace(filename):
+    return np.load(filename)
@@ -0,0 +1,126 @@
+from array import array
+import numpy as np
+from utils.maze_grid import as_grid
+from utils.maze_loader import find_start_goal
+
+class DistanceOracle:
+    """Goal-rooted BFS distance field; answers shortest paths from any start by descending it.
+
+    With lca=True it also keeps a binary-lifting table over the BFS tree so that, on perfect
+    mazes, the distance between any two cells is answered in O(log n).
+    """
+
+    def __init__(self, goal, distances, ancestors=None, perfect=False):
+        self.goal = goal
+        self.distances = distances  # int32 (rows, cols); -1 for walls and unreachable cells
+        self.ancestors = ancestors  # int32 (levels, rows * cols) or None
+        self.perfect = perfect
+
+    @classmethod
+    def build(cls, maze, goal=None, lca=False):
+        grid = as_grid(maze)
+        if goal is None:
+            _, goal = find_start_goal(grid)
+        size = grid.rows * grid.cols
+        masks = grid.mask_bytes
+        id_steps = grid.id_steps
+        goal_id = grid.to_id(goal)
+
+        distances = array('i', [-1]) * size
+        parents = array('i', [-1]) * size
+        distances[goal_id] = 0
+        parents[goal_id] = goal_id
+        frontier = [goal_id]
+        reached = 1
+        edges = 0
+        while frontier:
+            next_frontier = []
+            for node in frontier:
+                d = distances[node] + 1
+                for delta in id_steps[masks[node]]:
+                    neighbour = node + delta
+                    edges += 1
+                    if distances[neighbour] == -1:
+                        distances[neighbour] = d
+                        parents[neighbour] = node
+                        next_frontier.append(neighbour)
+            frontier = next_frontier
+            reached += len(frontier)
+
+        distances = np.frombuffer(distances, dtype=np.int32).reshape(grid.rows, grid.cols).copy()
+        # A component is a tree (perfect maze) when it has exactly one edge fewer than cells
+        perfect = edges // 2 == reached - 1
+        ancestors = build_ancestors(np.frombuffer(parents, dtype=np.int32), int(distances.max())) if lca else None
+        return cls(goal, distances, ancestors, perfect)
+
+    def distance(self, start):
+        d = int(self.distances[start])
+        return d if d >= 0 else None
+
+    def path(self, start):
+        """Shortest path from start to the goal, in O(path length)."""
+        distances = self.distances
+        rows, cols = distances.shape
+        d = int(distances[start])
+        if d < 0:
+            return None
+        r, c = start
+        path = [start]
+        while d > 0:
+            for dr, dc in ((-1, 0), (1, 0), (0, -1), (0, 1)):
+                nr, nc = r + dr, c + dc
+                if 0 <= nr < rows and 0 <= nc < cols and distances[nr, nc] == d - 1:
+                    r, c, d = nr, nc, d - 1
+                    path.append((r, c))
+                    break
+        return path
+
+    def pair_distance(self, a, b):
+        """Distance between any two reachable cells of a perfect maze, via the BFS-tree LCA."""
+        if self.ancestors is None:
+            raise ValueError("Oracle was built without an LCA index (use lca=True)")
+        if not self.perfect:
+            raise ValueError("Pair distances through the BFS tree are only exact for perfect mazes")
+        depth_a, depth_b = self.distance(a), self.distance(b)
+        if depth_a is None or depth_b is None:
+            return None
+        cols = self.distances.shape[1]
+        u, v = a[0] * cols + a[1], b[0] * cols + b[1]
+        if depth_a < depth_b:
+            u, v, depth_a, depth_b = v, u, depth_b, depth_a
+        ancestors = self.ancestors
+        # Lift the deeper node to the same depth, then both together to just below the LCA
+        lift = depth_a - depth_b
+        level = 0
+        while lift:
+            if lift & 1:
+                u = int(ancestors[level, u])
+            lift >>= 1
+            level += 1
+        if u != v:
+            for level in range(len(ancestors) - 1, -1, -1):
+                if ancestors[level, u] != ancestors[level, v]:
+                    u, v = int(ancestors[level, u]), int(ancestors[level, v])
+            u = int(ancestors[0, u])
+        lca_depth = int(self.distances.reshape(-1)[u])
+        return depth_a + depth_b - 2 * lca_depth
+
+    def save(self, filename):
+        arrays = {'goal': np.array(self.goal), 'distances': self.distances, 'perfect': np.array(self.perfect)}
+        if self.ancestors is not None:
+            arrays['ancestors'] = self.ancestors
+        np.savez(filename, **arrays)
+
+    @classmethod
+    def load(cls, filename):
+        with np.load(filename) as data:
+            ancestors = data['ancestors'] if 'ancestors' in data.files else None
+            return cls(tuple(int(x) for x in data['goal']), data['distances'], ancestors, bool(data['perfect']))
+
+def build_ancestors(parents, max_depth):
+    """Binary-lifting table: row k holds each cell's 2**k-th ancestor in the BFS tree."""
+    parents = np.where(parents < 0, np.arange(len(parents), dtype=np.int32), parents)
+    levels = [parents]
+    for _ in range(max(int(max_depth).bit_length() - 1, 0)):
+        levels.append(levels[-1][levels[-1]])
+    return np.stack(levels)
@@ -0,0 +1,124 @@
+import heapq
+from utils.maze_loader import find_neighbours
+from algorithms.search_algorithms import heuristic
+
+INF = float('inf')
+STEPS = ((-1, 0), (1, 0), (0, -1), (0, 1))
+
+class IncrementalPlanner:
+    """Lifelong Planning A* (LPA*) between a fixed start and goal that survives edits to the maze.
+
+    plan() returns (path, nodes_expanded) like astar. update_cells(changes) applies cell edits and
+    only re-queues the cells whose distance estimates the edits can invalidate, so the next plan()
+    re-expands the affected part of the search instead of starting over. Every reached cell keeps
+    the neighbour its estimate came from; a new wall drops the estimates of the cells reached
+    through it in one pass, rather than letting them prop each other up a step at a time.
+    """
+
+    def __init__(self, maze, start, goal):
+        self.maze = maze
+        self.start = start
+        self.goal = goal
+        self.g = {}
+        self.rhs = {start: 0}
+        self.parent = {}
+        self.queue = []
+        self.queued = {}  # Node -> key of its live queue entry; other entries are stale
+        self.total_expanded = 0
+        self.push(start)
+
+    def key(self, node):
+        best = min(self.g.get(node, INF), self.rhs.get(node, INF))
+        return (best + heuristic(node, self.goal), best)
+
+    def push(self, node):
+        key = self.key(node)
+        self.queued[node] = key
+        heapq.heappush(self.queue, (key, node))
+
+    def update_vertex(self, node):
+        # rhs is the one-step lookahead distance; a node is queued while it disagrees with g
+        if node != self.start:
+            best, parent = INF, None
+            if self.maze[node[0]][node[1]] != 'w':
+                for neighbour in find_neighbours(self.maze, node):
+                    g = self.g.get(neighbour, INF) + 1
+                    if g < best:
+                        best, parent = g, neighbour
+            self.rhs[node] = best
+            self.parent[node] = parent
+        self.queued.pop(node, None)
+        if self.g.get(node, INF) != self.rhs.get(node, INF):
+            self.push(node)
+
+    def compute_shortest_path(self):
+        g, rhs, goal = self.g, self.rhs, self.goal
+        nodes_expanded = 0
+        while self.queue:
+            key, node = self.queue[0]
+            if self.queued.get(node) != key:
+                heapq.heappop(self.queue)
+                continue
+            if key >= self.key(goal) and rhs.get(goal, INF) == g.get(goal, INF):
+                break
+            heapq.heappop(self.queue)
+            del self.queued[node]
+            nodes_expanded += 1
+            if g.get(node, INF) > rhs.get(node, INF):
+                g[node] = rhs[node]
+            else:
+                g[node] = INF
+                self.update_vertex(node)
+            for neighbour in find_neighbours(self.maze, node):
+                self.update_vertex(neighbour)
+        self.total_expanded += nodes_expanded
+        return nodes_expanded
+
+    def path(self):
+        if self.g.get(self.goal, INF) == INF:
+            return None
+        path = [self.goal]
+        node = self.goal
+        while node != self.start:
+            node = min(find_neighbours(self.maze, node), key=lambda n: self.g.get(n, INF))
+            path.append(node)
+        path.reverse()
+        return path
+
+    def plan(self):
+        """Repairs the search after any pending updates; returns (path, nodes_expanded) for this call."""
+        nodes_expanded = self.compute_shortest_path()
+        return self.path(), nodes_expanded
+
+    def update_cells(self, changes):
+        """Applies ((row, col), value) cell edits, e.g. 'w' to block a cell or 'P' to open it."""
+        affected = set()
+        walled = []
+        for (r, c), value in changes:
+            if (r, c) in (self.start, self.goal):
+                raise ValueError(f"Cannot change the start or goal cell {(r, c)}")
+            # Open neighbours before and after the edit, so a new wall releases the cells that used it
+            affected.update(find_neighbours(self.maze, (r, c)))
+            self.maze[r][c] = value
+            affected.update(find_neighbours(self.maze, (r, c)))
+            affected.add((r, c))
+            if value == 'w':
+                walled.append((r, c))
+        affected.update(self.invalidate(walled))
+        for node in affected:
+            self.update_vertex(node)
+
+    def invalidate(self, roots):
+        """Forgets the estimates of roots and every cell reached through them; returns those cells."""
+        rows, cols = len(self.maze), len(self.maze[0])
+        invalid = list(roots)
+        for node in invalid:
+            self.g.pop(node, None)
+            self.rhs.pop(node, None)
+            r, c = node
+            for dr, dc in STEPS:
+                child = (r + dr, c + dc)
+                if 0 <= child[0] < rows and 0 <= child[1] < cols and self.parent.get(child) == node:
+                    del self.parent[child]
+                    invalid.append(child)
+        return invalid
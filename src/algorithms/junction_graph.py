@@ -0,0 +1,197 @@
+import os
+import heapq
+import logging
+from collections import OrderedDict
+import numpy as np
+from utils.maze_grid import WALL, DEGREES, as_grid
+
+# Built graphs kept in memory, keyed by the maze's wall-layout digest
+_graph_cache = OrderedDict()
+GRAPH_CACHE_SIZE = 8
+
+class JunctionGraph:
+    """Maze junctions and dead-ends joined by corridors, weighted by corridor length."""
+
+    def __init__(self, digest, cols, nodes, indptr, targets, weights, steps):
+        self.digest = digest
+        self.cols = cols
+        self.nodes = nodes        # Cell id of every graph node
+        self.indptr = indptr      # CSR offsets into targets/weights/steps per node
+        self.targets = targets    # Node index at the far end of each corridor
+        self.weights = weights    # Corridor length in cells
+        self.steps = steps        # First cell id delta out of the source, to re-walk the corridor
+        self.node_index = {cell: i for i, cell in enumerate(nodes.tolist())}
+
+    @property
+    def num_nodes(self):
+        return len(self.nodes)
+
+    @property
+    def num_edges(self):
+        return len(self.targets)
+
+def build_junction_graph(maze):
+    grid = as_grid(maze)
+    masks = grid.mask_bytes
+    id_steps = grid.id_steps
+    degrees = np.array(DEGREES, dtype=np.uint8)[grid.masks.reshape(-1)]
+    is_open = grid.cells.reshape(-1) != WALL
+    nodes = np.flatnonzero(is_open & (degrees != 2))
+    node_index = {cell: i for i, cell in enumerate(nodes.tolist())}
+
+    indptr = [0]
+    targets, weights, steps = [], [], []
+    for cell in nodes.tolist():
+        for delta in id_steps[masks[cell]]:
+            landing, length = grid.walk_corridor(cell, delta)
+            targets.append(node_index[landing])
+            weights.append(length)
+            steps.append(delta)
+        indptr.append(len(targets))
+
+    return JunctionGraph(grid.digest(), grid.cols, nodes.astype(np.int64), np.array(indptr, dtype=np.int64),
+                         np.array(targets, dtype=np.int64), np.array(weights, dtype=np.int64),
+                         np.array(steps, dtype=np.int64))
+
+def junction_graph_file(maze_file):
+    return os.path.splitext(maze_file)[0] + '.junctions.npz'
+
+def save_junction_graph(graph, filename):
+    np.savez(filename, digest=np.array(graph.digest), cols=np.array(graph.cols), nodes=graph.nodes,
+             indptr=graph.indptr, targets=graph.targets, weights=graph.weights, steps=graph.steps)
+
+def load_junction_graph(filename):
+    with np.load(filename) as data:
+        return JunctionGraph(str(data['digest']), int(data['cols']), data['nodes'], data['indptr'],
+                             data['targets'], data['weights'], data['steps'])
+
+def get_junction_graph(maze, maze_file=None):
+    """Returns the junction graph for the maze from memory, the file beside maze_file, or a fresh build."""
+    grid = as_grid(maze)
+    digest = grid.digest()
+    if digest in _graph_cache:
+        _graph_cache.move_to_end(digest)
+        return _graph_cache[digest]
+
+    graph = None
+    graph_file = junction_graph_file(maze_file) if maze_file else None
+    if graph_file and os.path.isfile(graph_file):
+        graph = load_junction_graph(graph_file)
+        if graph.digest != digest:
+            logging.info(f"Junction graph {graph_file} is stale, rebuilding")
+            graph = None
+    if graph is None:
+        graph = build_junction_graph(grid)
+        if graph_file:
+            try:
+                save_junction_graph(graph, graph_file)
+            except OSError as e:
+                logging.warning(f"Could not save junction graph to {graph_file}: {e}")
+
+    _graph_cache[digest] = graph
+    if len(_graph_cache) > GRAPH_CACHE_SIZE:
+        _graph_cache.popitem(last=False)
+    return graph
+
+def junction_search(maze, start, goal, graph=None):
+    """A* over the junction graph, expanded back into a cell-by-cell path."""
+    grid = as_grid(maze)
+    graph = graph if graph is not None else get_junction_graph(grid)
+    masks = grid.mask_bytes
+    cols = grid.cols
+    start_id, goal_id = grid.to_id(start), grid.to_id(goal)
+    if start_id == goal_id:
+        return [start], 1
+    goal_r, goal_c = goal
+    node_index = graph.node_index
+    nodes = graph.nodes.tolist()
+    indptr = graph.indptr.tolist()
+    targets = graph.targets.tolist()
+    weights = graph.weights.tolist()
+    steps = graph.steps.tolist()
+
+    def estimate(node):
+        r, c = divmod(nodes[node], cols)
+        return abs(r - goal_r) + abs(c - goal_c)
+
+    # Graph nodes reached so far: g score and the (origin cell, first step) of the corridor into them
+    g_score = {}
+    came_from = {}
+    open_set = []
+    best_goal = None  # (length, node the final corridor leaves from or -1 for start, first step)
+
+    # Attach the start, which may sit part-way along a corridor
+    if start_id in node_index:
+        node = node_index[start_id]
+        g_score[node] = 0
+        came_from[node] = None
+        heapq.heappush(open_set, (estimate(node), 0, node))
+    else:
+        for delta in grid.id_steps[masks[start_id]]:
+            landing, length = grid.walk_corridor(start_id, delta, {goal_id})
+            if landing == goal_id:
+                if best_goal is None or length < best_goal[0]:
+                    best_goal = (length, -1, delta)
+            elif landing in node_index:
+                node = node_index[landing]
+                if node not in g_score or length < g_score[node]:
+                    g_score[node] = length
+                    came_from[node] = (start_id, delta)
+                    heapq.heappush(open_set, (length + estimate(node), -length, node))
+
+    # Corridor lengths from graph nodes to the goal, with the first step out of the node
+    exits = {}
+    if goal_id in node_index:
+        exits[node_index[goal_id]] = (0, None)
+    else:
+        for delta in grid.id_steps[masks[goal_id]]:
+            cells = []
+            landing, length = grid.walk_corridor(goal_id, delta, {start_id}, cells)
+            if landing in node_index:
+                previous = cells[-2] if len(cells) > 1 else goal_id
+                node = node_index[landing]
+                if node not in exits or length < exits[node][0]:
+                    exits[node] = (length, previous - landing)
+
+    closed = set()
+    nodes_expanded = 0
+    while open_set:
+        f_score, neg_g, node = heapq.heappop(open_set)
+        if best_goal is not None and f_score >= best_goal[0]:
+            break
+        if node in closed:
+            continue
+        closed.add(node)
+        nodes_expanded += 1
+        g = -neg_g
+        if node in exits:
+            length, delta = exits[node]
+            if best_goal is None or g + length < best_goal[0]:
+                best_goal = (g + length, node, delta)
+        for edge in range(indptr[node], indptr[node + 1]):
+            neighbour = targets[edge]
+            if neighbour in closed:
+                continue
+            tentative_g_score = g + weights[edge]
+            if neighbour not in g_score or tentative_g_score < g_score[neighbour]:
+                g_score[neighbour] = tentative_g_score
+                came_from[neighbour] = (nodes[node], steps[edge])
+                heapq.heappush(open_set, (tentative_g_score + estimate(neighbour), -tentative_g_score, neighbour))
+
+    if best_goal is None:
+        return None, nodes_expanded
+
+    # Collect the corridor segments back to the start, then re-walk them into cells
+    _, node, delta = best_goal
+    segments = []
+    if delta is not None:
+        segments.append((start_id if node == -1 else nodes[node], delta))
+    while node != -1 and came_from[node] is not None:
+        segments.append(came_from[node])
+        origin = came_from[node][0]
+        node = node_index.get(origin, -1) if origin != start_id else -1
+    cells = [start_id]
+    stops = {start_id, goal_id}
+    for origin, delta in reversed(segments):
+        grid.walk_corridor(origin, delta, stops, cells)
+    return [divmod(cell, cols) for cell in cells], nodes_expanded
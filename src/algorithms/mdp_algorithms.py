@@ -1,13 +1,47 @@
+import os
+import time
 import logging
+from collections import OrderedDict
 import numpy as np
+from utils.maze_grid import MazeGrid, WALL, GOAL, DIRECTIONS, as_grid
+from algorithms.mdp_engine import (CompiledMDP, compile_mdp, solve_value_iteration, solve_policy_iteration,
+                                   solve_prioritized_sweeping, solve_bounded_value_iteration, save_compiled_mdp,
+                                   load_compiled_mdp, rollout_policy)
 
-def define_mdp_components(maze):
+# Compiled models kept in memory, keyed by the wall-layout digest and goal cells, least recently used first
+_model_cache = OrderedDict()
+MODEL_CACHE_BYTES = 256 * 2 ** 20
+
+ACTIONS = ['U', 'D', 'L', 'R']  # In DIRECTIONS order
+# Directions (indices into ACTIONS) a move can slip into under each noise model; None stays put
+NOISE_MODELS = {
+    'perpendicular': ((2, 3), (2, 3), (0, 1), (0, 1)),
+    'uniform': ((1, 2, 3), (0, 2, 3), (0, 1, 3), (0, 1, 2)),
+    'stay': ((None,),) * 4,
+}
+
+def slip_outcomes(slip=0.0, noise='perpendicular'):
+    """Per action, its (probability, direction) outcomes: the intended move with probability 1 - slip,
+    and the noise model's directions sharing slip. Every action has the same number of outcomes."""
+    if noise not in NOISE_MODELS:
+        raise ValueError(f"Unknown noise model '{noise}', expected one of {sorted(NOISE_MODELS)}")
+    if not 0 <= slip <= 1:
+        raise ValueError(f"Slip probability must be between 0 and 1, got {slip}")
+    outcomes = []
+    for a, slips in enumerate(NOISE_MODELS[noise]):
+        outcomes.append([(1.0, a)] if slip == 0 else [(1.0 - slip, a)] + [(slip / len(slips), d) for d in slips])
+    return outcomes
+
+def define_mdp_components(maze, slip=0.0, noise='perpendicular'):
+    if isinstance(maze, MazeGrid):
+        return define_grid_mdp_components(maze, slip, noise)
     states = []
-    actions = ['U', 'D', 'L', 'R']
+    actions = list(ACTIONS)
     transitions = {}
     rewards = {}
     gamma = 0.9 # Discount factor
-    
+    outcomes = slip_outcomes(slip, noise)
+
     for r in range(len(maze)):
         for c in range(len(maze[0])):
             if maze[r][c] != 'w':
@@ -15,27 +49,21 @@ def define_mdp_components(maze):
                 states.append(state)
                 transitions[state] = {}
                 rewards[state] = {}
-                for action in actions:
-                    if action == 'U':
-                        next_state = (r - 1, c)
-                    elif action == 'D':
-                        next_state = (r + 1, c)
-                    elif action == 'L':
-                        next_state = (r, c - 1)
-                    elif action == 'R':
-                        next_state = (r, c + 1)
-                        
-                    if (0 <= next_state[0] < len(maze) and
-                        0 <= next_state[1] < len(maze[0]) and
-                        maze[next_state[0]][next_state[1]] != 'w'):
-                        transitions[state][action] = [(1.0, next_state)]
-                        if maze[next_state[0]][next_state[1]] == 'G':
-                            rewards[state][action] = 0 # Goal state
-                        else:
-                            rewards[state][action] = -1 # Step cost
-                    else:
-                        transitions[state][action] = [(1.0, state)]
-                        rewards[state][action] = -1 # Wall or out of bounds
+                for action, action_outcomes in zip(actions, outcomes):
+                    transitions[state][action] = []
+                    rewards[state][action] = 0
+                    for prob, direction in action_outcomes:
+                        next_state = state
+                        if direction is not None:
+                            _, dr, dc = DIRECTIONS[direction]
+                            if (0 <= r + dr < len(maze) and
+                                0 <= c + dc < len(maze[0]) and
+                                maze[r + dr][c + dc] != 'w'):
+                                next_state = (r + dr, c + dc)
+                        transitions[state][action].append((prob, next_state))
+                        # Step cost, except for moving into the goal; walls and out of bounds leave the state unchanged
+                        if maze[next_state[0]][next_state[1]] != 'G':
+                            rewards[state][action] -= prob
 
     for state in states:
         if maze[state[0]][state[1]] == 'G':
@@ -44,33 +72,141 @@ def define_mdp_components(maze):
 
     return states, actions, transitions, rewards, gamma
 
-def value_iteration(states, actions, transitions, rewards, gamma, theta=1e-6):
-    V = {state: 0 for state in states}
-    iterations = 0
-    while True:
-        delta = 0
-        for state in states:
-            v = V[state]
-            V[state] = max(
-                sum(prob * (rewards[state][action] + gamma * V[next_state])
-                    for prob, next_state in transitions[state][action])
-                for action in actions)
-            delta = max(delta, abs(v - V[state]))
-        iterations += 1
-        if delta < theta:
-            break
-    policy = {}
-    for state in states:
-        policy[state] = max(actions, key=lambda action: sum(
-            prob * (rewards[state][action] + gamma * V[next_state])
-            for prob, next_state in transitions[state][action]))
+def compile_grid_mdp(grid, slip=0.0, noise='perpendicular'):
+    """Builds the array MDP of a packed grid directly from its neighbour masks, without the dict components.
+
+    Every action has the same number of outcomes k (see slip_outcomes), so the model is a fixed
+    (states, actions, k) block and its memory grows linearly with the number of open cells.
+    """
+    outcomes = slip_outcomes(slip, noise)
+    flat = grid.cells.reshape(-1)
+    cols = grid.cols
+    open_ids = np.flatnonzero(flat != WALL)
+    num_states = len(open_ids)
+    state_of = np.full(flat.size, -1, dtype=np.int32)
+    state_of[open_ids] = np.arange(num_states, dtype=np.int32)
+    masks = grid.masks.reshape(-1)[open_ids]
+    # The state reached by moving in each direction; blocked moves stay put
+    moves = [state_of[np.where(masks & bit, open_ids + dr * cols + dc, open_ids)] for bit, dr, dc in DIRECTIONS]
+    stay = np.arange(num_states, dtype=np.int32)
+
+    next_states = np.empty((num_states, len(ACTIONS), len(outcomes[0])), dtype=np.int32)
+    probabilities = np.empty(next_states.shape, dtype=np.float64)
+    for a, action_outcomes in enumerate(outcomes):
+        for k, (prob, direction) in enumerate(action_outcomes):
+            next_states[:, a, k] = stay if direction is None else moves[direction]
+            probabilities[:, a, k] = prob
+    # Expected step cost: -1 per outcome except moving into the goal, and nothing at the goal itself
+    is_goal = flat[open_ids] == GOAL
+    rewards = -np.einsum('sak,sak->sa', probabilities, ~is_goal[next_states])
+    rewards[is_goal] = 0.0
+
+    states = [divmod(i, cols) for i in open_ids.tolist()]
+    return CompiledMDP(states, list(ACTIONS), next_states, probabilities, rewards)
+
+# Same MDP as define_mdp_components, unpacked from the array model built straight from the packed grid
+def define_grid_mdp_components(grid, slip=0.0, noise='perpendicular'):
+    model = compile_grid_mdp(grid, slip, noise)
+    actions = model.actions
+    transitions = {}
+    rewards = {}
+    gamma = 0.9 # Discount factor
+
+    states = model.states
+    for state, state_next, state_probabilities, state_rewards in zip(
+            states, model.next_states.tolist(), model.probabilities.tolist(), model.rewards.tolist()):
+        transitions[state] = {action: [(prob, states[n]) for prob, n in zip(probs, next_ids)]
+                              for action, probs, next_ids in zip(actions, state_probabilities, state_next)}
+        rewards[state] = dict(zip(actions, state_rewards))
+
+    return states, actions, transitions, rewards, gamma
+
+def mdp_model_file(maze_file):
+    return os.path.splitext(maze_file)[0] + '.mdp.npz'
+
+def get_mdp_model(maze, maze_file=None, max_bytes=MODEL_CACHE_BYTES, slip=0.0, noise='perpendicular'):
+    """Returns the compiled MDP for the maze from memory, the file beside maze_file, or a fresh build.
+
+    slip and noise select the transition model (see slip_outcomes) and are part of the cache key.
+
+    The model's build_time records the seconds spent building or loading it, so it can be reported
+    apart from solve times. Least recently used models are evicted once the cache exceeds max_bytes.
+    """
+    grid = as_grid(maze)
+    # Rewards depend on the goal, so it is part of the key; the start is not
+    key = f"{grid.digest()}:{','.join(str(grid.to_id(goal)) for goal in grid.find(GOAL))}"
+    if slip:
+        key += f":{noise}:{slip!r}"
+    if key in _model_cache:
+        _model_cache.move_to_end(key)
+        return _model_cache[key]
+
+    started = time.perf_counter()
+    model = None
+    model_file = mdp_model_file(maze_file) if maze_file else None
+    if model_file and os.path.isfile(model_file):
+        stored_key, model = load_compiled_mdp(model_file)
+        if stored_key != key:
+            logging.info(f"MDP model {model_file} is stale, rebuilding")
+            model = None
+    if model is None:
+        model = compile_grid_mdp(grid, slip, noise)
+        if model_file:
+            try:
+                save_compiled_mdp(model, model_file, key)
+            except OSError as e:
+                logging.warning(f"Could not save MDP model to {model_file}: {e}")
+    model.build_time = time.perf_counter() - started
+
+    _model_cache[key] = model
+    cached_bytes = sum(cached.nbytes for cached in _model_cache.values())
+    while cached_bytes > max_bytes and len(_model_cache) > 1:
+        _, evicted = _model_cache.popitem(last=False)
+        cached_bytes -= evicted.nbytes
+    return model
+
+# The solvers below compile the dict components unless a compiled model is passed, e.g. from get_mdp_model
+def value_iteration(states, actions, transitions, rewards, gamma, theta=1e-6, counters=None, trace=None, model=None,
+                    observer=None):
+    model = model if model is not None else compile_mdp(states, actions, transitions, rewards)
+    V, iterations = solve_value_iteration(model, gamma, theta, counters, trace, observer)
+    policy = model.policy_dict(model.greedy_actions(V, gamma))
     return policy, iterations
 
-def policy_iteration(states, actions, transitions, rewards, gamma, theta=1e-6):
+# Value iteration that only solves as far as the policy from start to goal needs
+def bounded_value_iteration(states, actions, transitions, rewards, gamma, start, goal, theta=1e-6, counters=None,
+                            trace=None, model=None, observer=None):
+    model = model if model is not None else compile_mdp(states, actions, transitions, rewards)
+    policy_actions, _, iterations, certified = solve_bounded_value_iteration(
+        model, gamma, model.index[start], [model.index[goal]], theta, counters, trace, observer)
+    if not certified:
+        logging.warning(f"Bounded value iteration could not certify the path from {start}, using the converged policy")
+    return model.policy_dict(policy_actions), iterations
+
+def prioritized_sweeping(states, actions, transitions, rewards, gamma, theta=1e-6, counters=None, model=None):
+    model = model if model is not None else compile_mdp(states, actions, transitions, rewards)
+    V, updates, backups = solve_prioritized_sweeping(model, gamma, theta, counters)
+    policy = model.policy_dict(model.greedy_actions(V, gamma))
+    logging.info(f"Prioritized sweeping: {updates} state updates, {backups} Bellman backups over {model.num_states} states")
+    # Each state update counts as one iteration; the backups reach the caller through counters
+    return policy, updates
+
+def policy_iteration(states, actions, transitions, rewards, gamma, theta=1e-6, evaluation='iterative', sweeps=20,
+                     counters=None, trace=None, model=None, observer=None):
+    if evaluation != 'iterative':
+        # Linear-solve and modified (k-sweep) evaluation run on the compiled array model
+        model = model if model is not None else compile_mdp(states, actions, transitions, rewards)
+        policy_actions, _, iterations = solve_policy_iteration(model, gamma, theta, evaluation, sweeps, counters, trace,
+                                                               observer)
+        return model.policy_dict(policy_actions), iterations
     policy = {state: max(actions, key=lambda action: rewards[state].get(action, -np.inf)) for state in states}
     V = {state: 0 for state in states}
     iterations = 0
+    deltas = []
+    if trace is not None:
+        trace.start()
     while True:
+        V_previous = dict(V) if trace is not None else None
         # Policy Evaluation
         while True:
             delta = 0
@@ -80,11 +216,15 @@ def policy_iteration(states, actions, transitions, rewards, gamma, theta=1e-6):
                 V[state] = sum(prob * (rewards[state][action] + gamma * V[next_state])
                                for prob, next_state in transitions[state][action])
                 delta = max(delta, abs(v - V[state]))
+            deltas.append(delta)
             if delta < theta:
                 break
         iterations += 1
+        if observer is not None:
+            observer(np.array([V[state] for state in states]))
         # Policy Improvement
         policy_stable = True
+        changed_actions = 0
         for state in states:
             old_action = policy[state]
             policy[state] = max(actions, key=lambda action: sum(
@@ -92,8 +232,14 @@ def policy_iteration(states, actions, transitions, rewards, gamma, theta=1e-6):
                 for prob, next_state in transitions[state][action]))
             if old_action != policy[state]:
                 policy_stable = False
+                changed_actions += 1
+        if trace is not None:
+            trace.record(max((abs(V[state] - V_previous[state]) for state in states), default=0.0), changed_actions)
         if policy_stable:
             break
+    if counters is not None:
+        counters.update(sweeps=len(deltas), bellman_backups=(len(deltas) + iterations) * len(states),
+                        sweep_deltas=deltas)
     return policy, iterations
 
 def apply_policy_to_maze(maze, policy, start):
@@ -103,6 +249,9 @@ def apply_policy_to_maze(maze, policy, start):
         if current not in policy:
             logging.error(f"Error: State {current} not found in policy.")
             return None
+        if len(path) > len(policy):
+            logging.error(f"Error: The policy from {start} loops without reaching the goal.")
+            return None
         action = policy[current]
         if action == 'U':
             next_state = (current[0] - 1, current[1])
@@ -114,4 +263,19 @@ def apply_policy_to_maze(maze, policy, start):
             next_state = (current[0], current[1] + 1)
         path.append(next_state)
         current = next_state
-    return path
\ No newline at end of file
+    return path
+
+def apply_policy_to_starts(maze, policy, starts, model=None):
+    """apply_policy_to_maze for many starts: one policy solve serves them all in a single array rollout.
+
+    Every 'G' cell is a goal. Returns one path per start, None where the policy does not lead to a goal.
+    """
+    grid = as_grid(maze)
+    model = model if model is not None else get_mdp_model(grid)
+    index = model.index
+    action_index = {action: a for a, action in enumerate(model.actions)}
+    policy_actions = np.array([action_index[policy[state]] for state in model.states])
+    visited, steps = rollout_policy(model, policy_actions, [index[start] for start in starts],
+                                    [index[goal] for goal in grid.find(GOAL)])
+    states = model.states
+    return [None if n < 0 else [states[s] for s in visited[:n + 1, i].tolist()] for i, n in enumerate(steps.tolist())]
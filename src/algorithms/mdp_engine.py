@@ -0,0 +1,373 @@
+import heapq
+import numpy as np
+from scipy import sparse
+from scipy.sparse.linalg import spsolve
+
+class CompiledMDP:
+    """Array form of an MDP: successor ids and probabilities of shape (states, actions, outcomes)."""
+
+    def __init__(self, states, actions, next_states, probabilities, rewards):
+        self.states = states
+        self.actions = actions
+        self.next_states = next_states      # int32 (S, A, K)
+        self.probabilities = probabilities  # float64 (S, A, K)
+        self.rewards = rewards              # float64 (S, A)
+        self.deterministic = next_states.shape[2] == 1 and bool(np.all(probabilities == 1.0))
+        self.build_time = None              # Seconds spent building or loading the model, when cached
+        self._index = None
+
+    @property
+    def num_states(self):
+        return len(self.states)
+
+    @property
+    def index(self):
+        """State -> row lookup, built on first use."""
+        if self._index is None:
+            self._index = {state: i for i, state in enumerate(self.states)}
+        return self._index
+
+    @property
+    def nbytes(self):
+        # The arrays plus roughly 120 bytes per (row, col) state tuple and its list slot
+        return self.next_states.nbytes + self.probabilities.nbytes + self.rewards.nbytes + 120 * self.num_states
+
+    def q_values(self, V, gamma):
+        """One batched Bellman backup for every (state, action) pair."""
+        if self.deterministic:
+            return self.rewards + gamma * V[self.next_states[:, :, 0]]
+        return self.rewards + gamma * np.einsum('sak,sak->sa', self.probabilities, V[self.next_states])
+
+    @staticmethod
+    def best_q(Q):
+        # Column-wise maximum; several times faster than Q.max(axis=1) on the narrow (S, A) arrays
+        best = Q[:, 0].copy()
+        for a in range(1, Q.shape[1]):
+            np.maximum(best, Q[:, a], out=best)
+        return best
+
+    def greedy_actions(self, V, gamma):
+        # argmax returns the first maximum, matching max(actions, key=...) tie-breaking
+        return np.argmax(self.q_values(V, gamma), axis=1)
+
+    def policy_dict(self, action_indices):
+        actions = self.actions
+        return {state: actions[a] for state, a in zip(self.states, action_indices.tolist())}
+
+def compile_mdp(states, actions, transitions, rewards):
+    """Compiles the dict output of define_mdp_components into index arrays."""
+    index = {state: i for i, state in enumerate(states)}
+    outcomes = max((len(transitions[s][a]) for s in states for a in actions), default=1)
+    next_states = np.zeros((len(states), len(actions), outcomes), dtype=np.int32)
+    probabilities = np.zeros((len(states), len(actions), outcomes), dtype=np.float64)
+    reward_array = np.zeros((len(states), len(actions)), dtype=np.float64)
+
+    for i, state in enumerate(states):
+        next_states[i, :, :] = i  # Padding outcomes point back at the state with probability 0
+        for a, action in enumerate(actions):
+            reward_array[i, a] = rewards[state][action]
+            for k, (prob, next_state) in enumerate(transitions[state][action]):
+                next_states[i, a, k] = index[next_state]
+                probabilities[i, a, k] = prob
+
+    return CompiledMDP(states, actions, next_states, probabilities, reward_array)
+
+def save_compiled_mdp(model, filename, key):
+    """Saves the model arrays with the cache key they were built for; states must be (row, col) tuples."""
+    np.savez(filename, key=np.array(key), states=np.array(model.states, dtype=np.int64).reshape(-1, 2),
+             actions=np.array(model.actions), next_states=model.next_states, probabilities=model.probabilities,
+             rewards=model.rewards)
+
+def load_compiled_mdp(filename):
+    """Returns the cache key and the CompiledMDP stored by save_compiled_mdp."""
+    with np.load(filename) as data:
+        states = [tuple(state) for state in data['states'].tolist()]
+        model = CompiledMDP(states, data['actions'].tolist(), data['next_states'], data['probabilities'], data['rewards'])
+        return str(data['key']), model
+
+def solve_value_iteration(model, gamma, theta=1e-6, counters=None, trace=None, observer=None):
+    """Synchronous value iteration; each sweep is one max-over-actions array operation.
+
+    An optional counters dict receives the sweep count, state backups and each sweep's max |dV|;
+    an optional ConvergenceTrace records every sweep with the number of changed greedy actions.
+    An optional observer is called with the value array after every sweep.
+    """
+    V = np.zeros(model.num_states, dtype=np.float64)
+    iterations = 0
+    deltas = [] if counters is not None else None
+    if trace is not None:
+        trace.start()
+        greedy = None
+    while True:
+        Q = model.q_values(V, gamma)
+        V_new = model.best_q(Q)
+        delta = np.abs(V_new - V).max(initial=0.0)
+        V = V_new
+        iterations += 1
+        if observer is not None:
+            observer(V)
+        if deltas is not None:
+            deltas.append(float(delta))
+        if trace is not None:
+            previous, greedy = greedy, np.argmax(Q, axis=1)
+            trace.record(float(delta), model.num_states if previous is None else int(np.count_nonzero(greedy != previous)))
+        if delta < theta:
+            break
+    if counters is not None:
+        counters.update(sweeps=iterations, bellman_backups=iterations * model.num_states, sweep_deltas=deltas)
+    return V, iterations
+
+def stay_lower_bound(model, gamma):
+    """Per-state lower bound on V*: min(R) / (1 - gamma), raised to r / (1 - gamma) wherever a
+    self-loop action earns r."""
+    L = np.full(model.num_states, float(model.rewards.min(initial=0.0)) / (1 - gamma))
+    # Staying put forever is also a lower bound, exact at the goal, where it earns the top reward
+    stays = np.all((model.next_states == np.arange(model.num_states)[:, None, None]) | (model.probabilities == 0), axis=2)
+    return np.maximum(L, np.where(stays, model.rewards, -np.inf).max(axis=1, initial=-np.inf) / (1 - gamma))
+
+def certified_policy(model, Q_lower, Q_upper, start, goals, tolerance=1e-12):
+    """Greedy actions if the greedy policy from start provably reaches a goal, else None.
+
+    Every state reachable from start under the greedy actions of Q_lower must have its action's lower
+    bound at least every other action's upper bound; such actions cannot change as the bounds tighten.
+    """
+    greedy = np.argmax(Q_lower, axis=1)
+    rivals = Q_upper.copy()
+    rivals[np.arange(model.num_states), greedy] = -np.inf
+    seen = {start}
+    stack = [start]
+    reached_goal = False
+    while stack:
+        s = stack.pop()
+        if s in goals:
+            reached_goal = True
+            continue
+        a = greedy[s]
+        if Q_lower[s, a] < rivals[s].max() - tolerance:
+            return None
+        for n, p in zip(model.next_states[s, a].tolist(), model.probabilities[s, a].tolist()):
+            if p > 0 and n not in seen:
+                seen.add(n)
+                stack.append(n)
+    return greedy if reached_goal else None
+
+def solve_bounded_value_iteration(model, gamma, start, goals, theta=1e-6, counters=None, trace=None, observer=None):
+    """Value iteration on lower and upper value bounds that stops once the policy from start is fixed.
+
+    The bounds start at min(R) / (1 - gamma), raised to r / (1 - gamma) for states with a self-loop
+    action of reward r, and max(R) / (1 - gamma). Each sweep backs up both, so they close in on V*
+    from either side. As soon as the bounds at start are within theta, the greedy walk from start is
+    checked: when it reaches one of the goals (state indices) with each action dominating every
+    alternative, no further sweep can change it and the loop stops. Otherwise it runs until the
+    bounds stop moving. Unlike solve_value_iteration, a path whose alternatives differ by less than
+    theta is still told apart, as the check waits for the bounds to separate them.
+
+    Returns the greedy actions, the lower bound, the sweep count and whether the path was certified.
+    Only states on the certified path are guaranteed to hold their optimal action. An optional
+    observer is called with the lower bound after every sweep.
+    """
+    goals = set(goals)
+    L = stay_lower_bound(model, gamma)
+    U = np.full(model.num_states, float(model.rewards.max(initial=0.0)) / (1 - gamma))
+    iterations = 0
+    deltas = [] if counters is not None else None
+    if trace is not None:
+        trace.start()
+    while True:
+        Q_lower = model.q_values(L, gamma)
+        Q_upper = model.q_values(U, gamma)
+        L_new = model.best_q(Q_lower)
+        U_new = model.best_q(Q_upper)
+        # Once neither bound moves beyond rounding, further sweeps cannot certify anything new
+        settled = max(np.abs(L_new - L).max(initial=0.0), np.abs(U_new - U).max(initial=0.0)) <= \
+            8 * np.finfo(np.float64).eps * max(np.abs(L_new).max(initial=0.0), 1.0)
+        L, U = L_new, U_new
+        gap = (U - L).max(initial=0.0)
+        iterations += 1
+        if observer is not None:
+            observer(L)
+        if deltas is not None:
+            deltas.append(float(gap))
+        if trace is not None:
+            trace.record(float(gap))
+        if U[start] - L[start] < theta:
+            policy_actions = certified_policy(model, Q_lower, Q_upper, start, goals)
+            if policy_actions is not None or settled:
+                break
+        elif settled:
+            policy_actions = None
+            break
+    if counters is not None:
+        counters.update(sweeps=iterations, bellman_backups=2 * iterations * model.num_states, sweep_deltas=deltas)
+    certified = policy_actions is not None
+    if not certified:
+        policy_actions = np.argmax(Q_lower, axis=1)
+    return policy_actions, L, iterations, certified
+
+def policy_transition_matrix(model, policy_actions):
+    """Sparse (S x S) transition matrix P_pi and reward vector R_pi of a fixed policy."""
+    ids = np.arange(model.num_states)
+    next_states = model.next_states[ids, policy_actions]
+    probabilities = model.probabilities[ids, policy_actions]
+    rows = np.repeat(ids, next_states.shape[1])
+    P = sparse.csr_matrix((probabilities.ravel(), (rows, next_states.ravel())),
+                          shape=(model.num_states, model.num_states))
+    return P, model.rewards[ids, policy_actions]
+
+def evaluate_policy_linear(model, policy_actions, gamma):
+    """Exact policy evaluation by solving (I - gamma * P_pi) V = R_pi."""
+    P, R = policy_transition_matrix(model, policy_actions)
+    A = sparse.identity(model.num_states, format='csc') - gamma * P.tocsc()
+    return spsolve(A, R)
+
+def evaluate_policy_sweeps(model, policy_actions, gamma, V, theta=1e-6, sweeps=None, deltas=None):
+    """Iterative policy evaluation; stops at delta < theta, or after a fixed number of sweeps if given.
+
+    Each sweep's max |dV| is appended to deltas when a list is given.
+    """
+    P, R = policy_transition_matrix(model, policy_actions)
+    sweep = 0
+    while sweeps is None or sweep < sweeps:
+        V_new = R + gamma * (P @ V)
+        delta = np.abs(V_new - V).max(initial=0.0)
+        V = V_new
+        sweep += 1
+        if deltas is not None:
+            deltas.append(float(delta))
+        if delta < theta:
+            break
+    return V
+
+def solve_policy_iteration(model, gamma, theta=1e-6, evaluation='linear', sweeps=20, counters=None, trace=None,
+                           observer=None):
+    """Policy iteration with 'linear' (exact sparse solve), 'modified' (k sweeps) or 'iterative' evaluation.
+
+    An optional counters dict receives the evaluation sweeps, state backups and each sweep's max |dV|;
+    an optional ConvergenceTrace records each improvement step's value change and changed actions.
+    An optional observer is called with the value array after every policy evaluation.
+    """
+    if evaluation not in ('iterative', 'linear', 'modified'):
+        raise ValueError(f"Unknown policy evaluation mode: {evaluation}")
+    ids = np.arange(model.num_states)
+    policy_actions = np.argmax(model.rewards, axis=1)
+    V = np.zeros(model.num_states, dtype=np.float64)
+    iterations = 0
+    deltas = [] if counters is not None else None
+    if trace is not None:
+        trace.start()
+    while True:
+        V_previous = V
+        # Policy Evaluation
+        if evaluation == 'linear':
+            V = evaluate_policy_linear(model, policy_actions, gamma)
+        elif evaluation == 'modified':
+            V = evaluate_policy_sweeps(model, policy_actions, gamma, V, theta, sweeps, deltas)
+        else:
+            V = evaluate_policy_sweeps(model, policy_actions, gamma, V, theta, deltas=deltas)
+        iterations += 1
+        if observer is not None:
+            observer(V)
+        # Policy Improvement; only actions beating the current one by more than rounding error replace it.
+        # The margin scales with the values, as far from the goal the action gaps shrink like gamma ** distance
+        Q = model.q_values(V, gamma)
+        greedy = np.argmax(Q, axis=1)
+        best = Q[ids, greedy]
+        tolerance = 4 * np.finfo(np.float64).eps * np.abs(V).max(initial=1.0)
+        improved = best > Q[ids, policy_actions] + tolerance
+        policy_stable = not np.any(improved)
+        if trace is not None:
+            trace.record(float(np.abs(V - V_previous).max(initial=0.0)), int(np.count_nonzero(improved)))
+        policy_actions = np.where(improved, greedy, policy_actions)
+        if policy_stable and (evaluation != 'modified' or np.abs(best - V).max(initial=0.0) < theta):
+            break
+    if counters is not None:
+        # Evaluation sweeps back up each state under one action; improvement steps back up every state
+        counters.update(sweeps=len(deltas), bellman_backups=(len(deltas) + iterations) * model.num_states,
+                        sweep_deltas=deltas)
+    return policy_actions, V, iterations
+
+def rollout_policy(model, policy_actions, starts, goals):
+    """Follows each state's intended move under a fixed policy from every start at once.
+
+    starts and goals are state indices. Returns the visited states as a (steps + 1, len(starts)) array
+    and each start's step count to a goal, -1 where its walk gets stuck or does not reach one within
+    num_states steps.
+    """
+    ids = np.arange(model.num_states)
+    successors = model.next_states[ids, policy_actions, 0]  # Outcome 0 is the intended move
+    is_goal = np.zeros(model.num_states, dtype=bool)
+    is_goal[list(goals)] = True
+    # Moves into a wall go nowhere, so walks reaching such a state stop at once
+    stuck = (successors == ids) & ~is_goal
+    current = np.array(starts, dtype=np.int32)
+    steps = np.where(is_goal[current], 0, -1)
+    visited = [current]
+    active = np.flatnonzero(steps < 0)
+    for step in range(1, model.num_states + 1):
+        if not len(active):
+            break
+        current = current.copy()
+        current[active] = successors[current[active]]
+        visited.append(current)
+        arrived = is_goal[current[active]]
+        steps[active[arrived]] = step
+        active = active[~(arrived | stuck[current[active]])]
+    return np.stack(visited), steps
+
+def predecessor_index(model):
+    """CSR-style (indptr, indices) lists of the states that can move into each state."""
+    S, A, K = model.next_states.shape
+    sources = np.repeat(np.arange(S, dtype=np.int64), A * K)
+    targets = model.next_states.reshape(-1).astype(np.int64)
+    keep = (model.probabilities.reshape(-1) > 0) & (targets != sources)
+    edges = np.unique(targets[keep] * S + sources[keep])  # Sorted by target, duplicates dropped
+    targets, sources = np.divmod(edges, S)
+    indptr = np.concatenate(([0], np.cumsum(np.bincount(targets, minlength=S))))
+    return indptr.tolist(), sources.tolist()
+
+def solve_prioritized_sweeping(model, gamma, theta=1e-6, counters=None):
+    """Asynchronous value iteration ordered by Bellman error, propagating backward from the goal.
+
+    Values start at stay_lower_bound, which is already exact at the goal, so the only states with a
+    non-zero Bellman error are next to it; every other state is reached by following predecessor
+    lists from there. An optional counters dict receives the Bellman backup count.
+    """
+    S = model.num_states
+    lower = stay_lower_bound(model, gamma)
+    V = lower.tolist()
+    next_states = model.next_states.tolist()
+    probabilities = model.probabilities.tolist()
+    rewards = model.rewards.tolist()
+    indptr, preds = predecessor_index(model)
+
+    def backup(s):
+        return max(r + gamma * sum(p * V[n] for p, n in zip(ps, ns))
+                   for r, ps, ns in zip(rewards[s], probabilities[s], next_states[s]))
+
+    errors = np.abs(model.best_q(model.q_values(lower, gamma)) - lower)
+    priority = [0.0] * S
+    queue = []
+    for s in np.flatnonzero(errors > theta).tolist():
+        priority[s] = float(errors[s])
+        queue.append((-priority[s], s))
+    heapq.heapify(queue)
+
+    updates = 0
+    backups = 0
+    while queue:
+        neg_error, s = heapq.heappop(queue)
+        if -neg_error != priority[s]:
+            continue  # Stale entry, superseded by a larger error
+        priority[s] = 0.0
+        V[s] = backup(s)
+        updates += 1
+        backups += 1
+        for p in preds[indptr[s]:indptr[s + 1]]:
+            error = abs(backup(p) - V[p])
+            backups += 1
+            if error > theta and error > priority[p]:
+                priority[p] = error
+                heapq.heappush(queue, (-error, p))
+    if counters is not None:
+        counters.update(bellman_backups=backups)
+    return np.array(V, dtype=np.float64), updates, backups
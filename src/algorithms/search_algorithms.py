@@ -1,7 +1,9 @@
 import heapq
+from array import array
 from collections import deque
 from tkinter import *
-from utils.maze_loader import find_neighbours
+from utils.maze_loader import find_neighbours, find_starts_goals
+from utils.maze_grid import MASK_OFFSETS, DEGREES, as_grid
 
 def reconstruct_path(came_from, start, goal):
     path = []
@@ -13,62 +15,373 @@ def reconstruct_path(came_from, start, goal):
     path.reverse()
     return path
 
-def dfs(maze, start, goal):
+def record_search_counters(counters, nodes_expanded, frontier_left, stale_pops=0, peak_frontier=0, found=True):
+    """Fills an opt-in counters dict, deriving pushes and pops from totals the solvers keep anyway."""
+    pops = nodes_expanded + stale_pops
+    counters.update(
+        pushes=pops + frontier_left,
+        pops=pops,
+        stale_pops=stale_pops,
+        # Every expanded node except the goal generates its neighbours once
+        neighbour_calls=nodes_expanded - (1 if found else 0),
+        peak_frontier=peak_frontier,
+    )
+
+# dfs, bfs and astar take an optional counters dict (see record_search_counters) and an optional
+# expansions list or array('l') that receives the cell id (row * cols + col) of each expanded node
+def dfs(maze, start, goal, counters=None, expansions=None):
     stack = deque([start])
     visited = set()
     came_from = {}
     nodes_expanded = 0
+    peak_frontier = 1
+    track = counters is not None
+    cols = len(maze[0])
     while stack:
         node = stack.pop()
         nodes_expanded += 1
+        if expansions is not None:
+            expansions.append(node[0] * cols + node[1])
         if node == goal:
+            if track:
+                record_search_counters(counters, nodes_expanded, len(stack), peak_frontier=peak_frontier)
             return reconstruct_path(came_from, start, goal), nodes_expanded
         visited.add(node)
         for neighbour in find_neighbours(maze, node):
             if neighbour not in visited:
                 stack.append(neighbour)
                 came_from[neighbour] = node
+        if track and len(stack) > peak_frontier:
+            peak_frontier = len(stack)
+    if track:
+        record_search_counters(counters, nodes_expanded, 0, peak_frontier=peak_frontier, found=False)
     return None, nodes_expanded
 
-def bfs(maze, start, goal):
+def bfs(maze, start, goal, counters=None, expansions=None):
     queue = deque([start])
     visited = set()
     visited.add(start)
     came_from = {}
     nodes_expanded = 0
+    peak_frontier = 1
+    track = counters is not None
+    cols = len(maze[0])
     
     while queue:
         node = queue.popleft()
         nodes_expanded += 1
+        if expansions is not None:
+            expansions.append(node[0] * cols + node[1])
         if node == goal:
+            if track:
+                record_search_counters(counters, nodes_expanded, len(queue), peak_frontier=peak_frontier)
             return reconstruct_path(came_from, start, goal), nodes_expanded
         for neighbour in find_neighbours(maze, node):
             if neighbour not in visited:
                 visited.add(neighbour)
                 came_from[neighbour] = node
                 queue.append(neighbour)
+        if track and len(queue) > peak_frontier:
+            peak_frontier = len(queue)
+    if track:
+        record_search_counters(counters, nodes_expanded, 0, peak_frontier=peak_frontier, found=False)
     return None, nodes_expanded
 
 def heuristic(a, b):
     return abs(a[0] - b[0]) + abs(a[1] - b[1])
 
-def astar(maze, start, goal):
-    open_set = [(0, start)]
-    came_from = {}
-    g_score = {start: 0}
-    f_score = {start: heuristic(start, goal)}
+def astar(maze, start, goal, counters=None, expansions=None):
+    grid = as_grid(maze)
+    cols = grid.cols
+    size = grid.rows * cols
+    masks = grid.mask_bytes
+    start_id, goal_id = grid.to_id(start), grid.to_id(goal)
+    goal_r, goal_c = goal
+    # Neighbour id deltas with their row/column offsets, per neighbour mask
+    steps = [[(dr * cols + dc, dr, dc) for dr, dc in offsets] for offsets in MASK_OFFSETS]
+
+    g_score = array('l', [-1]) * size
+    came_from = array('l', [-1]) * size
+    closed = bytearray(size)
+    # Heap keys pack (f, -g, node) into one int: lowest f first, ties broken on higher g
+    span = size + 1
+    open_set = [(heuristic(start, goal) * span + span - 1) * span + start_id]
+    g_score[start_id] = 0
     nodes_expanded = 0
-    
+    stale_pops = 0
+    peak_frontier = 1
+    track = counters is not None
+
     while open_set:
-        _, node = heapq.heappop(open_set)
+        if track and len(open_set) > peak_frontier:
+            peak_frontier = len(open_set)
+        node = heapq.heappop(open_set) % span
+        if closed[node]:
+            stale_pops += 1
+            continue  # Stale entry for an already expanded node
+        closed[node] = 1
         nodes_expanded += 1
-        if node == goal:
-            return reconstruct_path(came_from, start, goal), nodes_expanded
-        for neighbour in find_neighbours(maze, node):
-            tentative_g_score = g_score[node] + 1
-            if neighbour not in g_score or tentative_g_score < g_score[neighbour]:
+        if expansions is not None:
+            expansions.append(node)
+        if node == goal_id:
+            if track:
+                record_search_counters(counters, nodes_expanded, len(open_set), stale_pops, peak_frontier)
+            path = []
+            while node != -1:
+                path.append(divmod(node, cols))
+                node = came_from[node]
+            path.reverse()
+            return path, nodes_expanded
+        tentative_g_score = g_score[node] + 1
+        r, c = divmod(node, cols)
+        for delta, dr, dc in steps[masks[node]]:
+            neighbour = node + delta
+            if closed[neighbour]:
+                continue
+            previous = g_score[neighbour]
+            if previous == -1 or tentative_g_score < previous:
+                g_score[neighbour] = tentative_g_score
                 came_from[neighbour] = node
+                f_score = tentative_g_score + abs(r + dr - goal_r) + abs(c + dc - goal_c)
+                heapq.heappush(open_set, (f_score * span + span - 1 - tentative_g_score) * span + neighbour)
+    if track:
+        record_search_counters(counters, nodes_expanded, 0, stale_pops, peak_frontier, found=False)
+    return None, nodes_expanded
+
+def multi_bfs(maze, starts=None, goals=None):
+    """Shortest paths from many starts to their nearest goal with one breadth-first search.
+
+    The search runs backward from every goal at once and stops as soon as all starts are reached,
+    so N queries cost one search instead of N. starts and goals default to every 'S' and 'G' cell.
+    Returns (paths, nodes_expanded) with paths[i] running from starts[i] to its nearest goal, or
+    None when no goal is reachable from it.
+    """
+    grid = as_grid(maze)
+    if starts is None or goals is None:
+        all_starts, all_goals = find_starts_goals(grid)
+        starts = all_starts if starts is None else starts
+        goals = all_goals if goals is None else goals
+    cols = grid.cols
+    masks = grid.mask_bytes
+    id_steps = grid.id_steps
+    parents = array('l', [-1]) * (grid.rows * cols)  # Next cell towards the nearest goal; goals point at themselves
+    frontier = []
+    for goal in goals:
+        goal_id = grid.to_id(goal)
+        if parents[goal_id] == -1:
+            parents[goal_id] = goal_id
+            frontier.append(goal_id)
+    waiting = {grid.to_id(start) for start in starts}
+    waiting.difference_update(frontier)
+    nodes_expanded = 0
+
+    while frontier and waiting:
+        next_frontier = []
+        for node in frontier:
+            nodes_expanded += 1
+            for delta in id_steps[masks[node]]:
+                neighbour = node + delta
+                if parents[neighbour] == -1:
+                    parents[neighbour] = node
+                    next_frontier.append(neighbour)
+        waiting.difference_update(next_frontier)
+        frontier = next_frontier
+
+    paths = []
+    for start in starts:
+        node = grid.to_id(start)
+        if parents[node] == -1:
+            paths.append(None)
+            continue
+        path = [start]
+        while parents[node] != node:
+            node = parents[node]
+            path.append(divmod(node, cols))
+        paths.append(path)
+    return paths, nodes_expanded
+
+def join_bidirectional_path(forward_parent, backward_parent, forward_node, backward_node, cols):
+    path = []
+    node = forward_node
+    while node != -1:
+        path.append(divmod(node, cols))
+        node = forward_parent[node]
+    path.reverse()
+    node = backward_node
+    while node != -1:
+        path.append(divmod(node, cols))
+        node = backward_parent[node]
+    return path
+
+def bidirectional_bfs(maze, start, goal):
+    grid = as_grid(maze)
+    cols = grid.cols
+    size = grid.rows * cols
+    masks = grid.mask_bytes
+    steps = [[dr * cols + dc for dr, dc in offsets] for offsets in MASK_OFFSETS]
+    if start == goal:
+        return [start], 1
+
+    # Index 0 searches forward from start, index 1 backward from goal
+    parents = (array('l', [-1]) * size, array('l', [-1]) * size)
+    dists = (array('l', [-1]) * size, array('l', [-1]) * size)
+    frontiers = [[grid.to_id(start)], [grid.to_id(goal)]]
+    dists[0][frontiers[0][0]] = 0
+    dists[1][frontiers[1][0]] = 0
+    nodes_expanded = 0
+
+    while frontiers[0] and frontiers[1]:
+        # Expand one full layer of the smaller frontier so the first meeting layer is shortest
+        side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+        dist, parent, other_dist = dists[side], parents[side], dists[1 - side]
+        best_length, meeting = -1, None
+        next_frontier = []
+        for node in frontiers[side]:
+            nodes_expanded += 1
+            d = dist[node] + 1
+            for delta in steps[masks[node]]:
+                neighbour = node + delta
+                if other_dist[neighbour] != -1 and (best_length == -1 or d + other_dist[neighbour] < best_length):
+                    best_length, meeting = d + other_dist[neighbour], (node, neighbour)
+                if dist[neighbour] == -1:
+                    dist[neighbour] = d
+                    parent[neighbour] = node
+                    next_frontier.append(neighbour)
+        if meeting is not None:
+            forward_node, backward_node = meeting if side == 0 else meeting[::-1]
+            return join_bidirectional_path(parents[0], parents[1], forward_node, backward_node, cols), nodes_expanded
+        frontiers[side] = next_frontier
+    return None, nodes_expanded
+
+def bidirectional_astar(maze, start, goal):
+    grid = as_grid(maze)
+    cols = grid.cols
+    size = grid.rows * cols
+    masks = grid.mask_bytes
+    steps = [[(dr * cols + dc, dr, dc) for dr, dc in offsets] for offsets in MASK_OFFSETS]
+    if start == goal:
+        return [start], 1
+
+    # Index 0 searches forward from start, index 1 backward from goal. Both use the averaged heuristic
+    # (h_goal - h_start + distance) / 2 and its mirror, which stay consistent across the two searches,
+    # so a node is final once either side expands it. Keys are kept doubled to stay integers.
+    start_r, start_c = start
+    goal_r, goal_c = goal
+    distance = heuristic(start, goal)
+    signs = (1, -1)
+    span = size + 1
+    g_scores = (array('l', [-1]) * size, array('l', [-1]) * size)
+    parents = (array('l', [-1]) * size, array('l', [-1]) * size)
+    closed = (bytearray(size), bytearray(size))
+    open_sets = ([], [])
+    live = [1, 1]  # Queued nodes not yet expanded, per side; the heaps also hold stale entries
+    for side, node in enumerate((start, goal)):
+        node_id = grid.to_id(node)
+        g_scores[side][node_id] = 0
+        open_sets[side].append((2 * distance * span + span - 1) * span + node_id)
+    best_length, meeting = -1, -1
+    nodes_expanded = 0
+
+    while True:
+        for side in (0, 1):
+            open_set = open_sets[side]
+            while open_set and closed[side][open_set[0] % span]:
+                heapq.heappop(open_set)  # Drop stale entries so the heap top is a live lower bound
+        if not open_sets[0] or not open_sets[1]:
+            break
+        if best_length != -1:
+            # Stop once the larger smallest f, or the two together, can no longer beat the best meeting
+            forward_f, backward_f = open_sets[0][0] // span // span, open_sets[1][0] // span // span
+            if max(forward_f, backward_f) >= 2 * best_length or forward_f + backward_f >= 2 * (best_length + distance):
+                break
+        side = 0 if live[0] <= live[1] else 1
+        open_set, g_score, parent, side_closed = open_sets[side], g_scores[side], parents[side], closed[side]
+        other_g_score = g_scores[1 - side]
+        sign = signs[side]
+
+        node = heapq.heappop(open_set) % span
+        side_closed[node] = 1
+        live[side] -= 1
+        nodes_expanded += 1
+        tentative_g_score = g_score[node] + 1
+        r, c = divmod(node, cols)
+        for delta, dr, dc in steps[masks[node]]:
+            neighbour = node + delta
+            if side_closed[neighbour]:
+                continue
+            previous = g_score[neighbour]
+            if previous == -1 or tentative_g_score < previous:
+                if previous == -1:
+                    live[side] += 1
                 g_score[neighbour] = tentative_g_score
-                f_score[neighbour] = tentative_g_score + heuristic(neighbour, goal)
-                heapq.heappush(open_set, (f_score[neighbour], neighbour))
-    return None, nodes_expanded
\ No newline at end of file
+                parent[neighbour] = node
+                nr, nc = r + dr, c + dc
+                to_goal = abs(nr - goal_r) + abs(nc - goal_c)
+                to_start = abs(nr - start_r) + abs(nc - start_c)
+                f_score = 2 * tentative_g_score + sign * (to_goal - to_start) + distance
+                heapq.heappush(open_set, (f_score * span + span - 1 - tentative_g_score) * span + neighbour)
+                if other_g_score[neighbour] != -1:
+                    length = tentative_g_score + other_g_score[neighbour]
+                    if best_length == -1 or length < best_length:
+                        best_length, meeting = length, neighbour
+
+    if meeting == -1:
+        return None, nodes_expanded
+    return join_bidirectional_path(parents[0], parents[1], meeting, parents[1][meeting], cols), nodes_expanded
+
+def jump_point_search(maze, start, goal):
+    grid = as_grid(maze)
+    cols = grid.cols
+    size = grid.rows * cols
+    masks = grid.mask_bytes
+    id_steps = grid.id_steps
+    start_id, goal_id = grid.to_id(start), grid.to_id(goal)
+    goal_r, goal_c = goal
+    stops = {start_id, goal_id}
+
+    g_score = array('l', [-1]) * size
+    came_from = array('l', [-1]) * size
+    entry_step = array('l', [0]) * size  # First step taken out of came_from, to re-walk the corridor
+    closed = bytearray(size)
+    span = size + 1
+    open_set = [(heuristic(start, goal) * span + span - 1) * span + start_id]
+    g_score[start_id] = 0
+    nodes_expanded = 0
+
+    while open_set:
+        node = heapq.heappop(open_set) % span
+        if closed[node]:
+            continue
+        closed[node] = 1
+        nodes_expanded += 1
+        if node == goal_id:
+            return expand_jump_path(grid, came_from, entry_step, start_id, goal_id), nodes_expanded
+        node_g_score = g_score[node]
+        for delta in id_steps[masks[node]]:
+            # Jump along the corridor; only junctions, the goal and the start become search nodes
+            landing, length = grid.walk_corridor(node, delta, stops)
+            if closed[landing] or (DEGREES[masks[landing]] == 1 and landing != goal_id):
+                continue  # Dead-ends other than the goal lead nowhere
+            tentative_g_score = node_g_score + length
+            previous = g_score[landing]
+            if previous == -1 or tentative_g_score < previous:
+                g_score[landing] = tentative_g_score
+                came_from[landing] = node
+                entry_step[landing] = delta
+                r, c = divmod(landing, cols)
+                f_score = tentative_g_score + abs(r - goal_r) + abs(c - goal_c)
+                heapq.heappush(open_set, (f_score * span + span - 1 - tentative_g_score) * span + landing)
+    return None, nodes_expanded
+
+def expand_jump_path(grid, came_from, entry_step, start_id, goal_id):
+    # Re-walk each jumped corridor so callers still get the full cell-by-cell path
+    segments = []
+    node = goal_id
+    while node != start_id:
+        segments.append((came_from[node], entry_step[node]))
+        node = came_from[node]
+    cells = [start_id]
+    stops = {start_id, goal_id}
+    for origin, delta in reversed(segments):
+        grid.walk_corridor(origin, delta, stops, cells)
+    return [divmod(cell, grid.cols) for cell in cells]
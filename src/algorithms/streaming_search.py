@@ -0,0 +1,63 @@
+import os
+import tempfile
+import numpy as np
+from utils.maze_grid import WALL, as_grid
+from utils.maze_loader import scan_start_goal
+
+# Parent direction codes stored per cell; 0 means not yet reached
+STEPS = ((-1, 0), (1, 0), (0, -1), (0, 1))
+
+def streaming_bfs(maze, start=None, goal=None, workdir=None):
+    """Breadth-first search for memory-mapped mazes.
+
+    The frontier is expanded one layer at a time with array operations, and the parent
+    direction of every reached cell is kept in a disk-backed memmap in workdir, so resident
+    memory depends on the frontier size rather than the maze area.
+    """
+    grid = as_grid(maze)
+    cells = grid.cells
+    rows, cols = cells.shape
+    if start is None or goal is None:
+        found_start, found_goal = scan_start_goal(grid)
+        start = found_start if start is None else start
+        goal = found_goal if goal is None else goal
+
+    handle, parents_file = tempfile.mkstemp(suffix='.parents', dir=workdir)
+    os.close(handle)
+    parents = None
+    try:
+        parents = np.memmap(parents_file, dtype=np.uint8, mode='w+', shape=(rows, cols))
+        parents[start] = len(STEPS) + 1  # Marks the start as reached
+        frontier_r = np.array([start[0]], dtype=np.int64)
+        frontier_c = np.array([start[1]], dtype=np.int64)
+        nodes_expanded = 0
+        found = start == goal
+        while len(frontier_r) and not found:
+            nodes_expanded += len(frontier_r)
+            next_r, next_c = [], []
+            for code, (dr, dc) in enumerate(STEPS, 1):
+                r, c = frontier_r + dr, frontier_c + dc
+                inside = (r >= 0) & (r < rows) & (c >= 0) & (c < cols)
+                r, c = r[inside], c[inside]
+                new = (cells[r, c] != WALL) & (parents[r, c] == 0)
+                r, c = r[new], c[new]
+                # Cells claimed by an earlier direction already fail the parents check, so none repeat
+                parents[r, c] = code
+                next_r.append(r)
+                next_c.append(c)
+            frontier_r, frontier_c = np.concatenate(next_r), np.concatenate(next_c)
+            found = parents[goal] != 0
+
+        if not found:
+            return None, nodes_expanded
+        path = [goal]
+        r, c = goal
+        while (r, c) != start:
+            dr, dc = STEPS[parents[r, c] - 1]
+            r, c = r - dr, c - dc
+            path.append((r, c))
+        path.reverse()
+        return path, nodes_expanded
+    finally:
+        parents = None  # Drop the mapping before removing its file
+        os.remove(parents_file)
@@ -1,23 +1,59 @@
 import os
 import csv
+import json
 import curses
 import time
 import uuid
 import logging
 import argparse
+import atexit
+import sys
+from array import array
 from datetime import datetime
 from threading import Thread
 from utils.config_loader import load_config
-from utils.maze_loader import find_start_goal
-from utils.maze_visualiser import save_solution_path, mark_solution_path, display_maze, display_maze_with_policy
-from utils.performance_evaluator import run
-from utils.maze_generator import generate_maze
-from algorithms.search_algorithms import dfs, bfs, astar
-from algorithms.mdp_algorithms import define_mdp_components, value_iteration, policy_iteration, apply_policy_to_maze
+from utils.maze_loader import find_start_goal, load_maze_mmap
+from utils.maze_visualiser import (save_solution_path, mark_solution_path, display_maze, display_maze_with_policy,
+                                   save_maze_image, save_search_animation, ValueAnimation)
+from utils.performance_evaluator import run, summarise_execution_times
+from utils.batch_runner import run_batch
+from utils.metrics_sink import MetricsSink, COUNTER_COLUMNS, export_csv
+from utils.maze_generator import generate_maze, stream_maze_to_file, GENERATORS, MIN_MAZE_SIZE
+from algorithms.search_algorithms import dfs, bfs, astar, bidirectional_bfs, bidirectional_astar, jump_point_search
+from algorithms.junction_graph import junction_search, get_junction_graph
+from algorithms.streaming_search import streaming_bfs
+from algorithms.convergence_trace import ConvergenceTrace
+from algorithms.mdp_algorithms import (define_mdp_components, value_iteration, policy_iteration, prioritized_sweeping,
+                                      bounded_value_iteration, apply_policy_to_maze, get_mdp_model)
 
 # Load configuration
 config = load_config(os.path.join(os.path.dirname(__file__), '..', 'config', 'settings.yaml'))
 thresholds = config['evaluation_metrics']['thresholds']
+algorithm_settings = config['algorithm_settings']
+generation_settings = config.get('maze_generation', {})
+
+# Per-run metrics are buffered and written in batches; the sink is flushed on exit
+results_dir = os.path.join(os.path.dirname(__file__), '..', 'data', 'results')
+storage_settings = config.get('metrics_storage', {})
+metrics_sink = MetricsSink(os.path.join(results_dir, 'performance_metrics'),
+                           os.path.join(results_dir, 'performance_metrics.csv'),
+                           batch_size=storage_settings.get('batch_size', 10000),
+                           format=storage_settings.get('format', 'parquet'))
+counters_sink = MetricsSink(os.path.join(results_dir, 'solver_counters'),
+                            os.path.join(results_dir, 'solver_counters.csv'),
+                            batch_size=storage_settings.get('batch_size', 10000),
+                            format=storage_settings.get('format', 'parquet'),
+                            columns=COUNTER_COLUMNS)
+atexit.register(metrics_sink.close)
+atexit.register(counters_sink.close)
+
+SEARCH_ALGORITHMS = ["dfs", "bfs", "astar", "bibfs", "biastar", "jps", "junction"]
+MDP_ALGORITHMS = ["value", "policy", "prioritized", "bounded"]
+# Solvers that accept a counters dict for hot-path instrumentation
+INSTRUMENTED_ALGORITHMS = ["dfs", "bfs", "astar", "value", "policy", "bounded", "prioritized"]
+TRACED_ALGORITHMS = ["value", "policy", "bounded"]
+# Solvers whose expansion order or value function can be exported as a GIF
+ANIMATED_ALGORITHMS = ["dfs", "bfs", "astar", "value", "policy", "bounded"]
 
 # ------------- Utility functions
 
@@ -27,95 +63,326 @@ def get_threshold(maze_size, thresholds):
     return threshold
 
 # Run the selected search algorithm
-def run_search_algorithm(algorithm, maze, start, goal):
-    algorithms = {"dfs": dfs, "bfs": bfs, "astar": astar}
-    return algorithms[algorithm](maze, start, goal)
+def run_search_algorithm(algorithm, maze, start, goal, persist_graph=True, counters=None, expansions=None):
+    algorithms = {"dfs": dfs, "bfs": bfs, "astar": astar, "bibfs": bidirectional_bfs, "biastar": bidirectional_astar,
+                  "jps": jump_point_search}
+    if algorithm == "junction":
+        # The junction graph is built once per maze and persisted beside the maze file
+        graph = get_junction_graph(maze, config["file_paths"]["maze_file"] if persist_graph else None)
+        return junction_search(maze, start, goal, graph)
+    options = {}
+    if counters is not None and algorithm in INSTRUMENTED_ALGORITHMS:
+        options["counters"] = counters
+    if expansions is not None and algorithm in ANIMATED_ALGORITHMS:
+        options["expansions"] = expansions
+    return algorithms[algorithm](maze, start, goal, **options)
 
 # Run the selected MDP algotithm
-def run_mdp_algorithm(algorithm, maze, start):
-    states, actions, transitions, rewards, gamma = define_mdp_components(maze)
+def run_mdp_algorithm(algorithm, maze, start, persist_model=True, counters=None, trace=None, observer=None):
+    # gamma and theta are tunable from settings.yaml (YAML reads 1e-6 as a string, hence float())
+    gamma = float(algorithm_settings.get("discount_factor", 0.9))
     mdp_algorithms = {
         "value": value_iteration,
-        "policy": policy_iteration
+        "policy": policy_iteration,
+        "prioritized": prioritized_sweeping,
+        "bounded": bounded_value_iteration
     }
-    policy, iterations = mdp_algorithms[algorithm](states, actions, transitions, rewards, gamma)
-    return apply_policy_to_maze(maze, policy, start), policy, iterations
-
-# Add the metrics to the performance_metrics.csv file
-def save_metrics_to_csv(metrics_list, maze_size, algorithm_type, algorithm, maze_id, timestamp):
-    file_path = os.path.join(os.path.dirname(__file__), '..', 'data', 'results', 'performance_metrics.csv')
+    options = {"theta": float(algorithm_settings.get("theta", 1e-6))}
+    if algorithm == "policy":
+        options.update({
+            "evaluation": algorithm_settings.get("policy_evaluation", "linear"),
+            "sweeps": algorithm_settings.get("evaluation_sweeps", 20),
+        })
+    if algorithm == "bounded":
+        # Only the policy on the path from start to goal is solved for
+        options.update({"start": start, "goal": find_start_goal(maze)[1]})
+    if counters is not None and algorithm in INSTRUMENTED_ALGORITHMS:
+        options["counters"] = counters
+    if algorithm == "prioritized":
+        # Prioritized sweeping counts its backups anyway, so they are reported on every run
+        options["counters"] = counters if counters is not None else {}
+    if trace is not None and algorithm in TRACED_ALGORITHMS:
+        options["trace"] = trace
+    if observer is not None and algorithm in ANIMATED_ALGORITHMS:
+        options["observer"] = observer
+    if algorithm == "policy" and options["evaluation"] == "iterative":
+        # Dict-based evaluation works on the uncompiled components
+        states, actions, transitions, rewards, _ = define_mdp_components(maze, **transition_noise())
+        policy, iterations = policy_iteration(states, actions, transitions, rewards, gamma, **options)
+    else:
+        model = get_cached_mdp_model(maze, persist_model)
+        policy, iterations = mdp_algorithms[algorithm](model.states, model.actions, None, None, gamma, model=model, **options)
+    backups = options["counters"].get("bellman_backups") if algorithm == "prioritized" else None
+    return apply_policy_to_maze(maze, policy, start), policy, iterations, backups
+
+# Slip probability and noise model of the MDP transitions; a slip of 0 keeps moves deterministic
+def transition_noise():
+    return {"slip": float(algorithm_settings.get("slip", 0.0)),
+            "noise": algorithm_settings.get("noise_model", "perpendicular")}
+
+# The compiled MDP is cached per maze and goal, optionally saved beside the maze file when persist_models is set
+def get_cached_mdp_model(maze, persist_model=True):
+    maze_file = config["file_paths"]["maze_file"] if persist_model and algorithm_settings.get("persist_models", False) else None
+    return get_mdp_model(maze, maze_file, max_bytes=algorithm_settings.get("model_cache_mb", 256) * 2 ** 20,
+                         **transition_noise())
+
+# Build (or fetch) the model before a benchmark so its build time is reported apart from the solve times
+def build_mdp_model(algorithm, maze, start, persist_model=True):
+    if algorithm == "policy" and algorithm_settings.get("policy_evaluation", "linear") == "iterative":
+        return None
+    return get_cached_mdp_model(maze, persist_model).build_time
+
+# Write the solution as an image, or as a GIF of the search expansions or MDP value function, without a window
+def export_solution(filename, algorithm_type, algorithm, maze, start, goal, path):
+    if not filename.lower().endswith('.gif'):
+        save_maze_image(filename, maze, path)
+    elif algorithm_type == "search":
+        expansions = array('l')
+        run_search_algorithm(algorithm, maze, start, goal, expansions=expansions)
+        save_search_animation(filename, maze, expansions, path)
+    else:
+        # Colours span the value bounds min(R) / (1 - gamma) to max(R) / (1 - gamma)
+        model = get_cached_mdp_model(maze)
+        gamma = float(algorithm_settings.get("discount_factor", 0.9))
+        animation = ValueAnimation(filename, maze, model.states, model.rewards.min() / (1 - gamma),
+                                   model.rewards.max() / (1 - gamma))
+        try:
+            run_mdp_algorithm(algorithm, maze, start, observer=animation)
+        finally:
+            animation.close(path)
+    logging.info(f"Exported the {algorithm} solution to {filename}")
+
+# Build a convergence trace for the first solve of an MDP run when enabled in settings.yaml
+def make_convergence_trace(algorithm, maze_size):
+    if not algorithm_settings.get("trace_convergence", False) or algorithm not in TRACED_ALGORITHMS:
+        return None
+    maze_size = int(maze_size)
+    return ConvergenceTrace(capacity=algorithm_settings.get("trace_capacity", 1024),
+                            expected_iterations=get_threshold(maze_size, thresholds),
+                            slow_factor=algorithm_settings.get("slow_factor", 10),
+                            theta=float(algorithm_settings.get("theta", 1e-6)),
+                            name=f"{algorithm} iteration on a {maze_size}x{maze_size} maze")
+
+# Save the convergence trace as data/results/convergence/<maze id>_<algorithm>.npy
+def save_convergence_trace(trace, algorithm, maze_id):
+    if trace is None or trace.count == 0:
+        return
+    directory = os.path.join(results_dir, 'convergence')
+    os.makedirs(directory, exist_ok=True)
+    trace.save(os.path.join(directory, f"{maze_id}_{algorithm}.npy"))
+    last = trace.records()[-1]
+    logging.info(f"Convergence trace for Maze ID: {maze_id}: {trace.count} iterations, final max delta {last['max_delta']:.3g}, "
+                 f"decay rate {trace.rate() or float('nan'):.4f}, {last['elapsed']:.4f} sec")
+
+# Queue the per-run metrics for the metrics dataset (or performance_metrics.csv without pyarrow)
+def save_metrics(metrics_list, maze_size, algorithm_type, algorithm, maze_id, timestamp):
+    # Ensure metrics_list is a list of dictionaries
+    if isinstance(metrics_list, dict):
+        metrics_list = [metrics_list]
+
+    metrics_sink.add([{
+        'maze_id': maze_id,
+        'timestamp': timestamp,
+        'maze_size': maze_size,
+        'algorithm_type': algorithm_type,
+        'algorithm': algorithm,
+        'run_index': run_index,
+        'execution_time': metrics.get('execution_times', None),
+        'memory_usage': metrics.get('memory_usages', None),
+        'path_length': metrics.get('path_lengths', None),
+        'convergence_rate': metrics.get('convergence_rates', None),
+        'bellman_backups': metrics.get('bellman_backups', None),
+        'optimality': metrics.get('optimalities', None),
+        'nodes_expanded': metrics.get('nodes_expanded', None),
+        'invalid_maze_attempts': metrics.get('invalid_maze_attempts', 0),
+        'failed_paths': metrics.get('failed_paths', 0),
+    } for run_index, metrics in enumerate(metrics_list, start=1)])
+
+    logging.info(f"Queued {len(metrics_list)} runs for Maze ID: {maze_id}")
+
+    counters = metrics_list[0].get('counters') if metrics_list else None
+    if counters:
+        # Counters come from one instrumented pass, so they are stored once per algorithm and maze
+        row = dict(counters, maze_id=maze_id, timestamp=timestamp, maze_size=maze_size,
+                   algorithm_type=algorithm_type, algorithm=algorithm)
+        if row.get('sweep_deltas') is not None:
+            row['sweep_deltas'] = json.dumps(row['sweep_deltas'])
+        counters_sink.add([row])
+    save_summary_to_csv(metrics_list, maze_size, algorithm_type, algorithm, maze_id, timestamp)
+
+# Add the timing statistics over all runs to the performance_summary.csv file
+def save_summary_to_csv(metrics_list, maze_size, algorithm_type, algorithm, maze_id, timestamp):
+    if isinstance(metrics_list, dict):
+        metrics_list = [metrics_list]
+    summary = summarise_execution_times([metrics.get('execution_times') for metrics in metrics_list])
+    if summary is None:
+        return
+    if summary['high_variance']:
+        logging.warning(f"High timing variance for {algorithm} on Maze ID: {maze_id} "
+                        f"(stddev/mean {summary['variation']:.2f}); the result may not be trustworthy")
+    file_path = os.path.join(results_dir, 'performance_summary.csv')
     file_exists = os.path.isfile(file_path)
+    first = metrics_list[0]
 
     with open(file_path, mode='a', newline='') as file:
         writer = csv.writer(file)
 
         if not file_exists:
-            writer.writerow(['Maze ID', 'Timestamp', 'Maze Size', 'Algorithm Type', 'Algorithm', 'Run Index', 
-                             'Execution Time', 'Memory Usage', 'Path Length', 'Convergence Rate', 'Optimality', 'Nodes Expanded',
-                             'Invalid Maze Attempts', 'Failed Paths'])
-
-        # Ensure metrics_list is a list of dictionaries
-        if isinstance(metrics_list, dict):
-            metrics_list = [metrics_list]
-
-        for run_index, metrics in enumerate(metrics_list, start=1):
-            writer.writerow([
-                maze_id,
-                timestamp,
-                maze_size,
-                algorithm_type,
-                algorithm,
-                run_index, 
-                metrics.get('execution_times', None),
-                metrics.get('memory_usages', None),
-                metrics.get('path_lengths', None),
-                metrics.get('convergence_rates', None),
-                metrics.get('optimalities', None),
-                metrics.get('nodes_expanded', None),
-                metrics.get('invalid_maze_attempts', 0),
-                metrics.get('failed_paths', 0)
-            ])
-
-        logging.info(f"Saved {len(metrics_list)} runs for Maze ID: {maze_id} in performance_metrics.csv")
-
-# Generate a maze until a valid one is found
-def generate_valid_maze(maze_size, maze_count):
-    logging.info(f"Generating maze {maze_count}...")
+            writer.writerow(['Maze ID', 'Timestamp', 'Maze Size', 'Algorithm Type', 'Algorithm', 'Runs',
+                             'Median Time', 'P95 Time', 'Mean Time', 'Stddev Time', 'Variation', 'High Variance',
+                             'Memory Usage', 'Path Length', 'Convergence Rate', 'Nodes Expanded', 'Build Time'])
+        writer.writerow([
+            maze_id,
+            timestamp,
+            maze_size,
+            algorithm_type,
+            algorithm,
+            summary['runs'],
+            summary['median'],
+            summary['p95'],
+            summary['mean'],
+            summary['stddev'],
+            summary['variation'],
+            summary['high_variance'],
+            first.get('memory_usages', None),
+            first.get('path_lengths', None),
+            first.get('convergence_rates', None),
+            first.get('nodes_expanded', None),
+            first.get('build_times', None),
+        ])
+
+# Generate a maze with the configured generator
+def generate_valid_maze(maze_size, maze_count, generator=None, braid=None, seed=None):
+    generator = generator or generation_settings.get('algorithm', 'backtracker')
+    braid = generation_settings.get('braid', 0.0) if braid is None else braid
+    logging.info(f"Generating maze {maze_count} with the {generator} generator...")
     maze_size = int(maze_size)
     
-    invalid_maze_attempts = 0
-    while True:
-        maze = generate_maze(maze_size)
-        start, goal = find_start_goal(maze)
-        
-        if start and goal:
-            break
-        invalid_maze_attempts += 1
-        logging.warning(f"Generated maze is invalid. Retrying... (Attempt {invalid_maze_attempts})")
-
-    return maze, start, goal, invalid_maze_attempts
+    # Start and goal are always placed on distinct connected passages, so no retries are needed
+    maze = generate_maze(maze_size, seed=seed, filename=config['file_paths']['maze_file'],
+                         algorithm=generator, braid_fraction=braid)
+    start, goal = find_start_goal(maze)
+
+    return maze, start, goal
+
+# Record a run whose solver returned no path, so the failure reaches the metrics and summary
+def save_failed_run(execution_time, maze_size, algorithm_type, algorithm, maze_id, timestamp):
+    logging.error(f"No valid path found for Maze ID: {maze_id}")
+    save_metrics({'execution_times': execution_time, 'failed_paths': 1},
+                 maze_size, algorithm_type, algorithm, maze_id, timestamp)
+
+# Generate a maze straight to disk and solve it through a memory map, for mazes larger than RAM
+def run_streaming_maze(maze_size, seed=None):
+    maze_file = config['file_paths']['maze_file']
+    maze_start_time = time.time()
+    start, goal = stream_maze_to_file(maze_file, maze_size, seed=seed)
+    maze_generation_time = time.time() - maze_start_time
+    logging.info(f"Streamed {maze_size}x{maze_size} maze to {maze_file}, Start: {start}, Goal: {goal}")
+
+    algorithm_start_time = time.time()
+    path, nodes_expanded = streaming_bfs(load_maze_mmap(maze_file), start, goal,
+                                         workdir=os.path.dirname(maze_file) or None)
+    algorithm_execution_time = time.time() - algorithm_start_time
+    if path:
+        save_solution_path(path, config['file_paths']['solution_path_file'])
+    logging.info(f"Maze Generation Time: {maze_generation_time:.4f} sec, Algorithm Time: {algorithm_execution_time:.4f} sec, "
+                 f"Path length: {len(path) if path else None}, Nodes expanded: {nodes_expanded}")
+    return path, nodes_expanded
+
+# argparse type for maze sizes, rejecting sizes the generators cannot carve
+def maze_size_arg(value):
+    size = int(value)
+    if size < MIN_MAZE_SIZE:
+        raise argparse.ArgumentTypeError(f"maze size must be at least {MIN_MAZE_SIZE}, got {size}")
+    return size
+
+# Run a sizes x algorithms x seeds benchmark matrix in a process pool
+def run_batch_command(argv):
+    parser = argparse.ArgumentParser(
+        prog="main.py batch",
+        description="Benchmark a matrix of maze sizes, algorithms and seeds in parallel",
+        usage="python main.py batch --sizes <n> [<n> ...] --algorithms <name> [<name> ...] [options]\n"
+              "Example: python main.py batch --sizes 21 51 --algorithms bfs astar value --seeds 0 1 2"
+        )
+    parser.add_argument("--sizes", type=maze_size_arg, nargs="+", required=True, help="Maze sizes to generate")
+    parser.add_argument("--algorithms", nargs="+", required=True, choices=SEARCH_ALGORITHMS + MDP_ALGORITHMS,
+                        help="Algorithms to run on every maze")
+    parser.add_argument("--seeds", type=int, nargs="+", default=[0], help="Maze seeds; one maze per size and seed")
+    parser.add_argument("--runs", type=int, default=config["evaluation_metrics"]["runs"], help="Runs per algorithm and maze")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: CPU count)")
+    parser.add_argument("--generator", choices=sorted(GENERATORS), help="Maze generation algorithm (default from settings.yaml)")
+    parser.add_argument("--braid", type=float, help="Fraction of dead-ends to remove, adding loops")
+    parser.add_argument("--instrument", action="store_true", help="Record solver counters to the solver_counters dataset")
+    args = parser.parse_args(argv)
+
+    generator = args.generator or generation_settings.get('algorithm', 'backtracker')
+    braid = generation_settings.get('braid', 0.0) if args.braid is None else args.braid
+    algorithms = [("search" if name in SEARCH_ALGORITHMS else "mdp", name) for name in args.algorithms]
+    instrument = {"instrument": True} if args.instrument else {}
+    batch_start_time = time.time()
+    completed = run_batch(
+        args.sizes, algorithms, args.seeds,
+        generate=lambda size, seed: generate_maze(size, seed=seed, algorithm=generator, braid_fraction=braid),
+        solvers={"search": run_search_algorithm, "mdp": run_mdp_algorithm},
+        write_metrics=save_metrics,
+        runs=args.runs,
+        workers=args.workers,
+        # Workers must not race on the junction graph or model files beside the shared maze file
+        solver_options={"search": {"persist_graph": False, **instrument},
+                        "mdp": {"persist_model": False, "setup": build_mdp_model, **instrument}},
+    )
+    metrics_sink.flush()
+    counters_sink.flush()
+    total = len(args.sizes) * len(args.seeds) * len(algorithms)
+    logging.info(f"Batch finished: {completed}/{total} tasks in {time.time() - batch_start_time:.2f} sec")
 
 # ------------- Main functions
 
 # Main entry point for command line mode
 def main(stdscr=None):
+    if len(sys.argv) > 1 and sys.argv[1] == "batch":
+        run_batch_command(sys.argv[2:])
+        return
+    if len(sys.argv) > 1 and sys.argv[1] == "export-metrics":
+        # Rewrites the Parquet metrics dataset as a CSV with the original performance_metrics.csv columns
+        csv_file = sys.argv[2] if len(sys.argv) > 2 else os.path.join(results_dir, 'performance_metrics_export.csv')
+        export_csv(metrics_sink.path, csv_file)
+        return
     parser = argparse.ArgumentParser(
         description="Maze Generator and Solver",
         usage="python main.py <maze_size> <algorithm_type> <algorithm> [runs]\n"
               "Example: python main.py 50 search dfs 5"
         )
-    parser.add_argument("maze_size", type=int, help="Size of the maze (e.g., 50 for 50x50)")
+    parser.add_argument("maze_size", type=maze_size_arg, help=f"Size of the maze (e.g., 50 for 50x50, at least {MIN_MAZE_SIZE})")
     parser.add_argument("algorithm_type", choices=["search", "mdp"], help="Type of algorithm to use (search or mdp)")
-    parser.add_argument("algorithm", choices=["dfs", "bfs", "astar", "value", "policy"], help="Algorithm to use")
+    parser.add_argument("algorithm", choices=SEARCH_ALGORITHMS + MDP_ALGORITHMS, help="Algorithm to use")
     parser.add_argument("runs", type=int, nargs="?", help="Number of runs for performance evaluation")
+    parser.add_argument("--generator", choices=sorted(GENERATORS), help="Maze generation algorithm (default from settings.yaml)")
+    parser.add_argument("--braid", type=float, help="Fraction of dead-ends to remove, adding loops (0 keeps the maze perfect)")
+    parser.add_argument("--seed", type=int, help="Random seed for reproducible mazes")
+    parser.add_argument("--instrument", action="store_true", help="Record solver counters to the solver_counters dataset")
+    parser.add_argument("--stream", action="store_true",
+                        help="Stream an Eller maze to disk and solve it memory-mapped (search bfs only, no display)")
+    parser.add_argument("--export", metavar="FILE",
+                        help="Save the solution as an image (e.g. .png), or as an animated .gif of the expansion order "
+                             "(dfs, bfs, astar) or value function (value, policy, bounded)")
+    parser.add_argument("--headless", action="store_true", help="Do not open the Tk window")
     try:
         args = parser.parse_args()
     except SystemExit:
         exit(1)
+    if args.export and args.export.lower().endswith('.gif') and args.algorithm not in ANIMATED_ALGORITHMS:
+        parser.error(f"GIF export supports {', '.join(ANIMATED_ALGORITHMS)}")
 
     # Use config value if runs argument is not provided
     runs = args.runs if args.runs is not None else config["evaluation_metrics"]["runs"]
 
+    if args.stream:
+        if (args.algorithm_type, args.algorithm) != ("search", "bfs"):
+            parser.error("--stream only supports the search bfs solver")
+        run_streaming_maze(args.maze_size, args.seed)
+        return
+
     if args.maze_size and args.algorithm_type and args.algorithm:
         maze_size = args.maze_size
         algorithm_type = args.algorithm_type
@@ -123,45 +390,43 @@ def main(stdscr=None):
         maze_count = 1
 
         logging.info(f"Selected maze size: {maze_size}, Algorithm type: {algorithm_type}, Algorithm: {algorithm}, Runs: {runs}")
-        total_invalid_maze_attempts = 0
-        failed_paths = 0
         # Maze Generation Time
         maze_start_time = time.time()
-        # Keep regenerating the maze until a valid path is found
-        while True:
-            # Generate a valid maze
-            maze, start, goal, invalid_maze_attempts = generate_valid_maze(maze_size, maze_count)
-            maze_end_time = time.time()
-            maze_generation_time = maze_end_time - maze_start_time
-            total_invalid_maze_attempts += invalid_maze_attempts
-            maze_id = str(uuid.uuid4())
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            
-            logging.info(f"Maze ID: {maze_id}, Timestamp: {timestamp}, Start: {start}, Goal: {goal}")
+        # Every generator places start and goal on connected passages, so a missing path is a solver failure
+        maze, start, goal = generate_valid_maze(maze_size, maze_count, args.generator, args.braid, args.seed)
+        maze_end_time = time.time()
+        maze_generation_time = maze_end_time - maze_start_time
+        maze_id = str(uuid.uuid4())
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
-            # Algorithm Execution Time
-            algorithm_start_time = time.time()
-            # Execute the selected algorithm
-            if algorithm_type == "search":
-                path, nodes_expanded = run_search_algorithm(algorithm, maze, start, goal)
-            elif algorithm_type == "mdp":
-                path, policy, iterations = run_mdp_algorithm(algorithm, maze, start)
+        logging.info(f"Maze ID: {maze_id}, Timestamp: {timestamp}, Start: {start}, Goal: {goal}")
+
+        # Algorithm Execution Time
+        algorithm_start_time = time.time()
+        # Execute the selected algorithm
+        if algorithm_type == "search":
+            path, nodes_expanded = run_search_algorithm(algorithm, maze, start, goal)
+        elif algorithm_type == "mdp":
+            trace = make_convergence_trace(algorithm, maze_size)
+            path, policy, iterations, _ = run_mdp_algorithm(algorithm, maze, start, trace=trace)
+            save_convergence_trace(trace, algorithm, maze_id)
 
-            # If a valid path is found, break the loop
-            if path:
-                logging.info(f"Path found for Maze ID: {maze_id}, Path: {path}")
-                break  # Exit the loop when a valid path is found
-            else:
-                logging.warning(f"No valid path found for Maze ID: {maze_id}. Regenerating maze...")
-                failed_paths += 1
-        # Once a valid maze and path are found, save and analyse it
         algorithm_end_time = time.time()
         algorithm_execution_time = algorithm_end_time - algorithm_start_time
+        if not path:
+            save_failed_run(algorithm_execution_time, maze_size, algorithm_type, algorithm, maze_id, timestamp)
+            sys.exit(1)
+        logging.info(f"Path found for Maze ID: {maze_id}, Path: {path}")
+        # Once a path is found, save and analyse it
         save_solution_path(path, config["file_paths"]["solution_path_file"])
+        if args.export:
+            # Before the path is marked, so animations start from the bare maze
+            export_solution(args.export, algorithm_type, algorithm, maze, start, goal, path)
         mark_solution_path(maze, path)
 
         # Processing time
         # Evaluate performance
+        instrument = {"instrument": True} if args.instrument else {}
         post_processing_start_time = time.time()
         if algorithm_type == "search":
             metrics_list = run(
@@ -172,8 +437,7 @@ def main(stdscr=None):
                 maze=maze,
                 start=start,
                 goal=goal,
-                invalid_maze_attempts=total_invalid_maze_attempts,
-                failed_paths=failed_paths,
+                **instrument,
             )
         else:
             metrics_list = run(
@@ -183,16 +447,18 @@ def main(stdscr=None):
                 algorithm=algorithm,
                 maze=maze,
                 start=start,
-                invalid_maze_attempts=total_invalid_maze_attempts,
-                failed_paths=failed_paths,
+                setup=build_mdp_model,
+                **instrument,
             )
-        save_metrics_to_csv(metrics_list, maze_size, algorithm_type, algorithm, maze_id, timestamp)
+        save_metrics(metrics_list, maze_size, algorithm_type, algorithm, maze_id, timestamp)
         post_processing_end_time = time.time()
         post_processing_time = post_processing_end_time - post_processing_start_time
         logging.info(f"Metrics saved for Maze ID: {maze_id}, Metrics: {metrics_list}")
         total_time = maze_generation_time + algorithm_execution_time + post_processing_time
         logging.info(f"Maze Generation Time: {maze_generation_time:.4f} sec, Algorithm Time: {algorithm_execution_time:.4f} sec, Post-processing Time: {post_processing_time:.4f} sec, Total Runtime: {total_time:.4f} sec")
         
+        if args.headless:
+            return
         # Display the maze with the solution path
         maze_window_title = f"Maze {maze_count}: {maze_size} - {algorithm_type} - {algorithm}"
         if algorithm_type == "search":
@@ -232,10 +498,10 @@ def curses_main(stdscr):
                 stdscr.refresh()
                 curses.napms(2000)
                 return
-            if maze_size_input.isdigit() and int(maze_size_input) > 0:
+            if maze_size_input.isdigit() and int(maze_size_input) >= MIN_MAZE_SIZE:
                 maze_size = maze_size_input
             else:
-                stdscr.addstr(6, 2, "Invalid input. Please enter a positive number.")
+                stdscr.addstr(6, 2, f"Invalid input. Please enter a number of at least {MIN_MAZE_SIZE}.")
                 stdscr.refresh()
                 curses.napms(2000)
                 continue
@@ -280,10 +546,10 @@ def curses_main(stdscr):
 
             if algorithm_type == "search":
                 algorithm_prompt = "Select the search algorithm:"
-                algorithms = ["dfs", "bfs", "astar", "go back"]
+                algorithms = ["dfs", "bfs", "astar", "bibfs", "biastar", "jps", "junction", "go back"]
             else:
                 algorithm_prompt = "Select the MDP algorithm:"
-                algorithms = ["value", "policy", "go back"]
+                algorithms = ["value", "policy", "prioritized", "bounded", "go back"]
 
             stdscr.addstr(5, 2, algorithm_prompt)
             current_alg = 0
@@ -310,10 +576,6 @@ def curses_main(stdscr):
                 continue
         
         logging.info(f'Selected maze size: {maze_size}, Algorithm type: {algorithm_type}, Algorithm: {algorithm}')
-        # Track invalid mazes & failed paths
-        total_invalid_maze_attempts = 0
-        failed_paths = 0
-        
         # Generate a valid maze
         stdscr.clear()
         stdscr.addstr(1, (curses.COLS - len(title)) // 2, title, curses.A_BOLD)
@@ -322,10 +584,9 @@ def curses_main(stdscr):
         stdscr.refresh()
         logging.info(message)
         maze_start_time = time.time()
-        maze, start, goal, invalid_maze_attempts = generate_valid_maze(maze_size, maze_count)
+        maze, start, goal = generate_valid_maze(maze_size, maze_count)
         maze_end_time = time.time()
         maze_generation_time = maze_end_time - maze_start_time
-        total_invalid_maze_attempts += invalid_maze_attempts
         maze_id = str(uuid.uuid4())
         timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
 
@@ -337,10 +598,12 @@ def curses_main(stdscr):
         if algorithm_type == "search":
             path, nodes_expanded = run_search_algorithm(algorithm, maze, start, goal)
         elif algorithm_type == "mdp":
-            path, policy, iterations = run_mdp_algorithm(algorithm, maze, start)
+            trace = make_convergence_trace(algorithm, maze_size)
+            path, policy, iterations, _ = run_mdp_algorithm(algorithm, maze, start, trace=trace)
+            save_convergence_trace(trace, algorithm, maze_id)
+        algorithm_end_time = time.time()
+        algorithm_execution_time = algorithm_end_time - algorithm_start_time
         if path:
-            algorithm_end_time = time.time()
-            algorithm_execution_time = algorithm_end_time - algorithm_start_time
             save_solution_path(path, config['file_paths']['solution_path_file'])
             mark_solution_path(maze, path)
             logging.info(f'Path found for Maze ID: {maze_id}, Path: {path}')
@@ -351,18 +614,17 @@ def curses_main(stdscr):
                 metrics_list = run(run_search_algorithm, 
                             runs=config['evaluation_metrics']['runs'], 
                             algorithm_type=algorithm_type,
-                            algorithm=algorithm, maze=maze, start=start, goal=goal, 
-                            invalid_maze_attempts=total_invalid_maze_attempts, failed_paths=failed_paths)
+                            algorithm=algorithm, maze=maze, start=start, goal=goal)
             else:
                 metrics_list = run(run_mdp_algorithm, 
                             runs=config['evaluation_metrics']['runs'], 
                             algorithm_type=algorithm_type,
-                            algorithm=algorithm, maze=maze, start=start, 
-                            invalid_maze_attempts=total_invalid_maze_attempts, failed_paths=failed_paths)
+                            algorithm=algorithm, maze=maze, start=start,
+                            setup=build_mdp_model)
             post_processing_end_time = time.time()
             post_processing_time = post_processing_end_time - post_processing_start_time
             # Save metrics
-            save_metrics_to_csv(metrics_list, maze_size, algorithm_type, algorithm, maze_id, timestamp)
+            save_metrics(metrics_list, maze_size, algorithm_type, algorithm, maze_id, timestamp)
             logging.info(f'Metrics saved for Maze ID: {maze_id}, Metrics: {metrics_list}')
             
             stdscr.clear()
@@ -383,8 +645,7 @@ def curses_main(stdscr):
                 thread.start()
                 thread.join(timeout=0.1)
         else:
-            logging.warning(f'No valid path found for Maze ID: {maze_id}')
-            failed_paths += 1
+            save_failed_run(algorithm_execution_time, maze_size, algorithm_type, algorithm, maze_id, timestamp)
             continue
 
         # Increment maze count after each run
@@ -0,0 +1,90 @@
+import logging
+import uuid
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from multiprocessing import shared_memory
+import numpy as np
+from utils.maze_grid import MazeGrid
+from utils.maze_loader import find_start_goal
+from utils.performance_evaluator import run
+
+def share_maze(maze):
+    """Copies the maze cells into a shared memory block; returns the block and a picklable descriptor."""
+    block = shared_memory.SharedMemory(create=True, size=maze.cells.nbytes)
+    np.ndarray(maze.cells.shape, dtype=np.uint8, buffer=block.buf)[:] = maze.cells
+    return block, (block.name, maze.cells.shape)
+
+def attach_maze(descriptor):
+    """Maps a shared maze read-only as a MazeGrid; the returned block must be closed after use."""
+    name, shape = descriptor
+    block = shared_memory.SharedMemory(name=name)
+    cells = np.ndarray(shape, dtype=np.uint8, buffer=block.buf)
+    cells.flags.writeable = False
+    return block, MazeGrid(cells)
+
+def run_batch_task(descriptor, func, algorithm_type, algorithm, runs, **kwargs):
+    """Worker side of a batch: runs one algorithm on a shared maze and returns its metrics."""
+    block, maze = attach_maze(descriptor)
+    try:
+        start, goal = find_start_goal(maze)
+        if algorithm_type == 'search':
+            kwargs['goal'] = goal
+        return run(func, runs, algorithm_type, algorithm=algorithm, maze=maze, start=start, **kwargs)
+    finally:
+        del maze  # Release the view before closing the block
+        block.close()
+
+def run_batch(sizes, algorithms, seeds, generate, solvers, write_metrics, runs=1, workers=None, solver_options=None):
+    """Benchmarks every size x (algorithm_type, algorithm) x seed combination in a process pool.
+
+    Each maze is generated once by generate(size, seed) and shared read-only with the workers.
+    Results are written by write_metrics(metrics_list, size, algorithm_type, algorithm, maze_id, timestamp)
+    in this process only, so a single writer appends every row. Returns the number of completed tasks.
+    """
+    solver_options = solver_options or {}
+    pending = {}  # Future -> (maze_id, size, algorithm_type, algorithm)
+    blocks = {}   # maze_id -> [shared block, outstanding task count]
+    completed = 0
+
+    def collect(future):
+        maze_id, size, algorithm_type, algorithm = pending.pop(future)
+        try:
+            metrics_list = future.result()
+        except Exception as e:
+            logging.error(f"Batch task {algorithm_type}/{algorithm} on maze {maze_id} (size {size}) failed: {e}")
+            metrics_list = None
+        if metrics_list is not None:
+            write_metrics(metrics_list, size, algorithm_type, algorithm, maze_id,
+                          datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+        entry = blocks[maze_id]
+        entry[1] -= 1
+        if entry[1] == 0:
+            # Every task on this maze has finished, so its shared block can go
+            entry[0].close()
+            entry[0].unlink()
+            del blocks[maze_id]
+        return metrics_list is not None
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        try:
+            for size in sizes:
+                for seed in seeds:
+                    maze = generate(size, seed)
+                    maze_id = str(uuid.uuid4())
+                    block, descriptor = share_maze(maze)
+                    blocks[maze_id] = [block, len(algorithms)]
+                    logging.info(f"Batch maze {maze_id}: size {size}, seed {seed}")
+                    for algorithm_type, algorithm in algorithms:
+                        future = executor.submit(run_batch_task, descriptor, solvers[algorithm_type], algorithm_type,
+                                                 algorithm, runs, **solver_options.get(algorithm_type, {}))
+                        pending[future] = (maze_id, size, algorithm_type, algorithm)
+                    # Write whatever has finished while the next maze is generated
+                    for future in [f for f in pending if f.done()]:
+                        completed += collect(future)
+            for future in as_completed(list(pending)):
+                completed += collect(future)
+        finally:
+            for block, _ in blocks.values():
+                block.close()
+                block.unlink()
+    return completed
@@ -0,0 +1,108 @@
+import struct
+import zlib
+from collections import namedtuple
+import numpy as np
+from utils.maze_grid import MazeGrid, WALL, PASSAGE, START, GOAL, SOLUTION, as_grid
+
+# Fixed little-endian header: magic, version, bits per cell, flags, rows, cols, start, goal, seed.
+# Missing start/goal positions and seeds are stored as -1.
+MAGIC = b'MAZE'
+VERSION = 1
+HEADER = struct.Struct('<4sBBBxIIiiiiq')
+COMPRESSED = 1
+BINARY_SUFFIX = '.maze'
+
+# Cell codes of the 2-bit payload (the 1-bit payload only stores walls). Start and goal are kept
+# in the header, so they are stored as passages.
+CODE_OF_CELL = np.ones(256, dtype=np.uint8)
+CODE_OF_CELL[WALL] = 0
+CODE_OF_CELL[SOLUTION] = 2
+CELL_OF_CODE = np.array([WALL, PASSAGE, SOLUTION, PASSAGE], dtype=np.uint8)
+# The four cells packed into each possible 2-bit payload byte, most significant bits first
+CELLS_OF_BYTE = CELL_OF_CODE[(np.arange(256, dtype=np.uint8)[:, None] >> np.array([6, 4, 2, 0], dtype=np.uint8)) & 3]
+
+MazeHeader = namedtuple('MazeHeader', 'bits flags rows cols start goal seed')
+
+def is_binary_maze(filename):
+    with open(filename, 'rb') as file:
+        return file.read(len(MAGIC)) == MAGIC
+
+def row_bytes(cols, bits):
+    # Every row starts on a byte boundary so single rows can be sliced out of a memmap
+    return (cols * bits + 7) // 8
+
+def pack_cells(cells, bits):
+    if bits == 1:
+        return np.packbits(cells == WALL, axis=1)
+    if bits != 2:
+        raise ValueError(f"Binary mazes store 1 or 2 bits per cell, got {bits}")
+    rows, cols = cells.shape
+    codes = np.zeros((rows, row_bytes(cols, 2) * 4), dtype=np.uint8)
+    codes[:, :cols] = CODE_OF_CELL[cells]
+    quads = codes.reshape(rows, -1, 4)
+    return (quads[:, :, 0] << 6) | (quads[:, :, 1] << 4) | (quads[:, :, 2] << 2) | quads[:, :, 3]
+
+def unpack_cells(payload, header):
+    rows, cols = header.rows, header.cols
+    if header.bits == 1:
+        # Wall bits of 0/1 become PASSAGE/WALL codes in place, avoiding a boolean temporary
+        cells = np.unpackbits(payload, axis=1, count=cols)
+        cells *= WALL - PASSAGE
+        cells += PASSAGE
+    else:
+        cells = np.ascontiguousarray(CELLS_OF_BYTE[payload].reshape(rows, -1)[:, :cols])
+    for position, value in ((header.start, START), (header.goal, GOAL)):
+        if position is not None:
+            cells[position] = value
+    return cells
+
+def save_maze_binary(filename, maze, seed=None, bits=1, compress=False):
+    """Saves a maze as a header plus a 1-bit (walls) or 2-bit (walls and solution marks) payload."""
+    grid = as_grid(maze)
+    payload = pack_cells(grid.cells, bits)
+    starts, goals = grid.find(START), grid.find(GOAL)
+    start = starts[-1] if starts else (-1, -1)
+    goal = goals[-1] if goals else (-1, -1)
+    flags = COMPRESSED if compress else 0
+    header = HEADER.pack(MAGIC, VERSION, bits, flags, grid.rows, grid.cols, *start, *goal,
+                         -1 if seed is None else seed)
+    data = zlib.compress(payload.tobytes(), 1) if compress else payload.tobytes()
+    with open(filename, 'wb') as file:
+        file.write(header)
+        file.write(data)
+
+def read_maze_header(filename):
+    with open(filename, 'rb') as file:
+        raw = file.read(HEADER.size)
+    if len(raw) < HEADER.size or raw[:len(MAGIC)] != MAGIC:
+        raise ValueError(f"{filename} is not a binary maze file")
+    magic, version, bits, flags, rows, cols, sr, sc, gr, gc, seed = HEADER.unpack(raw)
+    if version != VERSION:
+        raise ValueError(f"Unsupported binary maze version {version} in {filename}")
+    return MazeHeader(bits, flags, rows, cols,
+                      (sr, sc) if sr >= 0 else None, (gr, gc) if gr >= 0 else None,
+                      seed if seed >= 0 else None)
+
+def memmap_maze_binary(filename):
+    """Maps the packed payload of an uncompressed binary maze without reading it.
+
+    Returns the header and a (rows, row_bytes) uint8 memmap of the packed cells.
+    """
+    header = read_maze_header(filename)
+    if header.flags & COMPRESSED:
+        raise ValueError(f"{filename} is compressed and cannot be memory-mapped")
+    payload = np.memmap(filename, dtype=np.uint8, mode='r', offset=HEADER.size,
+                        shape=(header.rows, row_bytes(header.cols, header.bits)))
+    return header, payload
+
+def load_maze_binary(filename):
+    """Loads a binary maze as a MazeGrid, unpacking the payload in a single array operation."""
+    header = read_maze_header(filename)
+    shape = (header.rows, row_bytes(header.cols, header.bits))
+    if header.flags & COMPRESSED:
+        with open(filename, 'rb') as file:
+            file.seek(HEADER.size)
+            payload = np.frombuffer(zlib.decompress(file.read()), dtype=np.uint8).reshape(shape)
+    else:
+        _, payload = memmap_maze_binary(filename)
+    return MazeGrid(unpack_cells(payload, header)), header
@@ -1,67 +1,240 @@
 # Original file: https://github.com/ChickenSlayer3000/Random-Maze-Generator/blob/master/maze.py
 # Alterations made to allow input of sizes for generating mazes of varying sizes, saving the maze to a text file, and defining start and goal positions
 # The original file is a maze generator that creates a maze of random size and saves it to a text file. The maze is then displayed using Tkinter.
+# Rewritten to carve a flat bytearray with an explicit stack and a per-call random generator, so no state is shared between calls or threads.
 
-from random import randint
-
-cell_size = 9 #pixels
-ms = 100 # rows and columns
-visited_cells = []
-walls = []
-
-def set_maze_size(size):
-    global ms, maze
-    ms = size
-    maze = [['w' for _ in range(ms)] for _ in range(ms)]
-
-def check_neighbours(ccr, ccc):
-    neighbours = [[ccr, ccc-1, ccr-1, ccc-2, ccr, ccc-2, ccr+1, ccc-2, ccr-1, ccc-1, ccr+1, ccc-1], #left
-                [ccr, ccc+1, ccr-1, ccc+2, ccr, ccc+2, ccr+1, ccc+2, ccr-1, ccc+1, ccr+1, ccc+1], #right
-                [ccr-1, ccc, ccr-2, ccc-1, ccr-2, ccc, ccr-2, ccc+1, ccr-1, ccc-1, ccr-1, ccc+1], #top
-                [ccr+1, ccc, ccr+2, ccc-1, ccr+2, ccc, ccr+2, ccc+1, ccr+1, ccc-1, ccr+1, ccc+1]] #bottom
-    visitable_neighbours = []           
-    for i in neighbours:                                                                        #find neighbours to visit
-        if i[0] > 0 and i[0] < (ms-1) and i[1] > 0 and i[1] < (ms-1):
-            if maze[i[2]][i[3]] == 'P' or maze[i[4]][i[5]] == 'P' or maze[i[6]][i[7]] == 'P' or maze[i[8]][i[9]] == 'P' or maze[i[10]][i[11]] == 'P':
-                walls.append(i[0:2])                                                                                               
-            else:
-                visitable_neighbours.append(i[0:2])
-    return visitable_neighbours
-
-def save_maze_to_file(filename):
-    with open(filename, 'w') as file:
-        for row in maze:
-            file.write(''.join(row) + '\n')
-
-def generate_maze(size):
-    set_maze_size(size)
-
-    #StartingPoint
-    scr = randint(0, ms-1)
-    scc = randint(0, ms-1)
-    ccr, ccc = scr, scc
-
-    maze[ccr][ccc] = 'S'  # Mark the start position
-
-    # Define goal position
-    goal_r = randint(0, ms-1)
-    goal_c = randint(0, ms-1)
-    maze[goal_r][goal_c] = 'G'  # Mark the goal position
-
-    finished = False
-    while not finished:
-        visitable_neighbours = check_neighbours(ccr, ccc)
-        if len(visitable_neighbours) != 0:
-            d = randint(1, len(visitable_neighbours))-1
-            ncr, ncc = visitable_neighbours[d]
-            maze[ncr][ncc] = 'P'
-            visited_cells.append([ncr, ncc])
-            ccr, ccc = ncr, ncc
-        if len(visitable_neighbours) == 0:
-            try:
-                ccr, ccc = visited_cells.pop()
-            except:
-                finished = True
-
-    save_maze_to_file('data/mazes/generated_maze.txt')
-    return maze
\ No newline at end of file
+import random
+import numpy as np
+from utils.maze_grid import MazeGrid, WALL, PASSAGE, START, GOAL, as_grid
+from utils.maze_binary import save_maze_binary, BINARY_SUFFIX
+
+MIN_MAZE_SIZE = 5
+
+def carve_offsets(size):
+    # For each direction: the step to the neighbour, then the five cells around it that must still be walls
+    offsets = []
+    for dr, dc in ((0, -1), (0, 1), (-1, 0), (1, 0)):  # left, right, top, bottom
+        step = dr * size + dc
+        side = dc * size + dr  # Perpendicular to the step
+        offsets.append((dr, dc, step, (step, step + side, step - side, side, -side)))
+    return offsets
+
+# ------------- Generators
+# Each carves passages into a size x size bytearray of walls. Apart from the backtracker they work on the
+# lattice of odd (row, col) cells, with the wall cell between two lattice cells opened to join them.
+
+def carve_backtracker(size, rng):
+    cells = bytearray([WALL]) * (size * size)
+    offsets = carve_offsets(size)
+
+    # StartingPoint
+    current = rng.randint(1, size - 2) * size + rng.randint(1, size - 2)
+    cells[current] = PASSAGE
+    stack = [current]
+    while stack:
+        current = stack[-1]
+        r, c = divmod(current, size)
+        visitable_neighbours = []
+        for dr, dc, step, around in offsets:
+            if 0 < r + dr < size - 1 and 0 < c + dc < size - 1:
+                neighbour = current + step
+                if cells[neighbour] == WALL and all(cells[neighbour + offset] == WALL for offset in around):
+                    visitable_neighbours.append(neighbour)
+        if visitable_neighbours:
+            neighbour = rng.choice(visitable_neighbours)
+            cells[neighbour] = PASSAGE
+            stack.append(neighbour)
+        else:
+            stack.pop()
+    return cells
+
+def lattice_cells(size):
+    # Lattice cell (i, j) sits at grid cell (2i + 1, 2j + 1)
+    n = (size - 1) // 2
+    return n, [(2 * (k // n) + 1) * size + 2 * (k % n) + 1 for k in range(n * n)]
+
+def carve_kruskal(size, rng):
+    cells = bytearray([WALL]) * (size * size)
+    n, ids = lattice_cells(size)
+    for cell in ids:
+        cells[cell] = PASSAGE
+    edges = [(k, k + 1) for k in range(n * n) if k % n != n - 1] + [(k, k + n) for k in range(n * n - n)]
+    rng.shuffle(edges)
+
+    parent = list(range(n * n))
+    def find(k):
+        while parent[k] != k:
+            parent[k] = parent[parent[k]]
+            k = parent[k]
+        return k
+
+    for a, b in edges:
+        root_a, root_b = find(a), find(b)
+        if root_a != root_b:
+            parent[root_a] = root_b
+            cells[(ids[a] + ids[b]) // 2] = PASSAGE
+    return cells
+
+def carve_wilson(size, rng):
+    cells = bytearray([WALL]) * (size * size)
+    n, ids = lattice_cells(size)
+    in_tree = bytearray(n * n)
+    root = rng.randrange(n * n)
+    in_tree[root] = 1
+    cells[ids[root]] = PASSAGE
+    exit_to = [-1] * (n * n)
+    order = list(range(n * n))
+    rng.shuffle(order)
+
+    for walk_start in order:
+        if in_tree[walk_start]:
+            continue
+        # Random walk until the tree is hit; overwriting exits erases loops
+        k = walk_start
+        while not in_tree[k]:
+            i, j = divmod(k, n)
+            choices = [k + d for d, ok in ((-n, i > 0), (n, i < n - 1), (-1, j > 0), (1, j < n - 1)) if ok]
+            exit_to[k] = rng.choice(choices)
+            k = exit_to[k]
+        k = walk_start
+        while not in_tree[k]:
+            in_tree[k] = 1
+            cells[ids[k]] = PASSAGE
+            cells[(ids[k] + ids[exit_to[k]]) // 2] = PASSAGE
+            k = exit_to[k]
+    return cells
+
+def eller_rows(size, rng):
+    """Yields the maze one grid row (bytes of length size) at a time, keeping only one row of set ids."""
+    n = (size - 1) // 2
+    wall_row = bytes([WALL]) * size
+    yield wall_row
+    row_sets = list(range(n))
+    members = {k: [k] for k in range(n)}
+    next_set = n
+
+    def merge(a, b):
+        # Relabel the smaller set into the larger one
+        if len(members[a]) < len(members[b]):
+            a, b = b, a
+        for j in members[b]:
+            row_sets[j] = a
+        members[a].extend(members.pop(b))
+
+    for i in range(n):
+        last = i == n - 1
+        cell_row = bytearray(wall_row)
+        cell_row[1:2 * n:2] = bytes([PASSAGE]) * n
+        for j in range(n - 1):
+            if row_sets[j] != row_sets[j + 1] and (last or rng.random() < 0.5):
+                merge(row_sets[j], row_sets[j + 1])
+                cell_row[2 * j + 2] = PASSAGE
+        yield bytes(cell_row)
+        if last:
+            break
+
+        # At least one vertical passage per set; cells without one start a new set below
+        down_row = bytearray(wall_row)
+        carried = [False] * n
+        for cols in members.values():
+            chosen = [j for j in cols if rng.random() < 0.5] or [rng.choice(cols)]
+            for j in chosen:
+                carried[j] = True
+                down_row[2 * j + 1] = PASSAGE
+        yield bytes(down_row)
+        members = {}
+        for j in range(n):
+            if not carried[j]:
+                row_sets[j] = next_set
+                next_set += 1
+            members.setdefault(row_sets[j], []).append(j)
+
+    for _ in range(size - 2 * n):
+        yield wall_row
+
+def carve_eller(size, rng):
+    return bytearray(b''.join(eller_rows(size, rng)))
+
+def braid(cells, size, rng, fraction):
+    """Removes roughly the given fraction of dead-ends by opening a wall into a nearby passage."""
+    if fraction <= 0:
+        return
+    steps = ((-size, -1, 0), (size, 1, 0), (-1, 0, -1), (1, 0, 1))
+    dead_ends = [k for k in range(size, size * size - size)
+                 if cells[k] != WALL and sum(cells[k + d] != WALL for d, _, _ in steps) == 1]
+    rng.shuffle(dead_ends)
+    for k in dead_ends[:int(round(len(dead_ends) * fraction))]:
+        if sum(cells[k + d] != WALL for d, _, _ in steps) != 1:
+            continue  # Already joined up by an earlier removal
+        r, c = divmod(k, size)
+        options = [d for d, dr, dc in steps
+                   if 0 < r + 2 * dr < size - 1 and 0 < c + 2 * dc < size - 1
+                   and cells[k + d] == WALL and cells[k + 2 * d] != WALL]
+        if options:
+            cells[k + rng.choice(options)] = PASSAGE
+
+GENERATORS = {
+    'backtracker': carve_backtracker,
+    'kruskal': carve_kruskal,
+    'wilson': carve_wilson,
+    'eller': carve_eller,
+}
+
+# ------------- Public API
+
+def save_maze_to_file(filename, maze, seed=None):
+    if str(filename).endswith(BINARY_SUFFIX):
+        save_maze_binary(filename, maze, seed=seed)
+        return
+    grid = as_grid(maze)
+    # Packed grids are already one byte per cell; append the newline column and write in one go
+    newlines = np.full((grid.rows, 1), ord('\n'), dtype=np.uint8)
+    with open(filename, 'wb') as file:
+        np.hstack((grid.cells, newlines)).tofile(file)
+
+def stream_maze_to_file(filename, size, seed=None):
+    """Writes an Eller maze to filename row by row, so memory grows with the width and not the area.
+
+    Start and goal are placed on distinct lattice cells, which Eller's algorithm always leaves open.
+    Returns their (row, col) positions.
+    """
+    if size < MIN_MAZE_SIZE:
+        raise ValueError(f"Maze size must be at least {MIN_MAZE_SIZE}, got {size}")
+    rng = random.Random(seed)
+    n = (size - 1) // 2
+    start, goal = ((2 * (k // n) + 1, 2 * (k % n) + 1) for k in rng.sample(range(n * n), 2))
+    marks = {start: START, goal: GOAL}
+    with open(filename, 'wb') as file:
+        for r, row in enumerate(eller_rows(size, rng)):
+            if r == start[0] or r == goal[0]:
+                row = bytearray(row)
+                for (mark_r, mark_c), value in marks.items():
+                    if mark_r == r:
+                        row[mark_c] = value
+            file.write(row)
+            file.write(b'\n')
+    return start, goal
+
+def generate_maze(size, seed=None, filename=None, algorithm='backtracker', braid_fraction=0.0):
+    """Generates a size x size maze as a MazeGrid, optionally saving it to filename (binary for .maze files).
+
+    algorithm is one of GENERATORS; braid_fraction > 0 removes that share of dead-ends to add loops.
+    Start and goal always go on distinct passages of the single connected maze, so it is solvable.
+    """
+    if size < MIN_MAZE_SIZE:
+        raise ValueError(f"Maze size must be at least {MIN_MAZE_SIZE}, got {size}")
+    if algorithm not in GENERATORS:
+        raise ValueError(f"Unknown maze generator '{algorithm}', expected one of {sorted(GENERATORS)}")
+    rng = random.Random(seed)
+    cells = GENERATORS[algorithm](size, rng)
+    braid(cells, size, rng, braid_fraction)
+
+    grid = MazeGrid(np.frombuffer(cells, dtype=np.uint8).reshape(size, size))
+    passages = np.flatnonzero(grid.cells.reshape(-1) == PASSAGE)
+    start, goal = rng.sample(range(len(passages)), 2)
+    grid.cells.reshape(-1)[passages[start]] = START
+    grid.cells.reshape(-1)[passages[goal]] = GOAL
+
+    if filename:
+        save_maze_to_file(filename, grid, seed=seed)
+    return grid
@@ -0,0 +1,220 @@
+import hashlib
+import numpy as np
+
+# Cell values are stored as their ASCII codes so a grid is byte-for-byte the text maze format
+WALL, PASSAGE, START, GOAL, SOLUTION = (ord(ch) for ch in 'wPSGo')
+
+# Neighbour mask bits, in the same order find_neighbours reports them
+UP, DOWN, LEFT, RIGHT = 1, 2, 4, 8
+DIRECTIONS = ((UP, -1, 0), (DOWN, 1, 0), (LEFT, 0, -1), (RIGHT, 0, 1))
+
+# Row/column offsets of the open neighbours for every possible mask value
+MASK_OFFSETS = tuple(
+    tuple((dr, dc) for bit, dr, dc in DIRECTIONS if mask & bit)
+    for mask in range(16)
+)
+DEGREES = tuple(len(offsets) for offsets in MASK_OFFSETS)
+
+class MazeGrid:
+    """Compact maze backed by a uint8 array with precomputed neighbour masks."""
+
+    def __init__(self, cells):
+        cells = np.asarray(cells, dtype=np.uint8)
+        if cells.ndim != 2:
+            raise ValueError(f"Maze grid must be 2-dimensional, got shape {cells.shape}")
+        self.cells = cells
+        self.rows, self.cols = cells.shape
+        self._masks = None
+        self._mask_bytes = None
+        self._id_steps = None
+        self._digest = None
+        self._found = {}  # find() results for START and GOAL, kept current by set_cell
+
+    @classmethod
+    def from_rows(cls, maze):
+        """Builds a grid from a list-of-lists (or list of strings) maze."""
+        if isinstance(maze, cls):
+            return maze
+        rows = len(maze)
+        cols = len(maze[0]) if rows else 0
+        data = ''.join(''.join(row) for row in maze).encode('ascii')
+        return cls(np.frombuffer(data, dtype=np.uint8).reshape(rows, cols).copy())
+
+    def to_rows(self):
+        """Returns the maze as a list-of-lists of one-character strings."""
+        return [list(row.tobytes().decode('ascii')) for row in self.cells]
+
+    def copy(self):
+        return MazeGrid(self.cells.copy())
+
+    # ------------- Neighbour masks
+
+    @property
+    def masks(self):
+        if self._masks is None:
+            self._masks = compute_neighbour_masks(self.cells)
+        return self._masks
+
+    @property
+    def mask_bytes(self):
+        # Plain bytes indexing is much cheaper than numpy scalar access in Python loops; a bytearray
+        # so set_cell can patch it in place
+        if self._mask_bytes is None:
+            self._mask_bytes = bytearray(self.masks.tobytes())
+        return self._mask_bytes
+
+    @property
+    def id_steps(self):
+        """Flat cell id deltas of the open neighbours, per mask value."""
+        if self._id_steps is None:
+            cols = self.cols
+            self._id_steps = tuple(tuple(dr * cols + dc for dr, dc in offsets) for offsets in MASK_OFFSETS)
+        return self._id_steps
+
+    def _invalidate_masks(self):
+        self._masks = None
+        self._mask_bytes = None
+
+    def neighbours(self, node):
+        r, c = node
+        return [(r + dr, c + dc) for dr, dc in MASK_OFFSETS[self.mask_bytes[r * self.cols + c]]]
+
+    def neighbour_ids(self, cell_id):
+        return [cell_id + delta for delta in self.id_steps[self.mask_bytes[cell_id]]]
+
+    def walk_corridor(self, cell_id, delta, stops=(), cells=None):
+        """Follows a one-wide corridor from cell_id through delta to the next junction, dead-end or stop.
+
+        Returns the id the walk ended on and the number of steps taken; the ids passed through
+        (including the end) are appended to cells when a list is given. A corridor that loops
+        back to cell_id ends there.
+        """
+        masks = self.mask_bytes
+        id_steps = self.id_steps
+        previous, current, length = cell_id, cell_id + delta, 1
+        while current != cell_id and current not in stops and DEGREES[masks[current]] == 2:
+            if cells is not None:
+                cells.append(current)
+            first, second = id_steps[masks[current]]
+            previous, current = current, (current + first if current + first != previous else current + second)
+            length += 1
+        if cells is not None:
+            cells.append(current)
+        return current, length
+
+    # ------------- Cell access
+
+    def is_open(self, node):
+        r, c = node
+        return 0 <= r < self.rows and 0 <= c < self.cols and self.cells[r, c] != WALL
+
+    def set_cell(self, node, value):
+        r, c = node
+        value = ord(value) if isinstance(value, str) else int(value)
+        old = self.cells[r, c]
+        self.cells[r, c] = value
+        if old != value:
+            self._found.pop(old, None)
+            self._found.pop(value, None)
+        if (old == WALL) != (value == WALL):
+            self._update_masks_around(r, c)
+            self._digest = None
+
+    def _update_masks_around(self, r, c):
+        # Only the changed cell and its four neighbours can gain or lose an open neighbour
+        if self._masks is None:
+            return
+        for nr, nc in ((r, c), (r - 1, c), (r + 1, c), (r, c - 1), (r, c + 1)):
+            if not (0 <= nr < self.rows and 0 <= nc < self.cols):
+                continue
+            mask = 0
+            if self.cells[nr, nc] != WALL:
+                for bit, dr, dc in DIRECTIONS:
+                    if self.is_open((nr + dr, nc + dc)):
+                        mask |= bit
+            self._masks[nr, nc] = mask
+            if self._mask_bytes is not None:
+                self._mask_bytes[nr * self.cols + nc] = mask
+
+    def find(self, value):
+        """Returns every (row, col) holding the given cell character, in row-major order.
+
+        Start and goal positions are cached, so cells must be edited through set_cell to keep them current.
+        """
+        value = ord(value) if isinstance(value, str) else value
+        if value in self._found:
+            return list(self._found[value])
+        flat = np.flatnonzero(self.cells.reshape(-1) == value)
+        found = [divmod(int(i), self.cols) for i in flat]
+        if value in (START, GOAL):
+            self._found[value] = found
+            return list(found)
+        return found
+
+    def digest(self):
+        """Content hash of the wall layout; path marks and start/goal letters do not change it.
+
+        The hash is kept until set_cell adds or removes a wall, so repeated cache lookups are free.
+        """
+        if self._digest is None:
+            h = hashlib.blake2b(digest_size=16)
+            h.update(np.array(self.cells.shape, dtype=np.int64).tobytes())
+            h.update(np.packbits(self.cells == WALL).tobytes())
+            self._digest = h.hexdigest()
+        return self._digest
+
+    def to_id(self, node):
+        return node[0] * self.cols + node[1]
+
+    def to_node(self, cell_id):
+        return divmod(cell_id, self.cols)
+
+    # List-of-lists compatibility so maze[r][c] keeps working in existing code
+    def __len__(self):
+        return self.rows
+
+    def __getitem__(self, r):
+        if r < 0:
+            r += self.rows
+        if not 0 <= r < self.rows:
+            raise IndexError("maze row index out of range")
+        return _GridRow(self, r)
+
+    def __iter__(self):
+        for r in range(self.rows):
+            yield _GridRow(self, r)
+
+class _GridRow:
+    __slots__ = ('_grid', '_row')
+
+    def __init__(self, grid, row):
+        self._grid = grid
+        self._row = row
+
+    def __len__(self):
+        return self._grid.cols
+
+    def __getitem__(self, c):
+        return chr(self._grid.cells[self._row, c])
+
+    def __setitem__(self, c, value):
+        if c < 0:
+            c += self._grid.cols
+        self._grid.set_cell((self._row, c), value)
+
+    def __iter__(self):
+        return iter(self._grid.cells[self._row].tobytes().decode('ascii'))
+
+def compute_neighbour_masks(cells):
+    """Computes a bitmask of open orthogonal neighbours for every open cell."""
+    open_cells = cells != WALL
+    masks = np.zeros(cells.shape, dtype=np.uint8)
+    masks[1:, :] |= np.where(open_cells[1:, :] & open_cells[:-1, :], UP, 0).astype(np.uint8)
+    masks[:-1, :] |= np.where(open_cells[:-1, :] & open_cells[1:, :], DOWN, 0).astype(np.uint8)
+    masks[:, 1:] |= np.where(open_cells[:, 1:] & open_cells[:, :-1], LEFT, 0).astype(np.uint8)
+    masks[:, :-1] |= np.where(open_cells[:, :-1] & open_cells[:, 1:], RIGHT, 0).astype(np.uint8)
+    return masks
+
+def as_grid(maze):
+    """Returns the maze as a MazeGrid, converting list-of-lists mazes once."""
+    return maze if isinstance(maze, MazeGrid) else MazeGrid.from_rows(maze)
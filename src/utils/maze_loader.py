@@ -1,4 +1,11 @@
+import numpy as np
+from utils.maze_grid import MazeGrid, START, GOAL
+from utils.maze_binary import is_binary_maze, load_maze_binary, memmap_maze_binary
+
 def find_start_goal(maze):
+    if isinstance(maze, MazeGrid):
+        starts, goals = maze.find('S'), maze.find('G')
+        return (starts[-1] if starts else None), (goals[-1] if goals else None)
     start = None
     goal = None
     for r in range(len(maze)):
@@ -9,7 +16,23 @@ def find_start_goal(maze):
                 goal = (r, c)
     return start, goal
 
+def find_starts_goals(maze):
+    """Every start and every goal position, in row-major order, for mazes with several of each."""
+    if isinstance(maze, MazeGrid):
+        return maze.find('S'), maze.find('G')
+    starts = []
+    goals = []
+    for r in range(len(maze)):
+        for c in range(len(maze[0])):
+            if maze[r][c] == 'S':
+                starts.append((r, c))
+            elif maze[r][c] == 'G':
+                goals.append((r, c))
+    return starts, goals
+
 def find_neighbours(maze, node):
+    if isinstance(maze, MazeGrid):
+        return maze.neighbours(node)  # Precomputed masks, no bounds checks
     r, c = node
     neighbours = []
     if r > 0 and maze[r-1][c] != 'w':  # Up
@@ -21,3 +44,41 @@ def find_neighbours(maze, node):
     if c < len(maze[0]) - 1 and maze[r][c+1] != 'w':  # Right
         neighbours.append((r, c+1))
     return neighbours
+
+def load_maze(filename):
+    """Loads a text or binary maze file as a MazeGrid; the format is detected from the file header."""
+    if is_binary_maze(filename):
+        maze, _ = load_maze_binary(filename)
+        return maze
+    return load_maze_mmap(filename).copy()
+
+def load_maze_mmap(filename, mode='r'):
+    """Memory-maps a maze file; cells are paged in on access instead of read up front.
+
+    Text mazes are returned as a MazeGrid over the file. Binary mazes return (header, payload), the
+    packed (rows, row_bytes) memmap of memmap_maze_binary, as their cells cannot be viewed unpacked.
+    """
+    if is_binary_maze(filename):
+        if mode != 'r':
+            raise ValueError(f"Binary maze {filename} can only be memory-mapped read-only")
+        return memmap_maze_binary(filename)
+    with open(filename, 'rb') as file:
+        cols = len(file.readline().rstrip(b'\r\n'))
+    data = np.memmap(filename, dtype=np.uint8, mode=mode)
+    if cols == 0 or len(data) % (cols + 1):
+        raise ValueError(f"{filename} is not a rectangular maze with one newline per row")
+    # The newline column is dropped through a strided view, so nothing is copied
+    return MazeGrid(data.reshape(-1, cols + 1)[:, :cols])
+
+def scan_start_goal(maze, chunk_rows=1024):
+    """find_start_goal for mazes too large to scan in one pass; reads chunk_rows rows at a time."""
+    cells = maze.cells if isinstance(maze, MazeGrid) else maze
+    found = {START: None, GOAL: None}
+    for first in range(0, cells.shape[0], chunk_rows):
+        chunk = cells[first:first + chunk_rows].reshape(-1)
+        for value in found:
+            hits = np.flatnonzero(chunk == value)
+            if len(hits):
+                r, c = divmod(int(hits[-1]), cells.shape[1])
+                found[value] = (first + r, c)
+    return found[START], found[GOAL]
@@ -1,4 +1,12 @@
 from tkinter import *
+import numpy as np
+from utils.maze_grid import MazeGrid, WALL, PASSAGE, START, GOAL, SOLUTION, as_grid
+
+# Pillow is optional; without it mazes can still be shown in a Tk window but not exported
+try:
+    from PIL import Image, GifImagePlugin
+except ImportError:
+    Image = GifImagePlugin = None
 
 def save_solution_path(path, filename):
     with open(filename, 'w') as file:
@@ -6,71 +14,249 @@ def save_solution_path(path, filename):
             file.write(f'{r},{c}\n')
 
 def mark_solution_path(maze, path):
+    if isinstance(maze, MazeGrid):
+        if path:
+            rows, cols = np.asarray(path).T
+            on_path = maze.cells[rows, cols]
+            keep = (on_path != START) & (on_path != GOAL)
+            maze.cells[rows[keep], cols[keep]] = SOLUTION
+        return
     for (r, c) in path:
         if maze[r][c] not in ['S', 'G']:
             maze[r][c] = 'o'  # Mark the path with 'o' or any other character
 
+# RGB colour of every cell code, looked up once per cell when rasterising; unknown codes are grey
+CELL_COLORS = np.full((256, 3), 128, dtype=np.uint8)
+CELL_COLORS[WALL] = (0, 0, 0)
+CELL_COLORS[PASSAGE] = (255, 255, 255)
+CELL_COLORS[START] = (0, 128, 0)
+CELL_COLORS[GOAL] = (255, 0, 0)
+CELL_COLORS[SOLUTION] = (255, 255, 0)
+
+# Export-only codes: expanded search nodes, and VALUE_LEVELS value colours from low (dark) to high (light)
+EXPANDED = ord('e')
+CELL_COLORS[EXPANDED] = (100, 149, 237)
+VALUE_BASE = 128
+VALUE_LEVELS = 64
+CELL_COLORS[VALUE_BASE:VALUE_BASE + VALUE_LEVELS] = np.linspace((40, 20, 90), (255, 235, 140), VALUE_LEVELS).astype(np.uint8)
+
+DIRECTION_ARROWS = {'U': '↑', 'D': '↓', 'L': '←', 'R': '→'}
+MAX_CANVAS_SIZE = 800
+MAX_CELL_SIZE = 40
+OUTLINE_CELL_SIZE = 5   # Cells this large or larger get a one-pixel outline
+ARROW_CELL_SIZE = 12    # Policy arrows are only drawn when zoomed in this far
+
 def calculate_cell_size(maze):
-    max_size = 800  # Maximum size for the canvas
     maze_size = max(len(maze), len(maze[0]))
-    return max(5, min(max_size // maze_size, 20))  # Ensure cell size is between 5 and 20
+    return max(1, min(MAX_CANVAS_SIZE // maze_size, 20))  # Fit the canvas, between 1 and 20 pixels a cell
 
-def display_maze(maze, maze_window_title):
-    cell_size = calculate_cell_size(maze)
-    window = Tk()
-    window.title(maze_window_title)
-    canvas_side = len(maze) * cell_size
-    ffs = Canvas(window, width=canvas_side, height=canvas_side, bg='grey')
-    ffs.pack()
-
-    def draw(row, col, color):
-        x1 = col * cell_size
-        y1 = row * cell_size
-        x2 = x1 + cell_size
-        y2 = y1 + cell_size
-        ffs.create_rectangle(x1, y1, x2, y2, fill=color)
-
-    for row in range(len(maze)):
-        for col in range(len(maze[0])):
-            if maze[row][col] == 'S':
-                color = 'Green'
-            elif maze[row][col] == 'G':
-                color = 'Red'
-            elif maze[row][col] == 'P':
-                color = 'White'
-            elif maze[row][col] == 'o':  # Solution path
-                color = 'Yellow'
-            elif maze[row][col] == 'w':
-                color = 'black'
-            draw(row, col, color)
-
-    window.mainloop()
+def path_mask(shape, path):
+    mask = np.zeros(shape, dtype=bool)
+    if path:
+        rows, cols = np.asarray(path).T
+        mask[rows, cols] = True
+    return mask
+
+def rasterize(cells, cell_size=1, on_path=None):
+    """(rows * cell_size, cols * cell_size, 3) RGB pixels of a block of cell codes, with path cells in yellow."""
+    if on_path is not None:
+        cells = np.where(on_path & (cells != START) & (cells != GOAL), SOLUTION, cells)
+    pixels = CELL_COLORS[cells]
+    if cell_size > 1:
+        pixels = pixels.repeat(cell_size, axis=0).repeat(cell_size, axis=1)
+        if cell_size >= OUTLINE_CELL_SIZE:
+            pixels[cell_size - 1::cell_size] = 0
+            pixels[:, cell_size - 1::cell_size] = 0
+    return pixels
+
+def rasterize_maze(maze, cell_size=1, path=None):
+    grid = as_grid(maze)
+    return rasterize(grid.cells, cell_size, path_mask(grid.cells.shape, path) if path else None)
+
+def photo_image(pixels, master):
+    # A binary PPM lets Tk load the whole raster in one call
+    height, width = pixels.shape[:2]
+    return PhotoImage(master=master, data=b'P6 %d %d 255\n' % (width, height) + pixels.tobytes(), format='PPM')
+
+def show_maze_window(maze, maze_window_title, path=None, policy=None):
+    """Shows the maze as one image of the cells in view; the mouse wheel or +/- keys zoom.
+
+    Only the visible cells are rasterised, so memory follows the window size rather than the
+    maze size or zoom. Policy arrows are drawn as text for the visible cells once zoomed in.
+    """
+    grid = as_grid(maze)
+    on_path = path_mask(grid.cells.shape, path) if path else None
+    goal = tuple(path[-1]) if path else None
+    view = {'cell_size': calculate_cell_size(grid), 'image': None}
 
-def display_maze_with_policy(maze, policy, path, maze_window_title):
-    cell_size = calculate_cell_size(maze)
-    direction = {'U': '↑', 'D': '↓', 'L': '←', 'R': '→'}
     root = Tk()
     root.title(maze_window_title)
-    canvas_side = len(maze) * cell_size
-    canvas = Canvas(root, width=canvas_side, height=canvas_side)
-    canvas.pack()
-
-    for r in range(len(maze)):
-        for c in range(len(maze[0])):
-            x1, y1 = c * cell_size, r * cell_size
-            x2, y2 = x1 + cell_size, y1 + cell_size
-            if (r, c) == path[0]:
-                canvas.create_rectangle(x1, y1, x2, y2, fill="green")  # Start
-                canvas.create_text(x1 + cell_size // 2, y1 + cell_size // 2, text=direction[policy[(r, c)]], font=("Arial", 8), fill="black")
-            elif (r, c) == path[-1]:
-                canvas.create_rectangle(x1, y1, x2, y2, fill="red")  # Goal
-            elif (r, c) in path:
-                canvas.create_rectangle(x1, y1, x2, y2, fill="yellow")  # Path
-                canvas.create_text(x1 + cell_size // 2, y1 + cell_size // 2, text=direction[policy[(r, c)]], font=("Arial", 8), fill="black")
-            elif maze[r][c] == 'w':
-                canvas.create_rectangle(x1, y1, x2, y2, fill="black")  # Wall
-            else:
-                canvas.create_rectangle(x1, y1, x2, y2, fill="white")  # Empty space
-                canvas.create_text(x1 + cell_size // 2, y1 + cell_size // 2, text=direction[policy[(r, c)]], font=("Arial", 8), fill="black")
+    canvas = Canvas(root, width=min(grid.cols * view['cell_size'], MAX_CANVAS_SIZE),
+                    height=min(grid.rows * view['cell_size'], MAX_CANVAS_SIZE), bg='grey', highlightthickness=0)
+    image_item = canvas.create_image(0, 0, anchor=NW)
+
+    def redraw(event=None):
+        cell_size = view['cell_size']
+        canvas.configure(scrollregion=(0, 0, grid.cols * cell_size, grid.rows * cell_size))
+        left = int(canvas.canvasx(0)) // cell_size
+        top = int(canvas.canvasy(0)) // cell_size
+        right = min(grid.cols, left + canvas.winfo_width() // cell_size + 2)
+        bottom = min(grid.rows, top + canvas.winfo_height() // cell_size + 2)
+        block = (slice(top, bottom), slice(left, right))
+        view['image'] = photo_image(rasterize(grid.cells[block], cell_size, None if on_path is None else on_path[block]), root)
+        canvas.itemconfigure(image_item, image=view['image'])
+        canvas.coords(image_item, left * cell_size, top * cell_size)
+        canvas.delete('arrow')
+        if policy is None or cell_size < ARROW_CELL_SIZE:
+            return
+        font = ("Arial", max(8, cell_size // 2))
+        for r in range(top, bottom):
+            for c in range(left, right):
+                action = policy.get((r, c))
+                if action is not None and (r, c) != goal and grid.cells[r, c] != WALL:
+                    canvas.create_text(c * cell_size + cell_size // 2, r * cell_size + cell_size // 2,
+                                       text=DIRECTION_ARROWS[action], font=font, fill="black", tags='arrow')
+
+    def scroll(view_method):
+        def command(*args):
+            view_method(*args)
+            redraw()
+        return command
+
+    def zoom(factor):
+        cell_size = view['cell_size']
+        new_size = max(1, min(MAX_CELL_SIZE, int(cell_size * factor)))
+        if new_size == cell_size:
+            new_size = max(1, min(MAX_CELL_SIZE, cell_size + (1 if factor > 1 else -1)))
+        # Keep the same part of the maze at the top-left corner
+        x, y = canvas.xview()[0], canvas.yview()[0]
+        view['cell_size'] = new_size
+        canvas.configure(scrollregion=(0, 0, grid.cols * new_size, grid.rows * new_size))
+        canvas.xview_moveto(x)
+        canvas.yview_moveto(y)
+        redraw()
+
+    xbar = Scrollbar(root, orient=HORIZONTAL, command=scroll(canvas.xview))
+    ybar = Scrollbar(root, orient=VERTICAL, command=scroll(canvas.yview))
+    canvas.configure(xscrollcommand=xbar.set, yscrollcommand=ybar.set)
+    ybar.pack(side=RIGHT, fill=Y)
+    xbar.pack(side=BOTTOM, fill=X)
+    canvas.pack(side=LEFT, fill=BOTH, expand=True)
+
+    canvas.bind('<Configure>', redraw)
+    root.bind('<MouseWheel>', lambda event: zoom(1.25 if event.delta > 0 else 0.8))
+    root.bind('<Button-4>', lambda event: zoom(1.25))
+    root.bind('<Button-5>', lambda event: zoom(0.8))
+    for key, factor in (('<plus>', 1.25), ('<equal>', 1.25), ('<KP_Add>', 1.25), ('<minus>', 0.8), ('<KP_Subtract>', 0.8)):
+        root.bind(key, lambda event, factor=factor: zoom(factor))
 
     root.mainloop()
+
+def display_maze(maze, maze_window_title):
+    show_maze_window(maze, maze_window_title)
+
+def display_maze_with_policy(maze, policy, path, maze_window_title):
+    show_maze_window(maze, maze_window_title, path, policy)
+
+# ------------- Headless export
+
+def require_pillow():
+    if Image is None:
+        raise ImportError("Exporting maze images requires Pillow")
+
+def save_maze_image(filename, maze, path=None, cell_size=None):
+    """Writes the maze, with the path in yellow if given, to an image file such as a PNG."""
+    require_pillow()
+    cell_size = cell_size or calculate_cell_size(maze)
+    Image.fromarray(rasterize_maze(maze, cell_size, path)).save(filename)
+
+class GifAnimation:
+    """Streams an animated GIF of a maze, one frame per batch of changed cells.
+
+    Only the current frame of cell codes is kept: each update writes the changes into it and
+    encodes just the bounding box they touch, so memory does not grow with the frame count.
+    Cell codes index a palette built from CELL_COLORS.
+    """
+
+    def __init__(self, filename, maze, cell_size=None, duration=50):
+        require_pillow()
+        grid = as_grid(maze)
+        self.codes = grid.cells.copy()
+        self.cols = grid.cols
+        self.cell_size = cell_size or calculate_cell_size(grid)
+        self.duration = duration
+        self.frames = 0
+        self.file = open(filename, 'wb')
+        first = self.frame(self.codes)
+        header, _ = GifImagePlugin.getheader(first, info={'loop': 0, 'duration': duration})
+        for chunk in header + GifImagePlugin.getdata(first, duration=duration):
+            self.file.write(chunk)
+        self.frames = 1
+
+    def frame(self, codes):
+        pixels = codes.repeat(self.cell_size, axis=0).repeat(self.cell_size, axis=1) if self.cell_size > 1 else codes
+        image = Image.fromarray(np.ascontiguousarray(pixels), mode='P')
+        image.putpalette(CELL_COLORS.tobytes())
+        return image
+
+    def update(self, cell_ids, codes):
+        """Sets the cells with the given ids to the given codes and writes the changed region as a frame."""
+        cell_ids = np.asarray(cell_ids)
+        if len(cell_ids) == 0:
+            return
+        self.codes.reshape(-1)[cell_ids] = codes
+        rows, cols = np.divmod(cell_ids, self.cols)
+        top, bottom, left, right = rows.min(), rows.max() + 1, cols.min(), cols.max() + 1
+        image = self.frame(self.codes[top:bottom, left:right])
+        offset = (int(left) * self.cell_size, int(top) * self.cell_size)
+        for chunk in GifImagePlugin.getdata(image, offset=offset, duration=self.duration):
+            self.file.write(chunk)
+        self.frames += 1
+
+    def close(self, path=None):
+        """Adds a final frame with the path marked, if given, and finishes the file."""
+        if path:
+            rows, cols = np.asarray(path).T
+            ids = rows * self.cols + cols
+            current = self.codes.reshape(-1)[ids]
+            ids = ids[(current != START) & (current != GOAL)]
+            self.update(ids, SOLUTION)
+        self.file.write(b';')
+        self.file.close()
+
+def save_search_animation(filename, maze, expansions, path=None, frames=100, cell_size=None, duration=50):
+    """Animates the expansion order of a search (cell ids from the solver's expansions) as a GIF."""
+    grid = as_grid(maze)
+    expansions = np.asarray(expansions, dtype=np.int64)
+    # Start and goal keep their colours
+    kept = grid.cells.reshape(-1)[expansions]
+    expansions = expansions[(kept != START) & (kept != GOAL)]
+    animation = GifAnimation(filename, grid, cell_size, duration)
+    for chunk in np.array_split(expansions, min(frames, max(len(expansions), 1))):
+        animation.update(chunk, EXPANDED)
+    animation.close(path)
+    return animation.frames
+
+class ValueAnimation(GifAnimation):
+    """Animates an MDP value function as a GIF; pass it as a solver's observer, then close it.
+
+    Values between low and high are quantised to VALUE_LEVELS colours, and each sweep's frame
+    only carries the states whose colour changed.
+    """
+
+    def __init__(self, filename, maze, states, low, high, cell_size=None, duration=50):
+        super().__init__(filename, maze, cell_size, duration)
+        cell_ids = np.array([r * self.cols + c for r, c in states], dtype=np.int64)
+        current = self.codes.reshape(-1)[cell_ids]
+        # Start and goal keep their colours
+        self.shown = (current != START) & (current != GOAL)
+        self.cell_ids = cell_ids[self.shown]
+        self.low = low
+        self.scale = (VALUE_LEVELS - 1) / (high - low) if high > low else 0.0
+        self.levels = np.full(len(self.cell_ids), -1, dtype=np.int64)
+
+    def __call__(self, V):
+        levels = np.clip(np.rint((np.asarray(V)[self.shown] - self.low) * self.scale), 0, VALUE_LEVELS - 1).astype(np.int64)
+        changed = levels != self.levels
+        self.levels = levels
+        self.update(self.cell_ids[changed], VALUE_BASE + levels[changed])
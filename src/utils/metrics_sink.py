@@ -0,0 +1,128 @@
+import csv
+import logging
+import os
+
+# pyarrow is optional; without it the sink appends batches to a CSV file instead
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = ds = pq = None
+
+# Dataset column names, CSV header names and types, in CSV column order
+METRICS_COLUMNS = [
+    ('maze_id', 'Maze ID', 'string'),
+    ('timestamp', 'Timestamp', 'string'),
+    ('maze_size', 'Maze Size', 'int'),
+    ('algorithm_type', 'Algorithm Type', 'string'),
+    ('algorithm', 'Algorithm', 'string'),
+    ('run_index', 'Run Index', 'int'),
+    ('execution_time', 'Execution Time', 'float'),
+    ('memory_usage', 'Memory Usage', 'int'),
+    ('path_length', 'Path Length', 'int'),
+    ('convergence_rate', 'Convergence Rate', 'float'),
+    ('bellman_backups', 'Bellman Backups', 'int'),
+    ('optimality', 'Optimality', 'int'),
+    ('nodes_expanded', 'Nodes Expanded', 'int'),
+    ('invalid_maze_attempts', 'Invalid Maze Attempts', 'int'),
+    ('failed_paths', 'Failed Paths', 'int'),
+]
+# Solver instrumentation counters, one row per algorithm and maze; sweep_deltas is a JSON list
+COUNTER_COLUMNS = METRICS_COLUMNS[:5] + [
+    ('pushes', 'Pushes', 'int'),
+    ('pops', 'Pops', 'int'),
+    ('stale_pops', 'Stale Pops', 'int'),
+    ('neighbour_calls', 'Neighbour Calls', 'int'),
+    ('peak_frontier', 'Peak Frontier', 'int'),
+    ('sweeps', 'Sweeps', 'int'),
+    ('bellman_backups', 'Bellman Backups', 'int'),
+    ('sweep_deltas', 'Sweep Deltas', 'string'),
+]
+PARTITION_COLUMNS = ['algorithm', 'maze_size']
+
+def table_schema(columns):
+    types = {'string': pa.string(), 'int': pa.int64(), 'float': pa.float64()}
+    return pa.schema([(name, types[kind]) for name, _, kind in columns])
+
+def parquet_available():
+    return pa is not None
+
+class MetricsSink:
+    """Buffers per-run metrics rows and writes them in batches.
+
+    With pyarrow installed, batches go to a Parquet dataset under path, partitioned by algorithm
+    and maze size, so readers can load just the partitions they need. Otherwise, or with
+    format='csv', they are appended to the CSV file at csv_file with a single open per batch.
+    """
+
+    def __init__(self, path, csv_file, batch_size=10000, format='parquet', columns=METRICS_COLUMNS):
+        if format not in ('parquet', 'csv'):
+            raise ValueError(f"Unknown metrics format: {format}")
+        if format == 'parquet' and not parquet_available():
+            logging.warning("pyarrow is not installed, writing metrics as CSV")
+            format = 'csv'
+        self.path = path
+        self.csv_file = csv_file
+        self.batch_size = batch_size
+        self.format = format
+        self.columns = columns
+        self.rows = []
+
+    def add(self, rows):
+        """Queues rows (dicts keyed by column names), flushing once a full batch is buffered."""
+        self.rows.extend(rows)
+        if len(self.rows) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self.rows:
+            return
+        rows, self.rows = self.rows, []
+        if self.format == 'parquet':
+            table = pa.Table.from_pylist(rows, schema=table_schema(self.columns))
+            pq.write_to_dataset(table, self.path, partition_cols=PARTITION_COLUMNS)
+        else:
+            append_csv(rows, self.csv_file, self.columns)
+        logging.info(f"Flushed {len(rows)} metrics rows to {self.path if self.format == 'parquet' else self.csv_file}")
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def append_csv(rows, csv_file, columns=METRICS_COLUMNS):
+    file_exists = os.path.isfile(csv_file)
+    if file_exists:
+        # Keep the header of an existing file, leaving out columns added after it was created
+        with open(csv_file, newline='') as file:
+            header = next(csv.reader(file), None)
+        if header:
+            columns = [column for column in columns if column[1] in header]
+    with open(csv_file, mode='a', newline='') as file:
+        writer = csv.writer(file)
+        if not file_exists:
+            writer.writerow([header for _, header, _ in columns])
+        writer.writerows([row.get(name) for name, _, _ in columns] for row in rows)
+
+def load_metrics(path, filter=None, columns=METRICS_COLUMNS):
+    """Reads a metrics dataset as a pyarrow Table; filter is an optional pyarrow.dataset expression."""
+    if not parquet_available():
+        raise ImportError("Reading the metrics dataset requires pyarrow")
+    dataset = ds.dataset(path, format='parquet', partitioning='hive', schema=table_schema(columns))
+    return dataset.to_table(filter=filter)
+
+def export_csv(path, csv_file, columns=METRICS_COLUMNS):
+    """Writes a whole metrics dataset to a CSV file with the original performance_metrics.csv header."""
+    table = load_metrics(path, columns=columns)
+    with open(csv_file, mode='w', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow([header for _, header, _ in columns])
+        for batch in table.to_batches():
+            values = [batch.column(name).to_pylist() for name, _, _ in columns]
+            writer.writerows(zip(*values))
+    logging.info(f"Exported {table.num_rows} metrics rows to {csv_file}")
@@ -1,3 +1,4 @@
+import gc
 import time
 import tracemalloc
 import numpy as np
@@ -16,14 +17,23 @@ def load_settings():
 
 settings = load_settings()
 thresholds = settings['evaluation_metrics']['thresholds']
+evaluation_settings = settings['evaluation_metrics']
 
 def track_execution_time(func):
-    """Decorator to measure execution time of a function."""
+    """Decorator to measure execution time of a function, with garbage collection paused."""
     def wrapper(*args, **kwargs):
-        start_time = time.time()
-        result = func(*args, **kwargs)
-        end_time = time.time()
-        execution_time = end_time - start_time
+        # Collect first and keep the collector off so a GC pause never lands inside the timing
+        gc.collect()
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            start_time = time.perf_counter_ns()
+            result = func(*args, **kwargs)
+            end_time = time.perf_counter_ns()
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+        execution_time = (end_time - start_time) / 1e9
         logging.info(f'Execution time for {func.__name__}: {execution_time:.6f} seconds')
         return result, execution_time
     return wrapper
@@ -64,26 +74,69 @@ def calculate_optimality(path, optimal_path):
         return 0
     return 1 if len(path) == len(optimal_path) else 0
 
+def summarise_execution_times(execution_times, max_variation=None):
+    """Median, p95, mean and standard deviation of the run times, flagging results too noisy to trust.
+
+    A result is high-variance when the coefficient of variation (stddev / mean) exceeds max_variation.
+    """
+    if max_variation is None:
+        max_variation = evaluation_settings.get('max_variation', 0.25)
+    times = np.asarray([t for t in execution_times if t is not None], dtype=np.float64)
+    if len(times) == 0:
+        return None
+    mean = float(times.mean())
+    stddev = float(times.std(ddof=1)) if len(times) > 1 else 0.0
+    variation = stddev / mean if mean > 0 else 0.0
+    return {
+        'runs': len(times),
+        'median': float(np.median(times)),
+        'p95': float(np.percentile(times, 95)),
+        'mean': mean,
+        'stddev': stddev,
+        'variation': variation,
+        'high_variance': variation > max_variation,
+    }
+
 def run(func, runs=config['evaluation_metrics']['runs'], algorithm_type=None, *args, **kwargs):
-    """Executes the algorithm multiple times and records performance metrics."""
+    """Executes the algorithm multiple times and records performance metrics.
+
+    Warmup runs are executed first and discarded. Memory is measured in one separate tracemalloc
+    pass (disable with measure_memory=False) so its overhead never reaches the timed runs. With
+    instrument=True one more untimed pass fills a solver counters dict, stored under 'counters'.
+    An optional setup callable is called once with func's arguments before anything else and
+    returns the seconds spent building what func reuses (such as a cached model), stored under
+    'build_times' so it stays out of the timed runs.
+    """
     results_list = []  # Store each run separately
 
     # Extract invalid maze attempts and failed paths from kwargs (but don't pass them to func)
     invalid_maze_attempts = kwargs.pop('invalid_maze_attempts', 0)
     failed_paths = kwargs.pop('failed_paths', 0)
-    
+    warmup = kwargs.pop('warmup', evaluation_settings.get('warmup_runs', 1))
+    measure_memory = kwargs.pop('measure_memory', evaluation_settings.get('measure_memory', True))
+    instrument = kwargs.pop('instrument', evaluation_settings.get('instrument', False))
+    setup = kwargs.pop('setup', None)
+
+    build_time = setup(*args, **kwargs) if setup is not None else None
+    for _ in range(warmup):
+        func(*args, **kwargs)
+    memory_usage = track_memory_usage(func)(*args, **kwargs)[1] if measure_memory else None
+    counters = None
+    if instrument:
+        counters = {}
+        func(*args, counters=counters, **kwargs)
+
     for _ in range(runs):
-        # Track execution time and memory usage separately
         result, execution_time = track_execution_time(func)(*args, **kwargs)
-        _, memory_usage = track_memory_usage(func)(*args, **kwargs)  # Separate call to get memory
         
         iterations = 0 # MDP algorithms
+        backups = None # MDP algorithms that count their Bellman backups
         nodes_expanded = 0 # Search algorithms
         # Handle nodes expanded tracking
         if algorithm_type == 'search':
             path, nodes_expanded = result
         elif algorithm_type == 'mdp':
-            path, policy, iterations = result
+            path, policy, iterations, backups = result
             nodes_expanded = None
 
         path_length = calculate_path_length(path)
@@ -92,13 +145,16 @@ def run(func, runs=config['evaluation_metrics']['runs'], algorithm_type=None, *a
         # Store this run's metrics as a separate dictionary
         run_metrics = {
             'execution_times': execution_time,
+            'build_times': build_time,
             'memory_usages': memory_usage,
             'path_lengths': path_length,
             'convergence_rates': iterations if algorithm_type == "mdp" else None,
+            'bellman_backups': backups,
             'optimalities': optimality,
             'nodes_expanded': nodes_expanded if algorithm_type == "search" else None,
             'invalid_maze_attempts': invalid_maze_attempts,
             'failed_paths': failed_paths,
+            'counters': counters,
         }
         results_list.append(run_metrics)  # Append each run separately
 
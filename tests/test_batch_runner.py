@@ -0,0 +1,55 @@
+import os
+import sys
+import unittest
+
+# Add the root directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from utils.batch_runner import run_batch, share_maze, attach_maze
+from utils.maze_generator import generate_maze
+from algorithms.search_algorithms import bfs, astar
+
+def run_search(algorithm, maze, start, goal):
+    return {"bfs": bfs, "astar": astar}[algorithm](maze, start, goal)
+
+class TestBatchRunner(unittest.TestCase):
+
+    def test_shared_maze_is_read_only_copy(self):
+        maze = generate_maze(11, seed=1)
+        block, descriptor = share_maze(maze)
+        try:
+            attached_block, shared = attach_maze(descriptor)
+            self.assertEqual(shared.cells.tobytes(), maze.cells.tobytes())
+            with self.assertRaises(ValueError):
+                shared.cells[0, 0] = 0
+            del shared
+            attached_block.close()
+        finally:
+            block.close()
+            block.unlink()
+
+    def test_run_batch_writes_every_combination_from_one_process(self):
+        rows = []
+        generated = []
+
+        def generate(size, seed):
+            generated.append((size, seed))
+            return generate_maze(size, seed=seed)
+
+        def write_metrics(metrics_list, size, algorithm_type, algorithm, maze_id, timestamp):
+            rows.append((size, algorithm, maze_id, metrics_list[0]['path_lengths']))
+
+        completed = run_batch([11, 15], [("search", "bfs"), ("search", "astar")], [0, 1], generate,
+                              {"search": run_search}, write_metrics, runs=1, workers=2)
+        self.assertEqual(completed, 8)
+        self.assertEqual(sorted(generated), [(11, 0), (11, 1), (15, 0), (15, 1)])  # Each maze generated once
+        self.assertEqual(len(rows), 8)
+        # Both algorithms ran on the same shared maze and found equally short paths
+        by_maze = {}
+        for size, algorithm, maze_id, length in rows:
+            by_maze.setdefault(maze_id, set()).add(length)
+        self.assertEqual(len(by_maze), 4)
+        self.assertTrue(all(len(lengths) == 1 for lengths in by_maze.values()))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import unittest
+import sys
+import os
+
+# Add the root directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from utils.performance_evaluator import run, summarise_execution_times
+
+class TestBenchmarkHarness(unittest.TestCase):
+
+    def test_warmup_and_single_memory_pass(self):
+        calls = []
+        def solver(maze, start, goal):
+            calls.append(1)
+            return [start, goal], 2
+        metrics = run(solver, 4, 'search', maze=None, start=(0, 0), goal=(0, 1), warmup=2)
+        # 2 warmup runs, 1 memory pass and 4 timed runs
+        self.assertEqual(len(calls), 7)
+        self.assertEqual(len(metrics), 4)
+        self.assertTrue(all(m['memory_usages'] == metrics[0]['memory_usages'] for m in metrics))
+        self.assertTrue(all(m['execution_times'] > 0 for m in metrics))
+
+        calls.clear()
+        metrics = run(solver, 3, 'search', maze=None, start=(0, 0), goal=(0, 1), warmup=0, measure_memory=False)
+        self.assertEqual(len(calls), 3)
+        self.assertIsNone(metrics[0]['memory_usages'])
+
+    def test_setup_build_time(self):
+        calls = []
+        def setup(maze, start, goal):
+            calls.append('setup')
+            return 0.5
+        def solver(maze, start, goal):
+            calls.append('solve')
+            return [start, goal], 2
+        metrics = run(solver, 2, 'search', maze=None, start=(0, 0), goal=(0, 1), warmup=0, measure_memory=False,
+                      setup=setup)
+        self.assertEqual(calls, ['setup', 'solve', 'solve'])
+        self.assertTrue(all(m['build_times'] == 0.5 for m in metrics))
+
+    def test_summarise_execution_times(self):
+        summary = summarise_execution_times([1.0, 1.0, 1.0, 1.0, 2.0], max_variation=0.25)
+        self.assertEqual(summary['runs'], 5)
+        self.assertEqual(summary['median'], 1.0)
+        self.assertAlmostEqual(summary['mean'], 1.2)
+        self.assertAlmostEqual(summary['p95'], 1.8)
+        self.assertAlmostEqual(summary['stddev'], 0.4472135955)
+        self.assertTrue(summary['high_variance'])
+        self.assertFalse(summarise_execution_times([1.0, 1.01, 0.99])['high_variance'])
+        self.assertIsNone(summarise_execution_times([]))
+
+if __name__ == '__main__':
+    unittest.main()
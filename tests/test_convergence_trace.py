@@ -0,0 +1,57 @@
+import os
+import sys
+import tempfile
+import unittest
+import numpy as np
+
+# Add the root directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from algorithms.convergence_trace import ConvergenceTrace, load_trace
+from algorithms.mdp_algorithms import define_mdp_components, value_iteration, policy_iteration
+from utils.maze_generator import generate_maze
+
+class TestConvergenceTrace(unittest.TestCase):
+
+    def test_ring_buffer_keeps_latest_records(self):
+        trace = ConvergenceTrace(capacity=4)
+        for i in range(10):
+            trace.record(0.5 ** i, i)
+        records = trace.records()
+        self.assertEqual(records['iteration'].tolist(), [7, 8, 9, 10])
+        self.assertEqual(records['changed_actions'].tolist(), [6, 7, 8, 9])
+        self.assertTrue(np.all(np.diff(records['elapsed']) >= 0))
+        self.assertAlmostEqual(trace.rate(), 0.5)
+        # 0.5 ** 9 -> below 1e-6 needs 11 more halvings
+        self.assertEqual(trace.predicted_iterations(1e-6), 21)
+
+    def test_slow_runs_are_flagged(self):
+        trace = ConvergenceTrace(expected_iterations=5, slow_factor=10, theta=1e-6)
+        with self.assertLogs(level='WARNING'):
+            for i in range(12):
+                trace.record(0.99 ** i)
+        self.assertTrue(trace.slow)
+
+    def test_value_and_policy_iteration_record_every_iteration(self):
+        components = define_mdp_components(generate_maze(15, seed=2))
+        trace = ConvergenceTrace()
+        _, iterations = value_iteration(*components, trace=trace)
+        self.assertEqual(trace.count, iterations)
+        self.assertLess(trace.records()['max_delta'][-1], 1e-6)
+        self.assertEqual(trace.records()['changed_actions'][0], len(components[0]))
+        for evaluation in ('iterative', 'linear'):
+            trace = ConvergenceTrace()
+            _, iterations = policy_iteration(*components, evaluation=evaluation, trace=trace)
+            self.assertEqual(trace.count, iterations)
+            self.assertEqual(trace.records()['changed_actions'][-1], 0)
+
+    def test_save_and_load(self):
+        trace = ConvergenceTrace()
+        trace.record(1.0, 3)
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, 'trace.npy')
+            trace.save(filename)
+            self.assertEqual(load_trace(filename).tolist(), trace.records().tolist())
+
+if __name__ == '__main__':
+    unittest.main()
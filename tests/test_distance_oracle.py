@@ -0,0 +1,64 @@
+import unittest
+import sys
+import os
+import tempfile
+
+# Add the root directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from algorithms.distance_oracle import DistanceOracle
+from algorithms.search_algorithms import bfs
+
+class TestDistanceOracle(unittest.TestCase):
+
+    def setUp(self):
+        # A perfect maze: the open cells form a tree
+        self.maze = [
+            ['S', 'P', 'P', 'w', 'G'],
+            ['w', 'w', 'P', 'w', 'P'],
+            ['P', 'P', 'P', 'P', 'P'],
+            ['P', 'w', 'P', 'w', 'w'],
+            ['P', 'w', 'P', 'P', 'P']
+        ]
+        self.open_cells = [(r, c) for r in range(5) for c in range(5) if self.maze[r][c] != 'w']
+
+    def test_paths_from_any_start(self):
+        oracle = DistanceOracle.build(self.maze)
+        self.assertEqual(oracle.goal, (0, 4))
+        self.assertEqual(oracle.distances.dtype.name, 'int32')
+        for start in self.open_cells:
+            bfs_path, _ = bfs(self.maze, start, oracle.goal)
+            self.assertEqual(oracle.distance(start), len(bfs_path) - 1)
+            path = oracle.path(start)
+            self.assertEqual(len(path), len(bfs_path))
+            self.assertEqual(path[0], start)
+            self.assertEqual(path[-1], oracle.goal)
+        self.assertIsNone(oracle.path((1, 0)))
+
+    def test_pair_distances(self):
+        oracle = DistanceOracle.build(self.maze, lca=True)
+        self.assertTrue(oracle.perfect)
+        for a in self.open_cells:
+            for b in self.open_cells:
+                bfs_path, _ = bfs(self.maze, a, b)
+                self.assertEqual(oracle.pair_distance(a, b), len(bfs_path) - 1)
+
+    def test_pair_distances_need_perfect_maze(self):
+        maze = [['S', 'P'], ['P', 'G']]
+        oracle = DistanceOracle.build(maze, lca=True)
+        self.assertFalse(oracle.perfect)
+        with self.assertRaises(ValueError):
+            oracle.pair_distance((0, 0), (1, 1))
+
+    def test_save_and_load(self):
+        oracle = DistanceOracle.build(self.maze, lca=True)
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, 'oracle.npz')
+            oracle.save(filename)
+            loaded = DistanceOracle.load(filename)
+        self.assertEqual(loaded.goal, oracle.goal)
+        self.assertEqual(loaded.path((4, 4)), oracle.path((4, 4)))
+        self.assertEqual(loaded.pair_distance((0, 0), (4, 4)), oracle.pair_distance((0, 0), (4, 4)))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import unittest
+import random
+import sys
+import os
+
+# Add the root directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from algorithms.incremental_search import IncrementalPlanner
+from algorithms.search_algorithms import bfs, astar
+from utils.maze_generator import generate_maze
+from utils.maze_loader import find_start_goal
+
+class TestIncrementalPlanner(unittest.TestCase):
+
+    def assert_shortest(self, path, maze, start, goal):
+        reference, _ = bfs(maze, start, goal)
+        if reference is None:
+            self.assertIsNone(path)
+            return
+        self.assertEqual(len(path), len(reference))
+        self.assertEqual((path[0], path[-1]), (start, goal))
+        for a, b in zip(path, path[1:]):
+            self.assertEqual(abs(a[0] - b[0]) + abs(a[1] - b[1]), 1)
+            self.assertNotEqual(maze[b[0]][b[1]], 'w')
+
+    def test_matches_full_search_after_edits(self):
+        for seed in range(5):
+            for maze in (generate_maze(31, seed=seed, braid_fraction=0.3),
+                         generate_maze(31, seed=seed, braid_fraction=0.3).to_rows()):
+                start, goal = find_start_goal(maze)
+                planner = IncrementalPlanner(maze, start, goal)
+                path, _ = planner.plan()
+                self.assert_shortest(path, maze, start, goal)
+                rng = random.Random(seed)
+                for _ in range(20):
+                    changes = []
+                    for _ in range(rng.randint(1, 3)):
+                        cell = (rng.randrange(1, 30), rng.randrange(1, 30))
+                        if cell not in (start, goal):
+                            changes.append((cell, 'P' if maze[cell[0]][cell[1]] == 'w' else 'w'))
+                    planner.update_cells(changes)
+                    path, _ = planner.plan()
+                    self.assert_shortest(path, maze, start, goal)
+
+    def test_replan_is_cheaper_than_full_solve(self):
+        maze = generate_maze(101, seed=1, braid_fraction=0.5)
+        start, goal = find_start_goal(maze)
+        planner = IncrementalPlanner(maze, start, goal)
+        path, first = planner.plan()
+        planner.update_cells([(path[len(path) // 2], 'w')])
+        path, replan = planner.plan()
+        self.assert_shortest(path, maze, start, goal)
+        _, full = astar(maze, start, goal)
+        self.assertLess(replan, full)
+        # Blocking a passage the search never reached leaves nothing to repair
+        far = next((r, c) for r in range(1, 100) for c in range(1, 100)
+                   if maze[r][c] == 'P' and (r, c) not in planner.g and (r, c) not in planner.rhs)
+        planner.update_cells([(far, 'w')])
+        self.assertEqual(planner.plan(), (path, 0))
+
+    def test_start_and_goal_cannot_change(self):
+        maze = generate_maze(11, seed=0)
+        start, goal = find_start_goal(maze)
+        planner = IncrementalPlanner(maze, start, goal)
+        with self.assertRaises(ValueError):
+            planner.update_cells([(goal, 'w')])
+
+if __name__ == '__main__':
+    unittest.main()
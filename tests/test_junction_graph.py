@@ -0,0 +1,77 @@
+import unittest
+import sys
+import os
+import tempfile
+
+# Add the root directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from algorithms.junction_graph import (build_junction_graph, get_junction_graph, junction_graph_file,
+                                       junction_search, load_junction_graph, save_junction_graph)
+from algorithms.search_algorithms import bfs
+from utils.maze_grid import MazeGrid
+
+class TestJunctionGraph(unittest.TestCase):
+
+    def setUp(self):
+        self.maze = [
+            ['S', 'P', 'P', 'w', 'G'],
+            ['w', 'w', 'P', 'w', 'P'],
+            ['P', 'P', 'P', 'P', 'P'],
+            ['P', 'w', 'w', 'w', 'P'],
+            ['P', 'P', 'P', 'P', 'P']
+        ]
+        self.grid = MazeGrid.from_rows(self.maze)
+
+    def test_build(self):
+        graph = build_junction_graph(self.grid)
+        # Dead-ends at S and G, junctions at (2, 2) and (2, 4); the loop round the bottom is one edge
+        self.assertEqual(sorted(graph.nodes.tolist()), [0, 4, 12, 14])
+        self.assertEqual(graph.num_edges, 8)
+        self.assertEqual(sorted(graph.weights.tolist()), [2, 2, 2, 2, 4, 4, 10, 10])
+        s = graph.node_index[0]
+        edge = graph.indptr[s]
+        self.assertEqual(graph.nodes[graph.targets[edge]], 12)
+        self.assertEqual(graph.weights[edge], 4)
+
+    def test_search_matches_bfs(self):
+        graph = build_junction_graph(self.grid)
+        open_cells = [(r, c) for r in range(5) for c in range(5) if self.maze[r][c] != 'w']
+        for start in open_cells:
+            for goal in open_cells:
+                path, _ = junction_search(self.grid, start, goal, graph)
+                bfs_path, _ = bfs(self.grid, start, goal)
+                self.assertEqual(len(path), len(bfs_path))
+                self.assertEqual(path[0], start)
+                self.assertEqual(path[-1], goal)
+                for a, b in zip(path, path[1:]):
+                    self.assertEqual(abs(a[0] - b[0]) + abs(a[1] - b[1]), 1)
+
+    def test_no_path(self):
+        path, _ = junction_search([['S', 'w', 'G']], (0, 0), (0, 2))
+        self.assertIsNone(path)
+
+    def test_persisted_beside_maze_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            maze_file = os.path.join(directory, 'maze.txt')
+            graph = get_junction_graph(self.grid.copy(), maze_file)
+            self.assertTrue(os.path.isfile(junction_graph_file(maze_file)))
+            loaded = load_junction_graph(junction_graph_file(maze_file))
+            self.assertEqual(loaded.digest, graph.digest)
+            self.assertEqual(loaded.targets.tolist(), graph.targets.tolist())
+            # Marking the solution path does not invalidate the cached graph
+            marked = self.grid.copy()
+            marked[0][1] = 'o'
+            self.assertIs(get_junction_graph(marked), graph)
+
+    def test_save_and_load(self):
+        graph = build_junction_graph(self.grid)
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, 'graph.npz')
+            save_junction_graph(graph, filename)
+            loaded = load_junction_graph(filename)
+        path, _ = junction_search(self.grid, (0, 0), (0, 4), loaded)
+        self.assertEqual(path[-1], (0, 4))
+
+if __name__ == '__main__':
+    unittest.main()
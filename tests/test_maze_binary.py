@@ -0,0 +1,56 @@
+import os
+import sys
+import tempfile
+import unittest
+
+# Add the root directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from utils.maze_binary import save_maze_binary, load_maze_binary, memmap_maze_binary, read_maze_header
+from utils.maze_generator import generate_maze
+from utils.maze_loader import load_maze, find_start_goal
+from utils.maze_visualiser import mark_solution_path
+from algorithms.search_algorithms import bfs
+
+class TestMazeBinary(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.directory.name, 'maze.maze')
+        self.maze = generate_maze(21, seed=6)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_round_trip(self):
+        for compress in (False, True):
+            save_maze_binary(self.filename, self.maze, seed=6, compress=compress)
+            loaded, header = load_maze_binary(self.filename)
+            self.assertEqual(loaded.cells.tobytes(), self.maze.cells.tobytes())
+            self.assertEqual((header.start, header.goal), find_start_goal(self.maze))
+            self.assertEqual(header.seed, 6)
+
+    def test_two_bit_payload_keeps_solution_marks(self):
+        path, _ = bfs(self.maze, *find_start_goal(self.maze))
+        mark_solution_path(self.maze, path)
+        save_maze_binary(self.filename, self.maze, bits=2)
+        loaded, _ = load_maze_binary(self.filename)
+        self.assertEqual(loaded.cells.tobytes(), self.maze.cells.tobytes())
+
+    def test_memmap_payload_is_one_bit_per_cell(self):
+        save_maze_binary(self.filename, self.maze)
+        header, payload = memmap_maze_binary(self.filename)
+        self.assertEqual(payload.shape, (21, 3))
+        self.assertEqual((header.rows, header.cols), (21, 21))
+        del payload
+        save_maze_binary(self.filename, self.maze, compress=True)
+        with self.assertRaises(ValueError):
+            memmap_maze_binary(self.filename)
+
+    def test_generated_maze_saved_as_binary_by_suffix(self):
+        maze = generate_maze(15, seed=2, filename=self.filename)
+        self.assertEqual(read_maze_header(self.filename).seed, 2)
+        self.assertEqual(load_maze(self.filename).cells.tobytes(), maze.cells.tobytes())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,14 +1,21 @@
 import os
 import sys
+import tempfile
 import unittest
+import numpy as np
 from unittest.mock import patch, MagicMock
 
 # Add the root directory to sys.path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
 
 from utils.maze_loader import find_start_goal
-from utils.maze_visualiser import display_maze, display_maze_with_policy
-from utils.maze_generator import generate_maze
+from utils.maze_visualiser import (display_maze, display_maze_with_policy, rasterize_maze, photo_image, CELL_COLORS,
+                                   save_maze_image, save_search_animation, ValueAnimation, Image)
+from algorithms.mdp_algorithms import get_mdp_model, value_iteration
+from utils.maze_generator import generate_maze, GENERATORS
+from utils.maze_grid import MazeGrid, SOLUTION
+from algorithms.search_algorithms import bfs
+from algorithms.distance_oracle import DistanceOracle
 
 class TestMazeGeneration(unittest.TestCase):
 
@@ -61,5 +68,112 @@ class TestMazeGeneration(unittest.TestCase):
         # Verify that the window was created and displayed
         self.assertTrue(mock_window.mainloop.called)
 
+    def test_rasterize_maze(self):
+        maze = [
+            ['S', 'P', 'G'],
+            ['P', 'w', 'P'],
+            ['P', 'P', 'P']
+        ]
+        pixels = rasterize_maze(maze, path=[(0, 0), (0, 1), (0, 2)])
+        self.assertEqual(pixels.shape, (3, 3, 3))
+        self.assertEqual(pixels[0].tolist(), [[0, 128, 0], CELL_COLORS[SOLUTION].tolist(), [255, 0, 0]])
+        self.assertEqual(pixels[1, 1].tolist(), [0, 0, 0])
+        # Each cell becomes a cell_size square, outlined from OUTLINE_CELL_SIZE up
+        pixels = rasterize_maze(maze, cell_size=6)
+        self.assertEqual(pixels.shape, (18, 18, 3))
+        self.assertEqual(pixels[6, 6].tolist(), [0, 0, 0])
+        self.assertEqual(pixels[6, 0].tolist(), [255, 255, 255])
+        self.assertEqual(pixels[11, 0].tolist(), [0, 0, 0])
+
+    @patch('utils.maze_visualiser.PhotoImage')
+    def test_photo_image_is_one_ppm(self, mock_photo):
+        photo_image(rasterize_maze(generate_maze(25, seed=1), cell_size=2), None)
+        data = mock_photo.call_args.kwargs['data']
+        self.assertTrue(data.startswith(b'P6 50 50 255\n'))
+        self.assertEqual(len(data), len(b'P6 50 50 255\n') + 50 * 50 * 3)
+
+    @unittest.skipIf(Image is None, "Pillow is not installed")
+    def test_export_image_and_animations(self):
+        maze = generate_maze(21, seed=3)
+        start, goal = find_start_goal(maze)
+        expansions = []
+        path, nodes_expanded = bfs(maze, start, goal, expansions=expansions)
+        with tempfile.TemporaryDirectory() as directory:
+            image_file = os.path.join(directory, 'maze.png')
+            save_maze_image(image_file, maze, path, cell_size=2)
+            with Image.open(image_file) as image:
+                self.assertEqual(image.size, (42, 42))
+
+            gif_file = os.path.join(directory, 'bfs.gif')
+            frames = save_search_animation(gif_file, maze, expansions, path, frames=10)
+            with Image.open(gif_file) as image:
+                self.assertEqual(image.n_frames, frames)
+                self.assertEqual(frames, 12)  # The bare maze, 10 expansion batches and the path
+                image.seek(frames - 1)
+                last = np.array(image.convert('RGB'))
+            cell_size = last.shape[0] // 21
+            r, c = path[len(path) // 2]
+            self.assertEqual(last[r * cell_size, c * cell_size].tolist(), CELL_COLORS[SOLUTION].tolist())
+
+            model = get_mdp_model(maze)
+            gif_file = os.path.join(directory, 'value.gif')
+            animation = ValueAnimation(gif_file, maze, model.states, -10, 0)
+            _, iterations = value_iteration(None, None, None, None, 0.9, model=model, observer=animation)
+            animation.close()
+            with Image.open(gif_file) as image:
+                # Sweeps that change no colour add no frame
+                self.assertTrue(1 < image.n_frames <= iterations + 1)
+
+    def test_generate_maze_is_seeded(self):
+        maze = generate_maze(25, seed=7)
+        self.assertIsInstance(maze, MazeGrid)
+        self.assertEqual(maze.cells.shape, (25, 25))
+        self.assertEqual(maze.cells.tobytes(), generate_maze(25, seed=7).cells.tobytes())
+        self.assertNotEqual(maze.cells.tobytes(), generate_maze(25, seed=8).cells.tobytes())
+
+    def test_generated_maze_is_solvable(self):
+        for seed in range(5):
+            maze = generate_maze(21, seed=seed)
+            start, goal = find_start_goal(maze)
+            self.assertIsNotNone(start)
+            self.assertIsNotNone(goal)
+            path, _ = bfs(maze, start, goal)
+            self.assertIsNotNone(path)
+
+    def test_generate_maze_saves_text(self):
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, 'maze.txt')
+            maze = generate_maze(10, seed=1, filename=filename)
+            with open(filename) as file:
+                rows = file.read().splitlines()
+        self.assertEqual(rows, [''.join(row) for row in maze.to_rows()])
+
+    def test_generate_maze_rejects_tiny_sizes(self):
+        with self.assertRaises(ValueError):
+            generate_maze(3)
+
+    def test_every_generator_builds_a_perfect_solvable_maze(self):
+        for algorithm in GENERATORS:
+            for size in (5, 20, 21):
+                maze = generate_maze(size, seed=3, algorithm=algorithm)
+                oracle = DistanceOracle.build(maze)
+                start, _ = find_start_goal(maze)
+                self.assertIsNotNone(oracle.distance(start), algorithm)
+                self.assertTrue(oracle.perfect, algorithm)
+                # Every passage is connected to the goal
+                self.assertEqual((oracle.distances >= 0).sum(), (maze.cells != ord('w')).sum())
+                self.assertEqual(maze.cells.tobytes(), generate_maze(size, seed=3, algorithm=algorithm).cells.tobytes())
+
+    def test_braiding_adds_loops(self):
+        for algorithm in GENERATORS:
+            maze = generate_maze(31, seed=5, algorithm=algorithm, braid_fraction=1.0)
+            oracle = DistanceOracle.build(maze)
+            self.assertFalse(oracle.perfect, algorithm)
+            self.assertEqual((oracle.distances >= 0).sum(), (maze.cells != ord('w')).sum())
+
+    def test_unknown_generator_is_rejected(self):
+        with self.assertRaises(ValueError):
+            generate_maze(11, algorithm='prim')
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,87 @@
+import unittest
+import sys
+import os
+
+# Add the root directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from utils.maze_grid import MazeGrid, as_grid, UP, DOWN, LEFT, RIGHT
+from utils.maze_loader import find_start_goal, find_neighbours
+from utils.maze_visualiser import mark_solution_path
+from algorithms.search_algorithms import dfs, bfs, astar
+from algorithms.mdp_algorithms import define_mdp_components
+
+class TestMazeGrid(unittest.TestCase):
+
+    def setUp(self):
+        self.maze = [
+            ['S', 'P', 'P', 'w', 'G'],
+            ['w', 'w', 'P', 'w', 'P'],
+            ['P', 'P', 'P', 'P', 'P'],
+            ['P', 'w', 'w', 'w', 'P'],
+            ['P', 'P', 'P', 'P', 'P']
+        ]
+        self.grid = MazeGrid.from_rows(self.maze)
+
+    def test_round_trip(self):
+        self.assertEqual(self.grid.cells.dtype.name, 'uint8')
+        self.assertEqual(self.grid.to_rows(), self.maze)
+        self.assertEqual(self.grid[0][4], 'G')
+        self.assertEqual(len(self.grid), 5)
+        self.assertEqual(len(self.grid[0]), 5)
+        self.assertIs(as_grid(self.grid), self.grid)
+
+    def test_neighbour_masks(self):
+        self.assertEqual(self.grid.masks[2, 2], UP | LEFT | RIGHT)
+        self.assertEqual(self.grid.masks[0, 0], RIGHT)
+        self.assertEqual(self.grid.masks[1, 1], 0)
+        for r in range(5):
+            for c in range(5):
+                if self.maze[r][c] != 'w':
+                    self.assertEqual(find_neighbours(self.grid, (r, c)), find_neighbours(self.maze, (r, c)))
+
+    def test_set_cell_refreshes_masks(self):
+        self.assertEqual(self.grid.masks[2, 2], UP | LEFT | RIGHT)
+        self.grid[3][2] = 'P'
+        self.assertEqual(self.grid.masks[2, 2], UP | DOWN | LEFT | RIGHT)
+        # Cached masks are patched around the changed cell rather than rebuilt
+        self.grid.mask_bytes
+        self.grid[2][3] = 'w'
+        fresh = MazeGrid(self.grid.cells.copy())
+        self.assertTrue((self.grid.masks == fresh.masks).all())
+        self.assertEqual(self.grid.mask_bytes, fresh.mask_bytes)
+
+    def test_digest_cached_until_walls_change(self):
+        digest = self.grid.digest()
+        self.grid[0][1] = 'o'
+        self.assertIs(self.grid.digest(), digest)
+        self.grid[3][2] = 'P'
+        self.assertNotEqual(self.grid.digest(), digest)
+        self.assertEqual(self.grid.digest(), MazeGrid(self.grid.cells.copy()).digest())
+
+    def test_find_cached_until_set_cell(self):
+        self.assertEqual(self.grid.find('G'), [(0, 4)])
+        self.grid[4][4] = 'G'
+        self.grid[0][4] = 'P'
+        self.assertEqual(self.grid.find('G'), [(4, 4)])
+        self.assertEqual(self.grid.find('P'), MazeGrid(self.grid.cells.copy()).find('P'))
+
+    def test_find_start_goal(self):
+        self.assertEqual(find_start_goal(self.grid), find_start_goal(self.maze))
+
+    def test_search_algorithms_accept_grid(self):
+        start, goal = find_start_goal(self.grid)
+        for algorithm in (dfs, bfs, astar):
+            self.assertEqual(algorithm(self.grid, start, goal), algorithm(self.maze, start, goal))
+
+    def test_mdp_components_match(self):
+        self.assertEqual(define_mdp_components(self.grid), define_mdp_components(self.maze))
+
+    def test_mark_solution_path(self):
+        path, _ = bfs(self.grid, (0, 0), (0, 4))
+        mark_solution_path(self.grid, path)
+        mark_solution_path(self.maze, path)
+        self.assertEqual(self.grid.to_rows(), self.maze)
+
+if __name__ == '__main__':
+    unittest.main()
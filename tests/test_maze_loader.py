@@ -1,11 +1,16 @@
 import unittest
 import sys
 import os
+import tempfile
+import numpy as np
 
 # Add the root directory to sys.path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
 
-from utils.maze_loader import find_start_goal, find_neighbours
+from utils.maze_grid import MazeGrid
+from utils.maze_loader import (find_start_goal, find_neighbours, load_maze, load_maze_mmap, scan_start_goal,
+                               find_starts_goals)
+from utils.maze_binary import save_maze_binary, unpack_cells
 
 class TestMazeLoader(unittest.TestCase):
 
@@ -23,6 +28,12 @@ class TestMazeLoader(unittest.TestCase):
         self.assertEqual(start, (0, 0))
         self.assertEqual(goal, (0, 4))
 
+    def test_find_starts_goals(self):
+        self.maze[4][0] = 'S'
+        self.maze[2][4] = 'G'
+        self.assertEqual(find_starts_goals(self.maze), ([(0, 0), (4, 0)], [(0, 4), (2, 4)]))
+        self.assertEqual(find_starts_goals(MazeGrid.from_rows(self.maze)), find_starts_goals(self.maze))
+
     def test_find_neighbours(self):
         neighbours = find_neighbours(self.maze, (2, 2))
         expected_neighbours = [(1, 2), (2, 1), (2, 3)]
@@ -53,5 +64,27 @@ class TestMazeLoader(unittest.TestCase):
         self.assertEqual(start, (0, 0))
         self.assertEqual(goal, (49, 49))
 
+    def test_load_maze_mmap(self):
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, 'maze.txt')
+            with open(filename, 'w') as file:
+                file.write(''.join(''.join(row) + '\n' for row in self.maze))
+            maze = load_maze_mmap(filename)
+            self.assertEqual(maze.to_rows(), self.maze)
+            self.assertEqual(scan_start_goal(maze, chunk_rows=2), ((0, 0), (0, 4)))
+            del maze
+
+    def test_load_maze_mmap_binary(self):
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, 'maze.maze')
+            save_maze_binary(filename, self.maze)
+            header, payload = load_maze_mmap(filename)
+            # The packed payload is mapped as is, one bit per cell, rather than unpacked to a grid
+            self.assertIsInstance(payload, np.memmap)
+            self.assertEqual(payload.shape, (5, 1))
+            self.assertEqual((header.start, header.goal), ((0, 0), (0, 4)))
+            self.assertEqual(unpack_cells(payload, header).tobytes(), load_maze(filename).cells.tobytes())
+            del payload
+
 if __name__ == '__main__':
     unittest.main()
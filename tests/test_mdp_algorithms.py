@@ -1,11 +1,17 @@
 import unittest
 import sys
 import os
+import tempfile
+import numpy as np
 
 # Add the root directory to sys.path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
 
-from algorithms.mdp_algorithms import define_mdp_components, value_iteration, policy_iteration, apply_policy_to_maze
+from algorithms.mdp_algorithms import (define_mdp_components, value_iteration, policy_iteration, apply_policy_to_maze,
+                                      get_mdp_model, mdp_model_file, _model_cache, compile_grid_mdp, slip_outcomes,
+                                      apply_policy_to_starts)
+from algorithms.mdp_engine import load_compiled_mdp, compile_mdp
+from utils.maze_grid import MazeGrid
 from utils.maze_loader import find_start_goal
 
 class TestMDPAlgorithms(unittest.TestCase):
@@ -88,5 +94,69 @@ class TestMDPAlgorithms(unittest.TestCase):
         self.assertEqual(path_value[-1], goal)
         self.assertEqual(path_policy[-1], goal)
 
+    def test_model_cache(self):
+        _model_cache.clear()
+        grid = MazeGrid.from_rows(self.maze)
+        model = get_mdp_model(grid)
+        self.assertGreaterEqual(model.build_time, 0)
+        # Solution marks keep the cached model; a different goal does not
+        marked = grid.copy()
+        marked[0][1] = 'o'
+        self.assertIs(get_mdp_model(marked), model)
+        moved = [row[:] for row in self.maze]
+        moved[0][4], moved[4][4] = 'P', 'G'
+        self.assertIsNot(get_mdp_model(moved), model)
+        policy, _ = value_iteration(None, None, None, None, self.gamma, model=model)
+        self.assertEqual(apply_policy_to_maze(self.maze, policy, self.start)[-1], self.goal)
+        # A budget smaller than one model keeps only the newest
+        moved[4][4], moved[2][0] = 'P', 'G'
+        newest = get_mdp_model(moved, max_bytes=1)
+        self.assertEqual(list(_model_cache.values()), [newest])
+
+    def test_model_persisted_beside_maze_file(self):
+        _model_cache.clear()
+        with tempfile.TemporaryDirectory() as directory:
+            maze_file = os.path.join(directory, 'maze.txt')
+            model = get_mdp_model(self.maze, maze_file)
+            key, loaded = load_compiled_mdp(mdp_model_file(maze_file))
+            self.assertEqual(loaded.states, model.states)
+            self.assertEqual(loaded.rewards.tolist(), model.rewards.tolist())
+            _model_cache.clear()
+            self.assertEqual(get_mdp_model(self.maze, maze_file).next_states.tolist(), model.next_states.tolist())
+            self.assertIn(key, _model_cache)
+
+    def test_slippery_transitions(self):
+        grid = MazeGrid.from_rows(self.maze)
+        for noise, outcomes in (('perpendicular', 3), ('uniform', 4), ('stay', 2)):
+            model = compile_grid_mdp(grid, slip=0.2, noise=noise)
+            self.assertEqual(model.next_states.shape, (len(self.states), 4, outcomes))
+            self.assertFalse(model.deterministic)
+            self.assertTrue(np.allclose(model.probabilities.sum(axis=2), 1.0))
+            # The array build matches compiling the dict components of the list maze
+            reference = compile_mdp(*define_mdp_components(self.maze, slip=0.2, noise=noise)[:4])
+            self.assertEqual(model.next_states.tolist(), reference.next_states.tolist())
+            self.assertTrue(np.allclose(model.rewards, reference.rewards))
+            policy, _ = value_iteration(None, None, None, None, self.gamma, model=model)
+            self.assertEqual(apply_policy_to_maze(self.maze, policy, self.start)[-1], self.goal)
+        # Walking right from the start: slips up or down hit walls and stay put
+        right = define_mdp_components(self.maze, slip=0.2)[2][self.start]['R']
+        self.assertEqual(right, [(0.8, (0, 1)), (0.1, self.start), (0.1, self.start)])
+        self.assertTrue(compile_grid_mdp(grid).deterministic)
+        self.assertIsNot(get_mdp_model(grid, slip=0.2), get_mdp_model(grid))
+        with self.assertRaises(ValueError):
+            slip_outcomes(0.2, 'diagonal')
+
+    def test_apply_policy_to_starts(self):
+        maze = [row[:] for row in self.maze]
+        maze[4][0] = 'G'
+        states, actions, transitions, rewards, gamma = define_mdp_components(maze)
+        policy, _ = value_iteration(states, actions, transitions, rewards, gamma)
+        paths = apply_policy_to_starts(maze, policy, states)
+        self.assertEqual(paths, [apply_policy_to_maze(maze, policy, start) for start in states])
+        self.assertEqual(paths[states.index((2, 0))], [(2, 0), (3, 0), (4, 0)])
+        # A policy walking into a wall never reaches a goal
+        policy[self.start] = 'U'
+        self.assertIsNone(apply_policy_to_starts(maze, policy, [self.start])[0])
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,168 @@
+import unittest
+import sys
+import os
+import numpy as np
+
+# Add the root directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from algorithms.mdp_algorithms import (define_mdp_components, value_iteration, policy_iteration, prioritized_sweeping,
+                                      bounded_value_iteration, apply_policy_to_maze)
+from algorithms.mdp_engine import (compile_mdp, solve_value_iteration, evaluate_policy_linear, evaluate_policy_sweeps,
+                                   solve_prioritized_sweeping, solve_bounded_value_iteration)
+from algorithms.search_algorithms import bfs
+from utils.maze_loader import find_start_goal
+from utils.maze_generator import generate_maze
+
+class TestMDPEngine(unittest.TestCase):
+
+    def setUp(self):
+        self.maze = [
+            ['S', 'P', 'P', 'w', 'G'],
+            ['w', 'w', 'P', 'w', 'P'],
+            ['P', 'P', 'P', 'P', 'P'],
+            ['P', 'w', 'w', 'w', 'P'],
+            ['P', 'P', 'P', 'P', 'P']
+        ]
+        self.start, self.goal = find_start_goal(self.maze)
+        self.states, self.actions, self.transitions, self.rewards, self.gamma = define_mdp_components(self.maze)
+
+    def test_compile_mdp(self):
+        model = compile_mdp(self.states, self.actions, self.transitions, self.rewards)
+        self.assertEqual(model.next_states.shape, (len(self.states), 4, 1))
+        self.assertTrue(model.deterministic)
+        s = self.states.index((2, 2))
+        self.assertEqual(self.states[model.next_states[s, 0, 0]], (1, 2))  # Up
+        self.assertEqual(self.states[model.next_states[s, 1, 0]], (2, 2))  # Down is a wall
+        self.assertEqual(model.rewards[self.states.index(self.goal)].tolist(), [0, 0, 0, 0])
+
+    def test_matches_reference_backup(self):
+        model = compile_mdp(self.states, self.actions, self.transitions, self.rewards)
+        V, iterations = solve_value_iteration(model, self.gamma)
+        self.assertGreater(iterations, 0)
+        # V is a fixed point of the dict-based Bellman operator
+        for i, state in enumerate(self.states):
+            backup = max(
+                sum(prob * (self.rewards[state][action] + self.gamma * V[self.states.index(next_state)])
+                    for prob, next_state in self.transitions[state][action])
+                for action in self.actions)
+            self.assertAlmostEqual(backup, V[i], places=5)
+
+    def test_value_iteration_contract(self):
+        policy, iterations = value_iteration(self.states, self.actions, self.transitions, self.rewards, self.gamma)
+        self.assertEqual(set(policy), set(self.states))
+        self.assertIsInstance(iterations, int)
+        path = apply_policy_to_maze(self.maze, policy, self.start)
+        self.assertEqual(path[0], self.start)
+        self.assertEqual(path[-1], self.goal)
+        self.assertEqual(len(path), 9)
+
+    def test_linear_evaluation_matches_sweeps(self):
+        model = compile_mdp(self.states, self.actions, self.transitions, self.rewards)
+        policy_actions = np.argmax(model.rewards, axis=1)
+        V_linear = evaluate_policy_linear(model, policy_actions, self.gamma)
+        V_sweeps = evaluate_policy_sweeps(model, policy_actions, self.gamma, np.zeros(model.num_states), theta=1e-10)
+        np.testing.assert_allclose(V_linear, V_sweeps, atol=1e-6)
+
+    def test_policy_iteration_evaluation_modes(self):
+        reference, _ = value_iteration(self.states, self.actions, self.transitions, self.rewards, self.gamma)
+        reference_path = apply_policy_to_maze(self.maze, reference, self.start)
+        for evaluation in ('iterative', 'linear', 'modified'):
+            policy, iterations = policy_iteration(self.states, self.actions, self.transitions, self.rewards,
+                                                  self.gamma, evaluation=evaluation, sweeps=3)
+            self.assertGreater(iterations, 0)
+            self.assertEqual(apply_policy_to_maze(self.maze, policy, self.start), reference_path)
+
+    def test_linear_policy_iteration_long_path(self):
+        # 290 steps from the goal the action gaps at start are about 5e-14, below a fixed 1e-12 tie margin
+        maze = generate_maze(101, seed=1)
+        start, goal = find_start_goal(maze)
+        states, actions, transitions, rewards, gamma = define_mdp_components(maze)
+        policy, _ = policy_iteration(states, actions, transitions, rewards, gamma, evaluation='linear')
+        path = apply_policy_to_maze(maze, policy, start)
+        self.assertIsNotNone(path)
+        self.assertEqual(path[-1], goal)
+        self.assertEqual(len(path), len(bfs(maze, start, goal)[0]))
+
+    def test_unknown_evaluation_mode(self):
+        with self.assertRaises(ValueError):
+            policy_iteration(self.states, self.actions, self.transitions, self.rewards, self.gamma, evaluation='exact')
+
+    def test_prioritized_sweeping_matches_value_iteration(self):
+        model = compile_mdp(self.states, self.actions, self.transitions, self.rewards)
+        V_sync, _ = solve_value_iteration(model, self.gamma, theta=1e-10)
+        V_async, updates, backups = solve_prioritized_sweeping(model, self.gamma, theta=1e-10)
+        np.testing.assert_allclose(V_async, V_sync, atol=1e-8)
+        self.assertGreaterEqual(backups, updates)
+
+    def test_prioritized_sweeping_contract(self):
+        counters = {}
+        policy, iterations = prioritized_sweeping(self.states, self.actions, self.transitions, self.rewards, self.gamma,
+                                                  counters=counters)
+        reference, _ = value_iteration(self.states, self.actions, self.transitions, self.rewards, self.gamma)
+        self.assertEqual(apply_policy_to_maze(self.maze, policy, self.start),
+                         apply_policy_to_maze(self.maze, reference, self.start))
+        # The iteration count is the number of state updates; the backups are counted separately
+        _, updates, backups = solve_prioritized_sweeping(compile_mdp(self.states, self.actions, self.transitions,
+                                                                     self.rewards), self.gamma)
+        self.assertEqual(iterations, updates)
+        self.assertEqual(counters['bellman_backups'], backups)
+
+    def test_prioritized_sweeping_backups(self):
+        # Starting from the exact goal value, each state is backed up a few times, far fewer than full sweeps
+        states, actions, transitions, rewards, gamma = define_mdp_components(generate_maze(21, seed=0))
+        model = compile_mdp(states, actions, transitions, rewards)
+        _, iterations = solve_value_iteration(model, gamma)
+        counters = {}
+        prioritized_sweeping(states, actions, transitions, rewards, gamma, counters=counters, model=model)
+        self.assertLess(counters['bellman_backups'], iterations * len(states) / 10)
+
+    def test_counters(self):
+        counters = {}
+        _, iterations = value_iteration(self.states, self.actions, self.transitions, self.rewards, self.gamma,
+                                        counters=counters)
+        self.assertEqual(counters['sweeps'], iterations)
+        self.assertEqual(counters['bellman_backups'], iterations * len(self.states))
+        self.assertEqual(len(counters['sweep_deltas']), iterations)
+        self.assertLess(counters['sweep_deltas'][-1], 1e-6)
+        for evaluation in ('iterative', 'linear', 'modified'):
+            counters = {}
+            policy_iteration(self.states, self.actions, self.transitions, self.rewards, self.gamma,
+                             evaluation=evaluation, counters=counters)
+            self.assertEqual(counters['sweeps'], len(counters['sweep_deltas']))
+            self.assertGreater(counters['bellman_backups'], 0)
+
+    def test_bounded_value_iteration_stops_early(self):
+        policy, _ = bounded_value_iteration(self.states, self.actions, self.transitions, self.rewards,
+                                            self.gamma, self.start, self.goal)
+        reference, _ = value_iteration(self.states, self.actions, self.transitions, self.rewards, self.gamma)
+        self.assertEqual(apply_policy_to_maze(self.maze, policy, self.start),
+                         apply_policy_to_maze(self.maze, reference, self.start))
+        # Start and goal 32 steps apart in a 41x41 maze: far fewer sweeps than converging every state
+        maze = generate_maze(41, seed=2)
+        start, goal = find_start_goal(maze)
+        states, actions, transitions, rewards, gamma = define_mdp_components(maze)
+        policy, iterations = bounded_value_iteration(states, actions, transitions, rewards, gamma, start, goal)
+        reference, full_iterations = value_iteration(states, actions, transitions, rewards, gamma)
+        path = apply_policy_to_maze(maze, policy, start)
+        self.assertEqual(path, apply_policy_to_maze(maze, reference, start))
+        self.assertLess(iterations, full_iterations / 2)
+
+    def test_bounded_value_iteration_long_path(self):
+        # Past ~130 steps the alternatives at start differ by less than theta, which value iteration cannot resolve
+        maze = generate_maze(41, seed=1)
+        start, goal = find_start_goal(maze)
+        states, actions, transitions, rewards, gamma = define_mdp_components(maze)
+        model = compile_mdp(states, actions, transitions, rewards)
+        index = {state: i for i, state in enumerate(states)}
+        counters = {}
+        policy_actions, _, iterations, certified = solve_bounded_value_iteration(
+            model, gamma, index[start], [index[goal]], counters=counters)
+        self.assertTrue(certified)
+        self.assertEqual(counters['sweeps'], iterations)
+        path = apply_policy_to_maze(maze, model.policy_dict(policy_actions), start)
+        self.assertEqual(path[-1], goal)
+        self.assertEqual(len(path) - 1, iterations)  # The bounds meet one step further from the goal each sweep
+
+if __name__ == '__main__':
+    unittest.main()
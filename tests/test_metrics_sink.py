@@ -0,0 +1,67 @@
+import csv
+import os
+import sys
+import tempfile
+import unittest
+
+# Add the root directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from utils.metrics_sink import MetricsSink, METRICS_COLUMNS, parquet_available, load_metrics, export_csv
+
+def make_rows(count, algorithm='bfs', maze_size=21):
+    return [{'maze_id': 'm1', 'timestamp': '2025-01-01 00:00:00', 'maze_size': maze_size, 'algorithm_type': 'search',
+             'algorithm': algorithm, 'run_index': i + 1, 'execution_time': 0.5, 'memory_usage': 100,
+             'path_length': 30, 'convergence_rate': None, 'optimality': 1, 'nodes_expanded': 40,
+             'invalid_maze_attempts': 0, 'failed_paths': 0} for i in range(count)]
+
+class TestMetricsSink(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.dataset = os.path.join(self.directory.name, 'metrics')
+        self.csv_file = os.path.join(self.directory.name, 'metrics.csv')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def read_csv(self, filename):
+        with open(filename, newline='') as file:
+            return list(csv.reader(file))
+
+    def test_csv_batches_are_buffered(self):
+        sink = MetricsSink(self.dataset, self.csv_file, batch_size=5, format='csv')
+        sink.add(make_rows(3))
+        self.assertFalse(os.path.exists(self.csv_file))  # Still buffered
+        sink.add(make_rows(3))
+        with sink:
+            sink.add(make_rows(2))
+        rows = self.read_csv(self.csv_file)
+        self.assertEqual(rows[0], [header for _, header, _ in METRICS_COLUMNS])
+        self.assertEqual(len(rows), 9)
+
+    def test_csv_append_keeps_existing_header(self):
+        # A file written before a column was added keeps its header, and new rows line up with it
+        old_columns = [column for column in METRICS_COLUMNS if column[0] != 'bellman_backups']
+        with open(self.csv_file, mode='w', newline='') as file:
+            csv.writer(file).writerow([header for _, header, _ in old_columns])
+        with MetricsSink(self.dataset, self.csv_file, format='csv') as sink:
+            sink.add(make_rows(2))
+        rows = self.read_csv(self.csv_file)
+        self.assertEqual(rows[0], [header for _, header, _ in old_columns])
+        self.assertEqual([len(row) for row in rows[1:]], [len(old_columns)] * 2)
+
+    @unittest.skipUnless(parquet_available(), "pyarrow is not installed")
+    def test_parquet_dataset_is_partitioned_and_exports_csv(self):
+        with MetricsSink(self.dataset, self.csv_file, batch_size=4) as sink:
+            sink.add(make_rows(3, 'bfs', 21))
+            sink.add(make_rows(2, 'astar', 51))
+        self.assertTrue(os.path.isdir(os.path.join(self.dataset, 'algorithm=astar', 'maze_size=51')))
+        self.assertEqual(load_metrics(self.dataset).num_rows, 5)
+        export_csv(self.dataset, self.csv_file)
+        rows = self.read_csv(self.csv_file)
+        self.assertEqual(rows[0], [header for _, header, _ in METRICS_COLUMNS])
+        self.assertEqual(len(rows), 6)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -5,8 +5,10 @@ import os
 # Add the root directory to sys.path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
 
-from algorithms.search_algorithms import dfs, bfs, astar
+from algorithms.search_algorithms import (dfs, bfs, astar, bidirectional_bfs, bidirectional_astar, jump_point_search,
+                                         multi_bfs)
 from utils.maze_loader import find_start_goal
+from utils.maze_generator import generate_maze
 
 class TestSearchAlgorithms(unittest.TestCase):
 
@@ -91,5 +93,97 @@ class TestSearchAlgorithms(unittest.TestCase):
         self.assertEqual(path_bfs[-1], goal)
         self.assertEqual(path_astar[-1], goal)
 
+    def test_astar_optimal_without_stale_expansions(self):
+        path, nodes_expanded = astar(self.maze, self.start, self.goal)
+        bfs_path, _ = bfs(self.maze, self.start, self.goal)
+        self.assertEqual(len(path), len(bfs_path))
+        self.assertEqual(path[0], self.start)
+        self.assertEqual(path[-1], self.goal)
+        open_cells = sum(cell != 'w' for row in self.maze for cell in row)
+        self.assertLessEqual(nodes_expanded, open_cells)
+
+    def test_astar_tie_breaking_on_open_grid(self):
+        maze = [['P' for _ in range(30)] for _ in range(30)]
+        maze[0][0] = 'S'
+        maze[29][29] = 'G'
+        path, nodes_expanded = astar(maze, (0, 0), (29, 29))
+        self.assertEqual(len(path), 59)
+        self.assertEqual(nodes_expanded, 59)
+
+    def test_bidirectional_shortest_paths(self):
+        bfs_path, _ = bfs(self.maze, self.start, self.goal)
+        for algorithm in (bidirectional_bfs, bidirectional_astar):
+            path, nodes_expanded = algorithm(self.maze, self.start, self.goal)
+            self.assertEqual(len(path), len(bfs_path))
+            self.assertEqual(path[0], self.start)
+            self.assertEqual(path[-1], self.goal)
+            for a, b in zip(path, path[1:]):
+                self.assertEqual(abs(a[0] - b[0]) + abs(a[1] - b[1]), 1)
+            self.assertGreater(nodes_expanded, 0)
+
+    def test_bidirectional_astar_expands_no_more_than_astar(self):
+        maze = generate_maze(101, seed=1)
+        start, goal = find_start_goal(maze)
+        path, nodes_expanded = bidirectional_astar(maze, start, goal)
+        astar_path, astar_expanded = astar(maze, start, goal)
+        self.assertEqual(len(path), len(astar_path))
+        self.assertLessEqual(nodes_expanded, astar_expanded)
+
+    def test_bidirectional_no_path(self):
+        maze = [['S', 'P', 'w', 'P', 'G']]
+        for algorithm in (bidirectional_bfs, bidirectional_astar):
+            path, _ = algorithm(maze, (0, 0), (0, 4))
+            self.assertIsNone(path)
+
+    def test_jump_point_search(self):
+        path, nodes_expanded = jump_point_search(self.maze, self.start, self.goal)
+        bfs_path, bfs_expanded = bfs(self.maze, self.start, self.goal)
+        # Full cell-by-cell path, while only junctions and the endpoints are expanded
+        self.assertEqual(path, bfs_path)
+        self.assertLess(nodes_expanded, bfs_expanded)
+
+    def test_jump_point_search_corridor_goal(self):
+        maze = [['S', 'P', 'P', 'G', 'P', 'P']]
+        path, nodes_expanded = jump_point_search(maze, (0, 0), (0, 3))
+        self.assertEqual(path, [(0, 0), (0, 1), (0, 2), (0, 3)])
+        self.assertEqual(nodes_expanded, 2)
+
+    def test_counters(self):
+        for solver in (dfs, bfs, astar):
+            counters = {}
+            path, nodes_expanded = solver(self.maze, self.start, self.goal, counters=counters)
+            self.assertEqual(path, solver(self.maze, self.start, self.goal)[0])
+            self.assertEqual(counters['pops'], nodes_expanded + counters['stale_pops'])
+            self.assertEqual(counters['neighbour_calls'], nodes_expanded - 1)
+            self.assertGreaterEqual(counters['pushes'], counters['pops'])
+            self.assertGreaterEqual(counters['peak_frontier'], 1)
+
+    def test_expansions(self):
+        cols = len(self.maze[0])
+        for solver in (dfs, bfs, astar):
+            expansions = []
+            _, nodes_expanded = solver(self.maze, self.start, self.goal, expansions=expansions)
+            self.assertEqual(len(expansions), nodes_expanded)
+            self.assertEqual(divmod(expansions[0], cols), self.start)
+            self.assertEqual(divmod(expansions[-1], cols), self.goal)
+
+    def test_multi_bfs(self):
+        maze = [row[:] for row in self.maze]
+        maze[4][0] = 'G'
+        starts = [(0, 0), (2, 2), (4, 3), (0, 4), (1, 2)]
+        goals = [(0, 4), (4, 0)]
+        paths, nodes_expanded = multi_bfs(maze, starts, goals)
+        for start, path in zip(starts, paths):
+            nearest = min(len(bfs(maze, start, goal)[0]) for goal in goals)
+            self.assertEqual(len(path), nearest)
+            self.assertEqual(path[0], start)
+            self.assertIn(path[-1], goals)
+        self.assertEqual(paths[3], [(0, 4)])
+        # Starts and goals default to every 'S' and 'G' cell
+        self.assertEqual(multi_bfs(maze)[0], [paths[0]])
+        maze[2][4] = 'w'
+        maze[2][0] = 'w'
+        self.assertEqual(multi_bfs(maze, [(0, 0)], [(0, 4)]), ([None], 2))
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,42 @@
+import os
+import sys
+import tempfile
+import unittest
+
+# Add the root directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from utils.maze_generator import stream_maze_to_file, generate_maze
+from utils.maze_loader import load_maze_mmap
+from utils.maze_grid import MazeGrid
+from algorithms.search_algorithms import bfs
+from algorithms.streaming_search import streaming_bfs
+
+class TestStreamingSearch(unittest.TestCase):
+
+    def test_streamed_maze_is_solved_memory_mapped(self):
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, 'maze.txt')
+            start, goal = stream_maze_to_file(filename, 41, seed=2)
+            maze = load_maze_mmap(filename)
+            path, _ = streaming_bfs(maze, workdir=directory)
+            expected, _ = bfs(maze.copy(), start, goal)
+            self.assertEqual(os.listdir(directory), ['maze.txt'])  # Parent file is cleaned up
+            del maze
+        self.assertEqual((path[0], path[-1]), (start, goal))
+        self.assertEqual(len(path), len(expected))
+
+    def test_matches_bfs_on_mazes_with_loops(self):
+        maze = generate_maze(31, seed=4, braid_fraction=0.5)
+        path, _ = streaming_bfs(maze)
+        start, goal = path[0], path[-1]
+        expected, _ = bfs(maze, start, goal)
+        self.assertEqual(len(path), len(expected))
+
+    def test_no_path(self):
+        maze = MazeGrid.from_rows(['SwG', 'PwP'])
+        path, _ = streaming_bfs(maze)
+        self.assertIsNone(path)
+
+if __name__ == '__main__':
+    unittest.main()